@@ -0,0 +1,57 @@
+import asyncio
+import threading
+
+import requests
+
+from benchmarks.common import setupPath
+from benchmarks.mock_server import MockCurseForgeServer
+
+setupPath()
+
+from src.curseforge import AsyncCurseForgeAPI, CurseForgeAPI, SchemaClasses as schemas
+from src.curseforge.RateLimiter import RateLimiter
+
+# 异步客户端应与同步客户端返回相同的 Schema
+CALLS = {
+    "searchMods": lambda cf: cf.searchMods(432, 6, sortField=schemas.ModSearchSortField.Popularity, index=0,
+                                           pageSize=50),
+    "getMod": lambda cf: cf.getMod(1000),
+    "getModFiles": lambda cf: cf.getModFiles(1000, pageSize=50),
+    "getModFile": lambda cf: cf.getModFile(1000, 100000),
+    "getMods": lambda cf: cf.getMods([1000, 1001, 1002]),
+}
+
+
+def clientThreads() -> int:
+    return sum("process_request_thread" not in thread.name for thread in threading.enumerate())  # 不计替身服务器的线程
+
+
+def unlimited() -> RateLimiter:
+    return RateLimiter(budgets={"default": (1e9, 10 ** 9)}, classes=())
+
+
+async def main(server: MockCurseForgeServer, sync: CurseForgeAPI):
+    async with AsyncCurseForgeAPI("any", rateLimiter=unlimited(), baseUrl=server.baseUrl) as cf:
+        for name, call in CALLS.items():
+            expected, got = call(sync), await call(cf)
+            assert not isinstance(expected, schemas.ApiResponseCode), name
+            assert type(got) is type(expected) and got.toJson() == expected.toJson(), name
+            print(name, "ok")
+
+        threads = clientThreads()
+        mods = await asyncio.gather(*(cf.getMod(1000 + i) for i in range(200)))  # 并发请求共用连接池, 不开线程
+        assert [mod.data.id for mod in mods] == [1000 + i for i in range(200)]
+        assert clientThreads() == threads
+        assert (await cf.getMod(-1)) == sync.getMod(-1)
+
+    async with AsyncCurseForgeAPI("any", rateLimiter=unlimited(), baseUrl=server.baseUrl, batchWindow=0) as cf:
+        mods = await asyncio.gather(*(cf.getMod(1000 + i) for i in range(10)))  # 合并为一次 getMods
+        for i, mod in enumerate(mods):
+            assert mod.toJson() == sync.getMod(1000 + i).toJson()
+    print("batched getMod ok")
+
+
+with MockCurseForgeServer() as server:
+    asyncio.run(main(server, CurseForgeAPI("any", requests.Session(), rateLimiter=unlimited(),
+                                           baseUrl=server.baseUrl)))
+print("async client test done")
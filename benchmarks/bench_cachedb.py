@@ -0,0 +1,106 @@
+"""
+CacheDB 基准: 写入, 读取, 清理(vacuum), 保存和打开, 打开后常驻的内存, 有字节预算时的写入和读取
+python -m benchmarks.bench_cachedb
+"""
+import itertools
+import os
+import tempfile
+
+from benchmarks.bench_memory import retained
+from benchmarks.common import setupPluginPackage, measure, report
+
+setupPluginPackage()
+
+from Plugins.ModPlaza_Plugin.src.utils.CacheDB import CacheDB
+
+ENTRIES = 5000
+VALUE = os.urandom(4096)  # about the size of a thumbnail
+
+
+def key(i: int) -> str:
+    return f"thumbnails/{i % 50}/{i}"
+
+
+def value(i: int) -> bytes:
+    """
+    a distinct object per entry, pickling the same object 5000 times would store it once
+    """
+    return i.to_bytes(4, "little") + VALUE[4:]
+
+
+def populate(db: CacheDB, count: int = ENTRIES, expiredTime: int = 3600):
+    for i in range(count):
+        db.root.addRecord(key(i), value(i), expiredTime=expiredTime, replace=True)
+
+
+def run(duration: float = 1.0) -> dict:
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        filename = os.path.join(tmp, "bench.cache")
+        db = CacheDB(filename)
+        counter = itertools.count()
+        results["add"] = measure(lambda: db.root.addRecord(key(next(counter)), VALUE, replace=True), duration)
+
+        db = CacheDB(filename)
+        populate(db)
+        keys = itertools.cycle([key(i) for i in range(ENTRIES)])
+        results["get"] = measure(lambda: db.root.getRecord(next(keys)), duration)
+        results["has"] = measure(lambda: db.root.has(next(keys)), duration)
+        walked = db.root.copy()  # a standalone tree has no flat index, lookups walk level by level as before
+        results["getWalk"] = measure(lambda: walked.getRecord(next(keys)), duration)
+        results["hasWalk"] = measure(lambda: walked.has(next(keys)), duration)
+        results["vacuum"] = measure(db.vacuum, duration, batch=1)  # nothing expired: the cost of the walk
+        results["save"] = measure(db.save, duration, batch=1)  # nothing changed
+
+        def save100():
+            for _ in range(100):
+                db.root.addRecord(next(keys), VALUE, replace=True)
+            db.save()
+
+        results["save100"] = measure(save100, duration, batch=1)
+        results["open"] = measure(lambda: CacheDB(filename), duration, batch=1)
+        results["getSaved"] = measure(lambda: db.root.getRecord(next(keys)), duration)
+        results["openRetainedBytes"] = retained(lambda: CacheDB(filename))
+
+        expired = CacheDB(os.path.join(tmp, "expired.cache"))
+
+        def vacuumExpired():
+            populate(expired, 1000, expiredTime=-1)
+            expired.vacuum()
+
+        populate(expired, expiredTime=3600)  # live entries the walk still has to look at
+        results["vacuumExpired"] = measure(vacuumExpired, duration, batch=1)
+
+        for policy in ("lru", "lfu"):  # half the entries fit, every add past that evicts one
+            budgeted = CacheDB(os.path.join(tmp, f"{policy}.cache"), budget=ENTRIES // 2 * len(VALUE), policy=policy)
+            populate(budgeted)
+            counter = itertools.count(ENTRIES)
+            results[f"add.{policy}"] = measure(
+                lambda: budgeted.root.addRecord(key(next(counter)), VALUE, replace=True), duration)
+            live = itertools.cycle(["/".join(entry.parent.path + (entry.key,)) for entry in budgeted.root._entries()])
+            results[f"get.{policy}"] = measure(lambda: budgeted.root.getRecord(next(live)), duration)
+            results[f"stats.{policy}"] = budgeted.evictionStats()["."]
+
+    report("addRecord (ops)", results["add"])
+    report("getRecord, walked (ops)", results["getWalk"])
+    report("getRecord (ops)", results["get"], results["getWalk"])
+    report("has, walked (ops)", results["hasWalk"])
+    report("has (ops)", results["has"], results["hasWalk"])
+    report(f"vacuum, {ENTRIES} live entries (ops)", results["vacuum"])
+    report(f"save, {ENTRIES} x 4KB, unchanged (ops)", results["save"])
+    report(f"replace 100 of {ENTRIES} x 4KB + save (ops)", results["save100"])
+    report(f"open, {ENTRIES} x 4KB (ops)", results["open"])
+    report("getRecord of a saved value, mapped (ops)", results["getSaved"])
+    print(f"retained after opening {ENTRIES} x 4KB: {results['openRetainedBytes']:,} B")
+    report(f"add 1000 expired + vacuum, {ENTRIES} live (ops)", results["vacuumExpired"])
+    for policy in ("lru", "lfu"):
+        report(f"addRecord over a full {policy} budget (ops)", results[f"add.{policy}"], results["add"])
+        report(f"getRecord under a {policy} budget (ops)", results[f"get.{policy}"], results["get"])
+        print(f"{policy}: {results[f'stats.{policy}']}")
+    report("addRecord, lfu against lru (ops)", results["add.lfu"], results["add.lru"])
+    report("getRecord, lfu against lru (ops)", results["get.lfu"], results["get.lru"])
+    return results
+
+
+if __name__ == '__main__':
+    run()
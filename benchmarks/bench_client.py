@@ -0,0 +1,60 @@
+"""
+客户端基准: CurseForgeAPI 对本地替身服务器的完整调用(构建请求 -> 发送/读缓存 -> 解码)
+python -m benchmarks.bench_client
+"""
+import os
+import tempfile
+
+from benchmarks.common import setupPath, measure, report
+from benchmarks.mock_server import MockCurseForgeServer
+
+setupPath()
+
+import requests
+import requests_cache as rqc
+
+from src.curseforge import CurseForgeAPI, SchemaClasses as schemas
+from src.curseforge.RateLimiter import RateLimiter
+
+CASES = {
+    "searchMods": lambda cf: cf.searchMods(432, 6, sortField=schemas.ModSearchSortField.Popularity, index=0,
+                                           pageSize=50),
+    "getModFiles": lambda cf: cf.getModFiles(1000, pageSize=50),
+    "getModFile": lambda cf: cf.getModFile(1000, 100000),
+    "getMinecraftVersions": lambda cf: cf.getMinecraftVersions(True),
+}
+
+
+def unlimited() -> RateLimiter:
+    """
+    the client is measured here, not the request budget (see bench_rate_limit)
+    """
+    return RateLimiter(budgets={"default": (1e9, 10 ** 9)}, classes=())
+
+
+def run(duration: float = 1.0) -> dict:
+    results = {}
+    with MockCurseForgeServer() as server, tempfile.TemporaryDirectory() as tmp:
+        network = CurseForgeAPI("any", requests.Session(), rateLimiter=unlimited(), baseUrl=server.baseUrl)
+        cached = CurseForgeAPI("any", rqc.CachedSession(os.path.join(tmp, "bench-cache"), backend="sqlite",
+                                                        expire_after=3600),
+                               rateLimiter=unlimited(), baseUrl=server.baseUrl)
+        for name, call in CASES.items():
+            assert not isinstance(call(network), schemas.ApiResponseCode)
+            call(cached)  # warm the cache
+            results[f"{name}.network"] = measure(lambda: call(network), duration, batch=5)
+            results[f"{name}.cacheHit"] = measure(lambda: call(cached), duration, batch=5)
+            report(f"{name} (network, local server)", results[f"{name}.network"])
+            report(f"{name} (sqlite cache hit)", results[f"{name}.cacheHit"])
+
+        cached.instrumentation.enable()
+        search = CASES["searchMods"]
+        results["searchMods.cacheHit.instrumented"] = measure(lambda: search(cached), duration, batch=5)
+        report("searchMods (sqlite cache hit, instrumented)", results["searchMods.cacheHit.instrumented"],
+               results["searchMods.cacheHit"])
+        cached.csesh.close()
+    return results
+
+
+if __name__ == '__main__':
+    run()
@@ -0,0 +1,131 @@
+"""
+响应解码基准: 一页(50条)搜索结果和文件列表的 json 解析 + Schema 构建
+python -m benchmarks.bench_decode
+"""
+import json
+from datetime import datetime
+
+from benchmarks.common import setupPath, measure, report
+from benchmarks.mock_server import SyntheticCatalogue
+
+setupPath()
+
+from src.curseforge import SchemaClasses as schemas
+
+
+def fixtures() -> dict:
+    """
+    :return: {name: raw json text} of one full page of each response
+    """
+    catalogue = SyntheticCatalogue(mods=200, filesPerMod=50)
+    return {
+        "SearchModsResponse": json.dumps(catalogue.search({"classId": "6", "pageSize": "50"})[1]),
+        "GetModFilesResponse": json.dumps(catalogue.modFiles(1000, {"pageSize": "50"})[1]),
+    }
+
+
+def legacyCreateDatetime(date_string: str) -> datetime:
+    """
+    the hand split parser before the regex + memo one, kept only for comparison
+    (it read ".47" as 47 microseconds)
+    """
+    t_index = date_string.index("T")
+    date_part = date_string[:t_index]
+    time_part = date_string[t_index + 1:]
+    year, month, day = date_part.split("-")
+    hour, minute, second = time_part.split(":")
+    second = second[0:2]
+    if "." in time_part:
+        dot_index = time_part.index(".")
+        microseconds_part = time_part[dot_index + 1:-1]
+        return datetime(int(year), int(month), int(day), int(hour), int(minute), int(second), int(microseconds_part))
+    return datetime(int(year), int(month), int(day), int(hour), int(minute), int(second))
+
+
+def pageDates(page: dict) -> list:
+    """
+    :return: every timestamp a search page decodes
+    """
+    dates = []
+    for mod in page["data"]:
+        dates += [mod["dateCreated"], mod["dateModified"], mod["dateReleased"]]
+        dates += [category["dateModified"] for category in mod["categories"]]
+    return dates
+
+
+def plazaPage(response: schemas.SearchModsResponse):
+    """
+    read what a plaza list item shows, see singleModWidget
+    """
+    for mod in response.data:
+        _ = (mod.name, mod.summary, mod.downloadCount, [author.name for author in mod.authors], mod.logo,
+             mod.latestFilesIndexes[0].gameVersion if mod.latestFilesIndexes else None, mod.dateModified.date())
+
+
+def readAll(value):
+    """
+    read every field, decoding all the lazy ones
+    """
+    if isinstance(value, schemas.Base):
+        for field in value._fields:
+            readAll(getattr(value, field))
+    elif isinstance(value, list):
+        for item in value:
+            readAll(item)
+
+
+def run(duration: float = 1.0) -> dict:
+    raw = fixtures()
+    results = {}
+    for name, text in raw.items():
+        schema = getattr(schemas, name)
+        parsed = json.loads(text)
+        assert len(schema(**parsed).data) == 50
+        results[f"{name}.decode"] = measure(lambda: schema(**json.loads(text)), duration, batch=10)
+        results[f"{name}.construct"] = measure(lambda: schema(**parsed), duration, batch=10)
+        results[f"{name}.trusted"] = measure(lambda: schema.fromApi(json.loads(text)), duration, batch=10)
+        results[f"{name}.constructTrusted"] = measure(lambda: schema.fromApi(parsed), duration, batch=10)
+        results[f"{name}.full"] = measure(lambda: readAll(schema(**json.loads(text))), duration, batch=10)
+        results[f"{name}.fullTrusted"] = measure(lambda: readAll(schema.fromApi(json.loads(text))), duration, batch=10)
+        report(f"{name} json + schema (pages)", results[f"{name}.decode"])
+        report(f"{name} json + fromApi (pages)", results[f"{name}.trusted"], results[f"{name}.decode"])
+        report(f"{name} schema only (pages)", results[f"{name}.construct"])
+        report(f"{name} fromApi only (pages)", results[f"{name}.constructTrusted"], results[f"{name}.construct"])
+        report(f"{name} json + schema, every field (pages)", results[f"{name}.full"])
+        report(f"{name} json + fromApi, every field (pages)", results[f"{name}.fullTrusted"], results[f"{name}.full"])
+
+    text = raw["SearchModsResponse"]
+    results["SearchModsResponse.plaza"] = measure(
+        lambda: plazaPage(schemas.SearchModsResponse(**json.loads(text))), duration, batch=10)
+    results["SearchModsResponse.plazaTrusted"] = measure(
+        lambda: plazaPage(schemas.SearchModsResponse.fromApi(json.loads(text))), duration, batch=10)
+    report("SearchModsResponse decode + plaza fields (pages)", results["SearchModsResponse.plaza"])
+    report("SearchModsResponse fromApi + plaza fields (pages)", results["SearchModsResponse.plazaTrusted"],
+           results["SearchModsResponse.plaza"])
+
+    schemas.LazyField.enabled = True  # the opt-in lazy decoding, on the same access patterns
+    try:
+        results["SearchModsResponse.plazaLazy"] = measure(
+            lambda: plazaPage(schemas.SearchModsResponse(**json.loads(text))), duration, batch=10)
+        results["SearchModsResponse.fullLazy"] = measure(
+            lambda: readAll(schemas.SearchModsResponse(**json.loads(text))), duration, batch=10)
+    finally:
+        schemas.LazyField.enabled = False
+    report("SearchModsResponse lazy decode + plaza fields (pages)", results["SearchModsResponse.plazaLazy"],
+           results["SearchModsResponse.plaza"])
+    report("SearchModsResponse lazy decode, every field (pages)", results["SearchModsResponse.fullLazy"],
+           results["SearchModsResponse.full"])
+
+    dates = pageDates(json.loads(text))
+    parse = schemas.create_datetime.__wrapped__  # without the memo
+    results["dates.legacy"] = measure(lambda: [legacyCreateDatetime(d) for d in dates], duration, batch=10)
+    results["dates.parse"] = measure(lambda: [parse(d) for d in dates], duration, batch=10)
+    results["dates.memo"] = measure(lambda: [schemas.create_datetime(d) for d in dates], duration, batch=10)
+    report(f"{len(dates)} page timestamps, legacy split (pages)", results["dates.legacy"])
+    report(f"{len(dates)} page timestamps, no memo (pages)", results["dates.parse"], results["dates.legacy"])
+    report(f"{len(dates)} page timestamps, memo (pages)", results["dates.memo"], results["dates.legacy"])
+    return results
+
+
+if __name__ == '__main__':
+    run()
@@ -0,0 +1,77 @@
+"""
+缩略图加载基准: FetchImageManagerBase.asyncFetchMultiple 从本地替身服务器加载一页缩略图到 QLabel
+python -m benchmarks.bench_fetch_image
+"""
+import itertools
+import os
+import tempfile
+import time
+
+from benchmarks.common import setupPluginPackage, report
+from benchmarks.mock_server import MockCurseForgeServer
+
+setupPluginPackage()
+os.environ.setdefault("CURSEFORGE_API_KEY", "any")  # importing the clients needs a key
+
+import requests_cache as rqc
+from PyQt5.QtCore import QEventLoop
+from PyQt5.QtWidgets import QApplication, QLabel
+
+from Plugins.ModPlaza_Plugin.src.concurrent import fetchImageTask
+from Plugins.ModPlaza_Plugin.src.utils.FetchImageManager import FetchImageManagerBase
+
+PAGE = 50  # one search page worth of thumbnails
+
+
+def fetchPage(manager: FetchImageManagerBase, urls) -> float:
+    """
+    :return: seconds until every image of the page is set on its label
+    """
+    labels = [QLabel() for _ in urls]
+    loop = QEventLoop()
+    start = time.perf_counter()
+    future = manager.asyncFetchMultiple(list(zip(urls, labels)), size=(64, 64))
+    future.done.connect(loop.quit)
+    future.failed.connect(loop.quit)
+    if not future.isDone():
+        loop.exec_()
+    elapsed = time.perf_counter() - start
+    assert not future.isFailed(), future.getException()
+    return elapsed
+
+
+def throughput(manager: FetchImageManagerBase, pages, duration: float) -> float:
+    images, elapsed = 0, 0.
+    while elapsed < duration:
+        urls = next(pages)
+        elapsed += fetchPage(manager, urls)
+        images += len(urls)
+    return images / elapsed
+
+
+def run(duration: float = 1.0) -> dict:
+    app = QApplication.instance() or QApplication([])  # noqa: keep the application alive while measuring
+    results = {}
+    with MockCurseForgeServer() as server, tempfile.TemporaryDirectory() as tmp:
+        fetchImageTask.longCachedRequest = rqc.CachedSession(os.path.join(tmp, "bench-blob"), backend="sqlite",
+                                                             expire_after=3600)
+        manager = FetchImageManagerBase(useGlobalThreadPool=False)
+
+        def url(modId: int) -> str:
+            return f"{server.baseUrl}/avatars/thumbnails/{modId}/64/64/logo.png"
+
+        ids = itertools.count(1000)
+        cold = iter(lambda: [url(next(ids)) for _ in range(PAGE)], None)  # never seen before
+        warm = itertools.cycle([[url(modId) for modId in range(1000, 1000 + PAGE)]])
+
+        results["cold"] = throughput(manager, cold, duration)
+        results["warm"] = throughput(manager, warm, duration)
+        fetchImageTask.longCachedRequest.close()
+
+    report(f"asyncFetchMultiple {PAGE} thumbnails, cold (images)", results["cold"])
+    report(f"asyncFetchMultiple {PAGE} thumbnails, cached (images)", results["warm"])
+    return results
+
+
+if __name__ == '__main__':
+    run()
@@ -0,0 +1,88 @@
+"""
+模组文件列表基准: 一个有 5000 个文件的模组, File + ModFileEntry 列表与按列存储的 ModFileTable 对比
+python -m benchmarks.bench_file_table
+"""
+import json
+
+from benchmarks.bench_memory import retained
+from benchmarks.common import setupPath, measure, report
+from benchmarks.mock_server import SyntheticCatalogue
+
+setupPath()
+
+from src.curseforge import SchemaClasses as schemas
+from src.model import ModFileEntry, getGameVersionAndModLoader
+from src.model.modFileTable import ModFileTable
+
+FILES = 5000
+PAGE = 50
+RELEASES = (schemas.FileReleaseType.Release, schemas.FileReleaseType.Beta)
+
+
+def pages() -> list:
+    """
+    :return: the json text of the GetModFilesResponse pages of one big mod
+    """
+    catalogue = SyntheticCatalogue(mods=FILES // 100, filesPerMod=100)  # file ids are unique up to 100 per mod
+    files = list(catalogue.files.values())
+    return [json.dumps({"data": files[i:i + PAGE],
+                        "pagination": {"index": i, "pageSize": PAGE, "resultCount": PAGE, "totalCount": FILES}})
+            for i in range(0, FILES, PAGE)]
+
+
+def decode(texts) -> list:
+    files = []
+    for text in texts:
+        files.extend(schemas.GetModFilesResponse(**json.loads(text)).data)
+    return files
+
+
+def entries(files) -> list:
+    """
+    what ModFilesModel kept before the table
+    """
+    return [ModFileEntry(releaseType=f.releaseType, name=f.displayName, uploadedTime=f.fileDate, size=f.fileLength,
+                         gameVersions=f.sortableGameVersions, downloadLink=f.downloadUrl, fileHash=f.hashes)
+            for f in files]
+
+
+def filterEntries(rows, gameVersion: str, modLoader: str) -> list:
+    matches = []
+    for i, entry in enumerate(rows):
+        gameVersions, modLoaders = getGameVersionAndModLoader(entry.gameVersions)
+        if gameVersion in gameVersions and modLoader in modLoaders:
+            matches.append(i)
+    return matches
+
+
+def run(duration: float = 1.0) -> dict:
+    texts = pages()
+    files = decode(texts)
+    rows, table = entries(files), ModFileTable.fromFiles(files)
+    assert filterEntries(rows, "1.20.1", "Forge") == table.rows("1.20.1", "Forge")
+
+    listBytes = retained(lambda: entries(decode(texts)))
+    tableBytes = retained(lambda: ModFileTable.fromFiles(decode(texts)))
+    print(f"{FILES} files kept alive: {listBytes:,} B as ModFileEntry -> {tableBytes:,} B as ModFileTable "
+          f"(x{tableBytes / listBytes:.2f})")
+
+    results = {
+        "list.retainedBytes": listBytes,
+        "table.retainedBytes": tableBytes,
+        "filter.list": measure(lambda: filterEntries(rows, "1.20.1", "Forge"), duration, batch=1),
+        "filter.table": measure(lambda: table.rows("1.20.1", "Forge"), duration, batch=10),
+        "filter.table.releaseType": measure(lambda: table.rows("1.20.1", "Forge", RELEASES), duration, batch=10),
+        "serialize.list": measure(lambda: [ModFileEntry.serialize(f) for f in files], duration, batch=1),
+        "serialize.table": measure(lambda: [table.serialize(r) for r in range(len(table))], duration, batch=1),
+    }
+    report(f"filter {FILES} files by version + loader, list", results["filter.list"])
+    report(f"filter {FILES} files by version + loader, table", results["filter.table"], results["filter.list"])
+    report(f"filter {FILES} files by version + loader + release type, table", results["filter.table.releaseType"],
+           results["filter.table"])
+    report(f"serialize {FILES} rows (sql model), list", results["serialize.list"])
+    report(f"serialize {FILES} rows (sql model), table", results["serialize.table"], results["serialize.list"])
+    return results
+
+
+if __name__ == '__main__':
+    run()
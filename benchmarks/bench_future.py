@@ -0,0 +1,34 @@
+"""
+Future 基准: Future.gather 汇聚数千个子 Future
+python -m benchmarks.bench_future
+"""
+from benchmarks.common import setupPluginPackage, measure, report
+
+setupPluginPackage()
+
+from PyQt5.QtCore import QCoreApplication
+
+from Plugins.ModPlaza_Plugin.src.concurrent.future.future import Future
+
+SIZES = (100, 1000, 5000)
+
+
+def gatherAll(size: int):
+    children = [Future() for _ in range(size)]
+    parent = Future.gather(children)
+    for i, child in enumerate(children):
+        child.setResult(i)
+    assert parent.isDone()
+
+
+def run(duration: float = 1.0) -> dict:
+    app = QCoreApplication.instance() or QCoreApplication([])  # noqa: keep the application alive while measuring
+    results = {}
+    for size in SIZES:
+        results[f"gather.{size}"] = measure(lambda: gatherAll(size), duration, batch=1)
+        report(f"create + gather + resolve {size} children (ops)", results[f"gather.{size}"])
+    return results
+
+
+if __name__ == '__main__':
+    run()
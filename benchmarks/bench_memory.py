@@ -0,0 +1,162 @@
+"""
+内存基准: 解码后的 Schema 对象占用, 与每个对象带 __dict__ 的布局对比
+python -m benchmarks.bench_memory
+"""
+import gc
+import json
+import sys
+import tracemalloc
+from collections import defaultdict
+from typing import Dict, Tuple
+
+from benchmarks.bench_decode import plazaPage
+from benchmarks.common import setupPath
+from benchmarks.mock_server import SyntheticCatalogue
+
+setupPath()
+
+from src.curseforge import SchemaClasses as schemas
+
+
+class DictLayout(object):
+    """
+    the same fields kept in an instance __dict__, i.e. the schema classes before __slots__
+    """
+
+
+def dictTwin(value):
+    if isinstance(value, schemas.Base):
+        twin = DictLayout()
+        twin.__dict__.update((name, dictTwin(getattr(value, name))) for name in value._fields)
+        return twin
+    if isinstance(value, list):
+        return [dictTwin(item) for item in value]
+    return value
+
+
+def objectBytes(value, sizes: Dict[str, Tuple[int, int]]):
+    """
+    Sum the size of every schema object reachable from value, by class
+    :param sizes: {class name: (count, bytes)}, updated in place
+    """
+    if isinstance(value, schemas.Base):
+        count, total = sizes[type(value).__name__]
+        sizes[type(value).__name__] = (count + 1, total + sys.getsizeof(value))
+        for field in value._fields:
+            objectBytes(getattr(value, field), sizes)
+    elif isinstance(value, list):
+        for item in value:
+            objectBytes(item, sizes)
+
+
+def retained(build, use=None) -> int:
+    """
+    :param use: Called with the result before measuring, e.g. to read some lazy fields
+    :return: bytes still allocated after build() while its result is kept alive
+    """
+    gc.collect()
+    tracemalloc.start()
+    result = build()
+    if use is not None:
+        use(result)
+        gc.collect()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return size
+
+
+def fixtures() -> dict:
+    catalogue = SyntheticCatalogue(mods=200, filesPerMod=50)
+    return {
+        "SearchModsResponse": catalogue.search({"classId": "6", "pageSize": "50"})[1],
+        "GetModFilesResponse": catalogue.modFiles(1000, {"pageSize": "50"})[1],
+    }
+
+
+def classSizes(decoded, twin: bool) -> Dict[str, Tuple[int, int]]:
+    """
+    :param twin: Measure the __dict__ layout of the same objects instead
+    :return: {class name: (count, bytes)}
+    """
+    sizes = defaultdict(lambda: (0, 0))
+    if not twin:
+        objectBytes(decoded, sizes)
+        return sizes
+
+    def walk(value, other):  # the twins lose their class, walk both side by side
+        if isinstance(value, schemas.Base):
+            count, total = sizes[type(value).__name__]
+            size = sys.getsizeof(other) + sys.getsizeof(other.__dict__)
+            sizes[type(value).__name__] = (count + 1, total + size)
+            for field in value._fields:
+                walk(getattr(value, field), other.__dict__[field])
+        elif isinstance(value, list):
+            for item, otherItem in zip(value, other):
+                walk(item, otherItem)
+
+    walk(decoded, dictTwin(decoded))
+    return sizes
+
+
+def paging(pages: int = 20) -> Tuple[int, int]:
+    """
+    keep `pages` search pages alive, as a user scrolling through the plaza does, with and without interning
+    :return: retained bytes per page (interned, not interned)
+    """
+    catalogue = SyntheticCatalogue(mods=pages * 50)
+    texts = [json.dumps(catalogue.search({"classId": "6", "pageSize": "50", "index": str(i * 50)})[1])
+             for i in range(pages)]
+
+    def readAll(responses):
+        for response in responses:
+            plazaPage(response)
+            for mod in response.data:
+                _ = (mod.categories, [file.sortableGameVersions for file in mod.latestFiles])
+
+    def decodeAll():
+        return [schemas.SearchModsResponse(**json.loads(text)) for text in texts]
+
+    sizes = []
+    for enabled in (True, False):
+        schemas.INTERNER.enabled = enabled
+        schemas.INTERNER.clear()
+        sizes.append(retained(decodeAll, readAll) // pages)
+    schemas.INTERNER.enabled = True
+    return sizes[0], sizes[1]
+
+
+def run(duration: float = 1.0) -> dict:  # noqa: memory is measured once, duration is unused
+    results = {}
+    for name, payload in fixtures().items():
+        schema = getattr(schemas, name)
+        decoded = schema(**payload)
+        slots = classSizes(decoded, twin=False)
+        dicts = classSizes(decoded, twin=True)
+        print(f"{name}: {sum(c for c, _ in slots.values())} schema objects per page")
+        print(f"  {'class':<28}{'count':>8}{'__dict__ B/obj':>16}{'__slots__ B/obj':>17}")
+        for cls in sorted(slots, key=lambda c: -slots[c][1]):
+            count, total = slots[cls]
+            print(f"  {cls:<28}{count:>8}{dicts[cls][1] / count:>16.0f}{total / count:>17.0f}")
+        pageSlots = sum(t for _, t in slots.values())
+        pageDicts = sum(t for _, t in dicts.values())
+        print(f"  objects per page: {pageDicts:,} B -> {pageSlots:,} B (x{pageSlots / pageDicts:.2f})")
+
+        text = json.dumps(payload)
+        decodeBytes = retained(lambda: schema(**json.loads(text)))
+        print(f"  retained after decoding one page: {decodeBytes:,} B")
+        results[f"{name}.objectBytes"] = pageSlots
+        results[f"{name}.retainedBytes"] = decodeBytes
+
+    text = json.dumps(fixtures()["SearchModsResponse"])
+    plazaBytes = retained(lambda: schemas.SearchModsResponse(**json.loads(text)), plazaPage)
+    print(f"SearchModsResponse retained after reading the plaza fields: {plazaBytes:,} B")
+    results["SearchModsResponse.plazaRetainedBytes"] = plazaBytes
+
+    interned, plain = paging()
+    print(f"20 pages kept alive, per page: {plain:,} B -> {interned:,} B interned (x{interned / plain:.2f})")
+    results["paging.pageRetainedBytes"] = interned
+    return results
+
+
+if __name__ == '__main__':
+    run()
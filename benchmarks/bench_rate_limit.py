@@ -0,0 +1,57 @@
+"""
+限流验证: 对本地替身服务器(限流模式)突发请求, 对比不限流与 RateLimitedAdapter 的失败数和等待时间;
+不限流时必然有请求被拒绝, 限流后必须没有失败, 否则基准报错
+python -m benchmarks.bench_rate_limit
+"""
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks.common import setupPath
+from benchmarks.mock_server import MockCurseForgeServer
+
+setupPath()
+
+import requests
+
+from src.curseforge.Metrics import ClientMetrics
+from src.curseforge.RateLimiter import RateLimiter, RateLimitedAdapter
+
+SERVER_RATE = 20  # requests per second accepted by the stand-in server
+
+
+def burst(server: MockCurseForgeServer, session: requests.Session, count: int, workers: int) -> dict:
+    server.resetStats()
+    start = time.perf_counter()
+    with ThreadPoolExecutor(workers) as pool:
+        codes = list(pool.map(lambda i: session.get(f"{server.baseUrl}/v1/mods/{1000 + i}").status_code,
+                              range(count)))
+    return {
+        "ok": codes.count(200),
+        "failed": len(codes) - codes.count(200),
+        "serverThrottled": server.stats["throttled"],
+        "seconds": round(time.perf_counter() - start, 3),
+    }
+
+
+def run(duration: float = 1.0, count: int = 100, workers: int = 16) -> dict:  # noqa: a fixed burst, duration is unused
+    with MockCurseForgeServer(rateLimit=SERVER_RATE, burst=SERVER_RATE) as server:
+        time.sleep(1)  # let the server bucket fill up
+        plain = burst(server, requests.Session(), count, workers)
+
+        time.sleep(1)
+        metrics = ClientMetrics()
+        limiter = RateLimiter(budgets={"default": (SERVER_RATE * 0.9, 5)}, metrics=metrics)
+        session = requests.Session()
+        session.mount(server.baseUrl, RateLimitedAdapter(limiter, pool_maxsize=workers))
+        limited = burst(server, session, count, workers)
+        limited["limiter"] = metrics.snapshot()
+
+    print("without limiter:", plain)
+    print("with limiter:   ", limited)
+    assert plain["failed"] > 0, "the stand-in server did not throttle the burst, nothing was verified"
+    assert limited["failed"] == 0, f"{limited['failed']} requests failed through the limiter"
+    return {"plain": plain, "limited": limited}
+
+
+if __name__ == '__main__':
+    run()
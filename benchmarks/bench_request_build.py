@@ -0,0 +1,119 @@
+"""
+请求构建微基准: 旧的逐次帧反射 + __query_builder 与新的 Endpoint 描述表对比
+python -m benchmarks.bench_request_build
+"""
+import enum
+import json
+import sys
+from urllib.parse import quote
+
+from benchmarks.common import setupPath, measure, report
+
+setupPath()
+
+from src.curseforge import Endpoints as ep
+from src.curseforge import SchemaClasses as schemas
+
+BASE_URL = "https://api.curseforge.com"
+
+
+class LegacyBuilder(object):
+    """
+    the request building part of CurseForgeAPI before the endpoint table, kept only for comparison
+    """
+
+    def __init__(self):
+        self.base_url = BASE_URL
+
+    def __query_builder(self, func, *params):
+        assert type(func) == type(self.searchMods), "func must be a function"
+
+        values = {}
+        for i, v in enumerate(params):
+            if v is not None:
+                if isinstance(v, enum.Enum):
+                    v = v.value
+                values[func.__code__.co_varnames[:func.__code__.co_argcount][i + 1]] = v
+        return "?" + "&".join([quote(f"{k}={v}", safe="=") for k, v in values.items()])
+
+    def searchMods(self, gameId, classId=None, categoryId=None, gameVersion=None, searchFilter=None, sortField=None,
+                   sortOrder=None, modLoaderType=None, gameVersionTypeId=None, slug=None, index=None, pageSize=None):
+        if index is not None:
+            if not 0 <= index <= 10000:
+                return schemas.ApiResponseCode.BadRequest
+        if pageSize is not None:
+            if not 0 <= pageSize <= 50:
+                return schemas.ApiResponseCode.BadRequest
+        if index is not None and pageSize is not None:
+            if not index + pageSize <= 10000:
+                return schemas.ApiResponseCode.BadRequest
+        this = eval(f"self.{sys._getframe().f_code.co_name}")
+        lvars = []
+        for i in this.__code__.co_varnames[:this.__code__.co_argcount][1:]:
+            lvars.append(locals()[i])
+        return self.base_url + f"/v1/mods/search{self.__query_builder(this, *lvars)}"
+
+    def getMinecraftVersions(self, sortDescending=None):
+        this = eval(f"self.{sys._getframe().f_code.co_name}")
+        lvars = []
+        for i in this.__code__.co_varnames[:this.__code__.co_argcount][1:]:
+            lvars.append(locals()[i])
+        return self.base_url + f"/v1/minecraft/version{self.__query_builder(this, *lvars)}"
+
+
+def endpointSearchMods(gameId, classId=None, categoryId=None, gameVersion=None, searchFilter=None, sortField=None,
+                       sortOrder=None, modLoaderType=None, gameVersionTypeId=None, slug=None, index=None,
+                       pageSize=None):
+    query = (gameId, classId, categoryId, gameVersion, searchFilter, sortField, sortOrder, modLoaderType,
+             gameVersionTypeId, slug, index, pageSize)
+    if not ep.SearchMods.checkBounds(query):
+        return schemas.ApiResponseCode.BadRequest
+    return ep.SearchMods.buildUrl(BASE_URL, (), query)
+
+
+def endpointGetMinecraftVersions(sortDescending=None):
+    return ep.GetMinecraftVersions.buildUrl(BASE_URL, (), (sortDescending,))
+
+
+SEARCH_KWARGS = dict(gameId=432, classId=6, categoryId=423, gameVersion="1.20.1", searchFilter="jei items",
+                     sortField=schemas.ModSearchSortField.Popularity, sortOrder=schemas.SortOrder.Descending,
+                     index=100, pageSize=50)
+
+
+BODIES = {
+    "fingerprints5000": schemas.GetFingerprintMatchesRequestBody(list(range(3_000_000_000, 3_000_005_000))),
+    "fuzzy100x50": schemas.GetFuzzyMatchesRequestBody(432, [
+        {"foldername": f"mods/folder{i}", "fingerprints": list(range(i * 50, i * 50 + 50))} for i in range(100)
+    ]),
+    "modIds50": schemas.GetModsByIdsListRequestBody(list(range(1000, 1050))),
+}
+
+
+def run(duration: float = 1.0) -> dict:
+    legacy = LegacyBuilder()
+    assert legacy.searchMods(**SEARCH_KWARGS) == endpointSearchMods(**SEARCH_KWARGS)
+    assert legacy.getMinecraftVersions(True) == endpointGetMinecraftVersions(True)
+
+    results = {
+        "searchMods.legacy": measure(lambda: legacy.searchMods(**SEARCH_KWARGS), duration),
+        "searchMods.endpoint": measure(lambda: endpointSearchMods(**SEARCH_KWARGS), duration),
+        "getMinecraftVersions.legacy": measure(lambda: legacy.getMinecraftVersions(True), duration),
+        "getMinecraftVersions.endpoint": measure(lambda: endpointGetMinecraftVersions(True), duration),
+    }
+    report("searchMods (legacy frame introspection)", results["searchMods.legacy"])
+    report("searchMods (endpoint table)", results["searchMods.endpoint"], results["searchMods.legacy"])
+    report("getMinecraftVersions (legacy frame introspection)", results["getMinecraftVersions.legacy"])
+    report("getMinecraftVersions (endpoint table)", results["getMinecraftVersions.endpoint"],
+           results["getMinecraftVersions.legacy"])
+
+    for name, body in BODIES.items():
+        assert json.loads(body.toJson())  # plain json
+        results[f"{name}.jsonpickle"] = measure(lambda: str(body), duration, batch=1)
+        results[f"{name}.toJson"] = measure(body.toJson, duration, batch=1)
+        report(f"{name} body (jsonpickle str)", results[f"{name}.jsonpickle"])
+        report(f"{name} body (toJson)", results[f"{name}.toJson"], results[f"{name}.jsonpickle"])
+    return results
+
+
+if __name__ == '__main__':
+    run()
@@ -0,0 +1,61 @@
+"""
+基准测试公共工具
+"""
+import os
+import sys
+import time
+import types
+from typing import Callable
+
+PLUGIN_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+
+def setupPath():
+    """
+    make `src` and the bundled site-packages importable, same as main.py
+    """
+    for path in (PLUGIN_DIR, os.path.join(PLUGIN_DIR, "site-packages")):
+        if path not in sys.path:
+            sys.path.append(path)
+
+
+def setupPluginPackage():
+    """
+    make the absolute `Plugins.ModPlaza_Plugin.src...` imports of the Qt code resolve to this checkout,
+    the Qt benchmarks import everything through that name so each module is loaded only once
+    """
+    setupPath()
+    if "Plugins.ModPlaza_Plugin" in sys.modules:
+        return
+    plugins = types.ModuleType("Plugins")
+    plugins.__path__ = [os.path.dirname(PLUGIN_DIR)]
+    plugin = types.ModuleType("Plugins.ModPlaza_Plugin")
+    plugin.__path__ = [PLUGIN_DIR]
+    plugins.ModPlaza_Plugin = plugin
+    sys.modules["Plugins"] = plugins
+    sys.modules["Plugins.ModPlaza_Plugin"] = plugin
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")  # headless
+
+
+def measure(func: Callable[[], object], duration: float = 1.0, batch: int = 100) -> float:
+    """
+    Call func repeatedly for about `duration` seconds
+    :param func: The function to measure
+    :param duration: The minimal measuring time (in seconds)
+    :param batch: How many calls to make between two clock reads
+    :return: calls per second
+    """
+    calls = 0
+    start = time.perf_counter()
+    while (elapsed := time.perf_counter() - start) < duration:
+        for _ in range(batch):
+            func()
+        calls += batch
+    return calls / elapsed
+
+
+def report(name: str, opsPerSecond: float, baseline: float = None):
+    if baseline:
+        print(f"{name:<48}{opsPerSecond:>14,.0f} ops/s  (x{opsPerSecond / baseline:.2f})")
+    else:
+        print(f"{name:<48}{opsPerSecond:>14,.0f} ops/s")
@@ -0,0 +1,538 @@
+"""
+本地 CurseForge API 替身服务器
+回放录制的响应(fixtures), 未录制的请求由确定性的合成目录回答, 可配置延迟, 抖动, 错误率和限流;
+/avatars/... 下的缩略图返回生成的纯色 png;
+录制模式下把未命中的请求转发到真实 API 并保存为 fixtures
+
+python -m benchmarks.mock_server --port 8765 --latency 0.05 --jitter 0.02 --error-rate 0.01 --rate-limit 20
+python -m benchmarks.mock_server --record --api-key <key>
+
+让插件连接替身服务器:
+CURSEFORGE_BASE_URL=http://127.0.0.1:8765 CURSEFORGE_API_KEY=any python main.py
+"""
+import argparse
+import hashlib
+import json
+import os
+import random
+import re
+import struct
+import threading
+import time
+import urllib.error
+import urllib.request
+import zlib
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+UPSTREAM_URL = "https://api.curseforge.com"
+MAX_RESULT_WINDOW = 10000
+DATE = "2023-06-01T12:34:56.123Z"
+
+Reply = Tuple[int, Any]  # (status, json body)
+GAME = {"id": 432, "name": "Minecraft", "slug": "minecraft", "dateModified": DATE,
+        "assets": {"iconUrl": "", "tileUrl": "", "coverUrl": ""}, "status": 6, "apiStatus": 2}
+
+
+def timestamp(n: int) -> str:
+    """
+    :return: A deterministic timestamp in the api format, the fraction has 0 to 3 digits like the real api
+    """
+    moment = datetime(2015, 1, 1) + timedelta(seconds=n * 104729)
+    fraction = f"{n * 7 % 1000:03d}"[:n % 4]
+    return moment.strftime("%Y-%m-%dT%H:%M:%S") + (f".{fraction}" if fraction else "") + "Z"
+
+
+def png(width: int, height: int, seed: int) -> bytes:
+    """
+    :return: A solid color RGB png, the color is derived from seed
+    """
+    def chunk(kind: bytes, data: bytes) -> bytes:
+        return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data))
+
+    pixel = bytes(((seed * 53) % 256, (seed * 97) % 256, (seed * 193) % 256))
+    rows = b"".join(b"\x00" + pixel * width for _ in range(height))
+    return (b"\x89PNG\r\n\x1a\n" + chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0))
+            + chunk(b"IDAT", zlib.compress(rows)) + chunk(b"IEND", b""))
+
+
+class FixtureStore(object):
+    """
+    recorded responses, one json file per request: {"method", "url", "body", "status", "response"}
+    """
+
+    def __init__(self, directory: str = FIXTURES_DIR):
+        self.directory = directory
+        self._lock = threading.Lock()
+        self._entries: Dict[str, Reply] = {}
+        if os.path.isdir(directory):
+            for name in sorted(os.listdir(directory)):
+                if name.endswith(".json"):
+                    with open(os.path.join(directory, name), encoding="utf-8") as f:
+                        entry = json.load(f)
+                    self._entries[self.key(entry["method"], entry["url"], entry["body"])] = (
+                        entry["status"], entry["response"]
+                    )
+
+    @staticmethod
+    def key(method: str, url: str, body: Optional[str]) -> str:
+        return f"{method} {url} {body or ''}"
+
+    def get(self, method: str, url: str, body: Optional[str]) -> Optional[Reply]:
+        return self._entries.get(self.key(method, url, body))
+
+    def save(self, method: str, url: str, body: Optional[str], status: int, response: Any):
+        key = self.key(method, url, body)
+        name = hashlib.sha1(key.encode()).hexdigest()[:16] + ".json"
+        with self._lock:
+            os.makedirs(self.directory, exist_ok=True)
+            with open(os.path.join(self.directory, name), "w", encoding="utf-8") as f:
+                json.dump({"method": method, "url": url, "body": body, "status": status, "response": response}, f,
+                          ensure_ascii=False, indent=1)
+            self._entries[key] = (status, response)
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class SyntheticCatalogue(object):
+    """
+    a deterministic stand-in for the Minecraft part of the api, built from a seed
+    """
+    LOADERS = (1, 4, 5, 6)  # Forge, Fabric, Quilt, NeoForge
+    CLASSES = (6, 6, 6, 5, 12, 4471)  # mostly mods
+
+    def __init__(self, mods: int = 2000, filesPerMod: int = 6, seed: int = 0):
+        rnd = random.Random(seed)
+        self.versions = [f"1.{minor}.{patch}" if patch else f"1.{minor}"
+                         for minor in range(12, 21) for patch in range(0, 6)]
+        self.categories = [self._category(6, "Mods", 6, isClass=True)] + [
+            self._category(400 + i, f"Category {i}", 6) for i in range(24)
+        ]
+        self.mods: Dict[int, dict] = {}
+        self.files: Dict[int, dict] = {}
+        self.fingerprints: Dict[int, dict] = {}
+        self._index: List[Tuple[dict, set, set, set]] = []  # (mod, categories, versions, loaders)
+
+        for modId in range(1000, 1000 + mods):
+            versions = set(rnd.sample(self.versions, rnd.randint(1, 6)))
+            loaders = set(rnd.sample(self.LOADERS, rnd.randint(1, 2)))
+            categories = rnd.sample(self.categories[1:], rnd.randint(1, 3))
+            files = []
+            for n in range(filesPerMod):
+                fileId = modId * 100 + n
+                file = self._file(fileId, modId, rnd.choice(sorted(versions)), rnd.choice(sorted(loaders)), rnd)
+                self.files[fileId] = file
+                self.fingerprints[file["fileFingerprint"]] = file
+                files.append(file)
+            mod = self._mod(modId, rnd.choice(self.CLASSES), categories, files, rnd)
+            self.mods[modId] = mod
+            self._index.append((mod, {c["id"] for c in categories}, versions, loaders))
+
+    # region builders
+    @staticmethod
+    def _category(categoryId: int, name: str, classId: int, isClass: bool = False) -> dict:
+        return {"id": categoryId, "gameId": 432, "name": name, "slug": name.lower().replace(" ", "-"),
+                "url": f"https://www.curseforge.com/minecraft/{categoryId}", "iconUrl": "", "dateModified": DATE,
+                "isClass": isClass, "classId": classId, "parentCategoryId": classId, "displayIndex": 0}
+
+    @staticmethod
+    def _file(fileId: int, modId: int, version: str, loader: int, rnd: random.Random) -> dict:
+        loaderName = {1: "Forge", 4: "Fabric", 5: "Quilt", 6: "NeoForge"}[loader]
+        return {
+            "id": fileId, "gameId": 432, "modId": modId, "isAvailable": True,
+            "displayName": f"mod{modId}-{version}-{fileId}.jar", "fileName": f"mod{modId}-{version}-{fileId}.jar",
+            "releaseType": rnd.choice((1, 1, 2, 3)), "fileStatus": 4,
+            "hashes": [{"value": hashlib.sha1(str(fileId).encode()).hexdigest(), "algo": 1},
+                       {"value": hashlib.md5(str(fileId).encode()).hexdigest(), "algo": 2}],
+            "fileDate": timestamp(fileId), "fileLength": rnd.randint(10_000, 20_000_000), "downloadCount": rnd.randint(0, 10 ** 6),
+            "downloadUrl": f"https://edge.forgecdn.net/files/{fileId // 1000}/{fileId % 1000}/mod{modId}.jar",
+            "gameVersions": [version, loaderName],
+            "sortableGameVersions": [
+                {"gameVersionName": version, "gameVersionPadded": version, "gameVersion": version,
+                 "gameVersionReleaseDate": DATE, "gameVersionTypeId": 73250},
+                {"gameVersionName": loaderName, "gameVersionPadded": "0", "gameVersion": "",
+                 "gameVersionReleaseDate": DATE, "gameVersionTypeId": 68441},
+            ],
+            "dependencies": [], "fileFingerprint": rnd.getrandbits(32),
+            "modules": [{"name": "META-INF", "fingerprint": rnd.getrandbits(32)}],
+        }
+
+    @staticmethod
+    def _mod(modId: int, classId: int, categories: List[dict], files: List[dict], rnd: random.Random) -> dict:
+        latest = files[-1]
+        return {
+            "id": modId, "gameId": 432, "name": f"Synthetic Mod {modId}", "slug": f"synthetic-mod-{modId}",
+            "links": {"websiteUrl": f"https://www.curseforge.com/minecraft/mc-mods/synthetic-mod-{modId}",
+                      "wikiUrl": "", "issuesUrl": "", "sourceUrl": ""},
+            "summary": f"Summary of synthetic mod {modId}", "status": 4, "downloadCount": rnd.randint(0, 10 ** 8),
+            "isFeatured": rnd.random() < 0.01, "primaryCategoryId": categories[0]["id"], "categories": categories,
+            "classId": classId, "authors": [{"id": modId % 97, "name": f"author{modId % 97}", "url": ""}],
+            "logo": {"id": modId, "modId": modId, "title": "logo", "description": "",
+                     "thumbnailUrl": f"https://media.forgecdn.net/avatars/thumbnails/{modId}/64/64/logo.png",
+                     "url": f"https://media.forgecdn.net/avatars/{modId}/logo.png"},
+            "screenshots": [], "mainFileId": latest["id"], "latestFiles": [latest],
+            "latestFilesIndexes": [{"gameVersion": f["gameVersions"][0], "fileId": f["id"], "filename": f["fileName"],
+                                    "releaseType": f["releaseType"], "gameVersionTypeId": 73250, "modLoader": 1}
+                                   for f in files],
+            "dateCreated": timestamp(modId * 3), "dateModified": timestamp(modId * 3 + 1),
+            "dateReleased": timestamp(modId * 3 + 2), "allowModDistribution": True,
+            "gamePopularityRank": rnd.randint(1, 100000), "isAvailable": True, "thumbsUpCount": rnd.randint(0, 500),
+        }
+
+    def _minecraftVersion(self, i: int, version: str) -> dict:
+        return {"id": i, "gameVersionId": 9000 + i, "versionString": version, "jarDownloadUrl": "",
+                "jsonDownloadUrl": "", "approved": True, "dateModified": DATE, "gameVersionTypeId": 73250,
+                "gameVersionStatus": 1, "gameVersionTypeStatus": 1}
+
+    def _modloaderName(self, version: str) -> str:
+        return f"forge-{version}-{len(version)}.0.0"
+    # endregion
+
+    # region routes
+    def search(self, q: Dict[str, str]) -> Reply:
+        index, pageSize = int(q.get("index", 0)), int(q.get("pageSize", 50))
+        if index < 0 or not 0 <= pageSize <= 50 or index + pageSize > MAX_RESULT_WINDOW:
+            return 400, None
+        rows = self._index
+        if "classId" in q:
+            rows = [r for r in rows if r[0]["classId"] == int(q["classId"])]
+        if "categoryId" in q:
+            rows = [r for r in rows if int(q["categoryId"]) in r[1]]
+        if "gameVersion" in q:
+            rows = [r for r in rows if q["gameVersion"] in r[2]]
+        if "modLoaderType" in q:
+            rows = [r for r in rows if int(q["modLoaderType"]) in r[3]]
+        if "slug" in q:
+            rows = [r for r in rows if r[0]["slug"] == q["slug"]]
+        if "searchFilter" in q:
+            words = q["searchFilter"].lower()
+            rows = [r for r in rows if words in r[0]["name"].lower()]
+        key = {
+            "1": lambda m: m["isFeatured"], "2": lambda m: -m["gamePopularityRank"], "3": lambda m: m["id"],
+            "4": lambda m: m["name"], "5": lambda m: m["authors"][0]["name"], "6": lambda m: m["downloadCount"],
+            "7": lambda m: m["primaryCategoryId"], "8": lambda m: m["latestFiles"][0]["gameVersions"][0],
+        }.get(q.get("sortField"))
+        mods = [r[0] for r in rows]
+        if key is not None:
+            mods.sort(key=lambda m: (key(m), m["id"]))
+        if q.get("sortOrder", "desc") == "desc":
+            mods.reverse()
+        page = mods[index:index + pageSize]
+        return 200, {"data": page, "pagination": {"index": index, "pageSize": pageSize, "resultCount": len(page),
+                                                  "totalCount": len(mods)}}
+
+    def modFiles(self, modId: int, q: Dict[str, str]) -> Reply:
+        index, pageSize = int(q.get("index", 0)), int(q.get("pageSize", 50))
+        if index < 0 or not 0 <= pageSize <= 50 or index + pageSize > MAX_RESULT_WINDOW:
+            return 400, None
+        if modId not in self.mods:
+            return 404, None
+        files = [f for f in self.files.values() if f["modId"] == modId]
+        if "gameVersion" in q:
+            files = [f for f in files if q["gameVersion"] in f["gameVersions"]]
+        page = files[index:index + pageSize]
+        return 200, {"data": page, "pagination": {"index": index, "pageSize": pageSize, "resultCount": len(page),
+                                                  "totalCount": len(files)}}
+
+    def route(self, method: str, path: str, q: Dict[str, str], body: Any) -> Reply:
+        for routeMethod, pattern, handler in self.routes:
+            if routeMethod == method and (match := pattern.fullmatch(path)):
+                return handler(self, q, body, *match.groups())
+        return 404, None
+
+    routes: List[Tuple[str, "re.Pattern", Callable[..., Reply]]] = []
+    # endregion
+
+
+def _route(method: str, pattern: str):
+    def decorator(func):
+        SyntheticCatalogue.routes.append((method, re.compile(pattern), func))
+        return func
+
+    return decorator
+
+
+def _found(value: Any) -> Reply:
+    return (200, {"data": value}) if value is not None else (404, None)
+
+
+# region routes table, paths are matched in full
+_route("GET", r"/v1/games")(lambda c, q, b: (200, {
+    "data": [GAME], "pagination": {"index": 0, "pageSize": 50, "resultCount": 1, "totalCount": 1}
+}))
+_route("GET", r"/v1/games/(\d+)")(lambda c, q, b, gameId: _found(GAME if gameId == "432" else None))
+_route("GET", r"/v1/games/(\d+)/versions")(lambda c, q, b, gameId: (200, {"data": [
+    {"type": 73250, "versions": c.versions}, {"type": 68441, "versions": ["Forge", "Fabric", "Quilt", "NeoForge"]}
+]}))
+_route("GET", r"/v1/games/(\d+)/version-types")(lambda c, q, b, gameId: (200, {"data": [
+    {"id": 73250, "gameId": 432, "name": "Minecraft 1.20", "slug": "minecraft-1-20"},
+    {"id": 68441, "gameId": 432, "name": "Modloader", "slug": "modloader"},
+]}))
+_route("GET", r"/v1/categories")(lambda c, q, b: (200, {"data": [
+    x for x in c.categories if "classId" not in q or x["classId"] == int(q["classId"])
+]}))
+_route("GET", r"/v1/mods/search")(lambda c, q, b: c.search(q))
+_route("GET", r"/v1/mods/(\d+)")(lambda c, q, b, modId: _found(c.mods.get(int(modId))))
+_route("POST", r"/v1/mods")(lambda c, q, b: (200, {"data": [
+    c.mods[i] for i in map(int, b.get("modIds", [])) if i in c.mods
+]}))
+_route("POST", r"/v1/mods/featured")(lambda c, q, b: (200, {"data": {
+    "featured": [m for m in c.mods.values() if m["isFeatured"]][:6],
+    "popular": sorted(c.mods.values(), key=lambda m: m["gamePopularityRank"])[:6],
+    "recentlyUpdated": list(c.mods.values())[-6:],
+}}))
+_route("GET", r"/v1/mods/(\d+)/description")(lambda c, q, b, modId: _found(
+    f"<p>Description of synthetic mod {modId}</p>" * 40 if int(modId) in c.mods else None))
+_route("GET", r"/v1/mods/(\d+)/files")(lambda c, q, b, modId: c.modFiles(int(modId), q))
+_route("GET", r"/v1/mods/(\d+)/files/(\d+)")(lambda c, q, b, modId, fileId: _found(c.files.get(int(fileId))))
+_route("POST", r"/v1/mods/files")(lambda c, q, b: (200, {"data": [
+    c.files[i] for i in map(int, b.get("fileIds", [])) if i in c.files
+]}))
+_route("GET", r"/v1/mods/(\d+)/files/(\d+)/changelog")(lambda c, q, b, modId, fileId: _found(
+    f"<ul><li>Changes of file {fileId}</li></ul>" if int(fileId) in c.files else None))
+_route("GET", r"/v1/mods/(\d+)/files/(\d+)/download-url")(lambda c, q, b, modId, fileId: _found(
+    c.files[int(fileId)]["downloadUrl"] if int(fileId) in c.files else None))
+_route("POST", r"/v1/fingerprints/?")(lambda c, q, b: (200, {"data": {
+    "isCacheBuilt": True,
+    "exactMatches": [{"id": f["modId"], "file": f, "latestFiles": [f]}
+                     for fp in b.get("fingerprints", []) if (f := c.fingerprints.get(int(fp)))],
+    "exactFingerprints": [int(fp) for fp in b.get("fingerprints", []) if int(fp) in c.fingerprints],
+    "partialMatches": [], "partialMatchFingerprints": {},
+    "installedFingerprints": [int(fp) for fp in b.get("fingerprints", [])],
+    "unmatchedFingerprints": [int(fp) for fp in b.get("fingerprints", []) if int(fp) not in c.fingerprints],
+}}))
+_route("POST", r"/v1/fingerprints/fuzzy")(lambda c, q, b: (200, {"data": {"fuzzyMatches": [
+    {"id": f["modId"], "file": f, "latestFiles": [f], "fingerprints": [fp]}
+    for folder in b.get("fingerprints", []) for fp in folder.get("fingerprints", [])
+    if (f := c.fingerprints.get(int(fp)))
+]}}))
+_route("GET", r"/v1/minecraft/version")(lambda c, q, b: (200, {"data": [
+    c._minecraftVersion(i, v) for i, v in enumerate(reversed(c.versions) if q.get("sortDescending") == "True"
+                                                    else c.versions)
+]}))
+_route("GET", r"/v1/minecraft/version/([^/]+)")(lambda c, q, b, version: _found(
+    c._minecraftVersion(c.versions.index(version), version) if version in c.versions else None))
+_route("GET", r"/v1/minecraft/modloader")(lambda c, q, b: (200, {"data": [
+    {"name": c._modloaderName(v), "gameVersion": v, "latest": True, "recommended": True, "dateModified": DATE,
+     "type": 1} for v in c.versions if "version" not in q or q["version"] == v
+]}))
+_route("GET", r"/v1/minecraft/modloader/([^/]+)")(lambda c, q, b, name: _found(next((
+    {"id": i, "gameVersionId": 9000 + i, "minecraftGameVersionId": i, "forgeVersion": name.split("-")[-1],
+     "name": name, "type": 1, "downloadUrl": "", "filename": f"{name}.jar", "installMethod": 3, "latest": True,
+     "recommended": True, "approved": True, "dateModified": DATE, "mavenVersionString": name, "versionJson": "{}",
+     "librariesInstallLocation": "libraries", "minecraftVersion": v, "additionalFilesJson": "",
+     "modLoaderGameVersionId": 1, "modLoaderGameVersionTypeId": 1, "modLoaderGameVersionStatus": 1,
+     "modLoaderGameVersionTypeStatus": 1, "mcGameVersionId": i, "mcGameVersionTypeId": 73250,
+     "mcGameVersionStatus": 1, "mcGameVersionTypeStatus": 1, "installProfileJson": "{}"}
+    for i, v in enumerate(c.versions) if c._modloaderName(v) == name
+), None)))
+# endregion
+
+
+class MockCurseForgeServer(object):
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, catalogue: Optional[SyntheticCatalogue] = None,
+                 fixtures: Optional[FixtureStore] = None, latency: float = 0.0, jitter: float = 0.0,
+                 errorRate: float = 0.0, rateLimit: Optional[float] = None, burst: int = 10, seed: int = 0,
+                 record: bool = False, apiKey: Optional[str] = None, upstreamUrl: str = UPSTREAM_URL,
+                 validators: bool = True):
+        """
+        :param host: The address to bind
+        :param port: The port to bind, 0 picks a free one
+        :param catalogue: Answers the requests missing from the fixtures, a default SyntheticCatalogue if None
+        :param fixtures: Recorded responses, replayed before the catalogue is asked
+        :param latency: The mean delay added to every response (in seconds)
+        :param jitter: The delay varies uniformly within latency ± jitter
+        :param errorRate: The probability of answering 503 instead
+        :param rateLimit: Requests per second accepted, above that 429 with Retry-After is returned, None disables it
+        :param burst: The number of requests accepted at once when rateLimit is set
+        :param seed: The seed of the latency and error draws
+        :param record: Forward the requests missing from the fixtures to the real api and save the responses
+        :param apiKey: The api key used when recording
+        :param upstreamUrl: The real api
+        :param validators: Send an ETag with every GET response and answer a matching If-None-Match with 304,
+            False serves plain 200s without validators
+        """
+        self.catalogue = SyntheticCatalogue() if catalogue is None else catalogue
+        self.fixtures = FixtureStore() if fixtures is None else fixtures
+        self.latency = latency
+        self.jitter = jitter
+        self.errorRate = errorRate
+        self.rateLimit = rateLimit
+        self.burst = burst
+        self.record = record
+        self.apiKey = apiKey
+        self.upstreamUrl = upstreamUrl
+        self.validators = validators
+        self.stats: Dict[str, int] = {"requests": 0, "throttled": 0, "errors": 0, "notModified": 0, "replayed": 0,
+                                      "recorded": 0}
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._tokens = float(burst)
+        self._last = time.monotonic()
+        self._server = ThreadingHTTPServer((host, port), _Handler)
+        self._server.daemon_threads = True
+        self._server.mock = self
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def baseUrl(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> 'MockCurseForgeServer':
+        self._thread = threading.Thread(target=self._server.serve_forever, name="MockCurseForgeServer", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *args):
+        self.stop()
+
+    def resetStats(self):
+        with self._lock:
+            for key in self.stats:
+                self.stats[key] = 0
+
+    def _count(self, name: str):
+        with self._lock:
+            self.stats[name] += 1
+
+    def _admit(self) -> Tuple[bool, float, bool]:
+        """
+        :return: (accepted by the rate limit, delay to add, fail with 503)
+        """
+        with self._lock:
+            self.stats["requests"] += 1
+            accepted = True
+            if self.rateLimit is not None:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._last) * self.rateLimit)
+                self._last = now
+                accepted = self._tokens >= 1
+                if accepted:
+                    self._tokens -= 1
+            delay = max(0.0, self.latency + self._random.uniform(-self.jitter, self.jitter))
+            failed = self._random.random() < self.errorRate
+        return accepted, delay, failed
+
+    def answer(self, method: str, url: str, body: Optional[str]) -> Reply:
+        if (reply := self.fixtures.get(method, url, body)) is not None:
+            self._count("replayed")
+            return reply
+        if self.record:
+            reply = self._fetchUpstream(method, url, body)
+            self.fixtures.save(method, url, body, *reply)
+            self._count("recorded")
+            return reply
+        parts = urlsplit(url)
+        query = {k: v[0] for k, v in parse_qs(parts.query).items()}
+        return self.catalogue.route(method, parts.path, query, json.loads(body) if body else {})
+
+    def _fetchUpstream(self, method: str, url: str, body: Optional[str]) -> Reply:
+        request = urllib.request.Request(
+            self.upstreamUrl + url, data=body.encode() if body else None, method=method,
+            headers={"Accept": "application/json", "Content-Type": "application/json", "x-api-key": self.apiKey or ""}
+        )
+        try:
+            with urllib.request.urlopen(request, timeout=30) as response:
+                return response.status, json.loads(response.read() or b"null")
+        except urllib.error.HTTPError as e:
+            return e.code, None
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive, like the real api
+    disable_nagle_algorithm = True  # headers and body are separate writes, don't wait for the delayed ack
+
+    def do_GET(self):
+        self._serve("GET", None)
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        self._serve("POST", self.rfile.read(length).decode() if length else None)
+
+    def _serve(self, method: str, body: Optional[str]):
+        mock: MockCurseForgeServer = self.server.mock
+        accepted, delay, failed = mock._admit()
+        if delay:
+            time.sleep(delay)
+        if not accepted:
+            mock._count("throttled")
+            return self._send(429, b"", {"Retry-After": "1"})
+        if failed:
+            mock._count("errors")
+            return self._send(503, b"")
+
+        if method == "GET" and (image := re.fullmatch(r"/avatars/(?:thumbnails/)?(\d+)/.*\.png", self.path)):
+            return self._send(200, png(64, 64, int(image.group(1))), {"Content-Type": "image/png"})
+
+        status, response = mock.answer(method, self.path, body)
+        payload = json.dumps(response, separators=(",", ":")).encode() if response is not None else b""
+        if status != 200 or method != "GET" or not mock.validators:
+            return self._send(status, payload)
+        etag = '"' + hashlib.sha1(payload).hexdigest()[:16] + '"'
+        if self.headers.get("If-None-Match") == etag:
+            mock._count("notModified")
+            return self._send(304, b"", {"ETag": etag})
+        self._send(200, payload, {"ETag": etag})
+
+    def _send(self, status: int, payload: bytes, headers: Optional[Dict[str, str]] = None):
+        self.send_response(status)
+        if payload and "Content-Type" not in (headers or {}):
+            self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(payload)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, *args):
+        pass
+
+
+def main():
+    parser = argparse.ArgumentParser(description="local stand-in for the CurseForge api")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.0, help="mean added delay in seconds")
+    parser.add_argument("--jitter", type=float, default=0.0, help="delay varies within latency ± jitter")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="probability of a 503")
+    parser.add_argument("--rate-limit", type=float, default=None, help="requests per second before 429")
+    parser.add_argument("--burst", type=int, default=10)
+    parser.add_argument("--mods", type=int, default=2000, help="size of the synthetic catalogue")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--fixtures", default=FIXTURES_DIR, help="directory of recorded responses")
+    parser.add_argument("--record", action="store_true", help="forward misses to the real api and save them")
+    parser.add_argument("--api-key", default=os.environ.get("CURSEFORGE_API_KEY"))
+    parser.add_argument("--no-validators", action="store_true", help="send no ETag, never answer 304")
+    args = parser.parse_args()
+    if args.record and not args.api_key:
+        parser.error("--record needs --api-key or CURSEFORGE_API_KEY")
+
+    server = MockCurseForgeServer(
+        args.host, args.port, SyntheticCatalogue(args.mods, seed=args.seed), FixtureStore(args.fixtures),
+        args.latency, args.jitter, args.error_rate, args.rate_limit, args.burst, args.seed, args.record, args.api_key,
+        validators=not args.no_validators
+    )
+    print(f"serving on {server.baseUrl} ({len(server.fixtures)} fixtures{', recording' if args.record else ''})")
+    try:
+        server._server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server._server.server_close()
+        print(server.stats)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,123 @@
+"""
+基准测试入口: 逐个在独立进程中运行基准, 结果写成 json, 可与其他提交的结果对比
+python -m benchmarks.run [--duration 1] [--only bench_decode ...] [--out result.json]
+python -m benchmarks.run --compare old.json new.json [--threshold 0.1]
+"""
+import argparse
+import contextlib
+import importlib
+import json
+import platform
+import subprocess
+import sys
+import time
+
+from benchmarks.common import PLUGIN_DIR
+
+SUITE = (
+    "bench_request_build",
+    "bench_decode",
+    "bench_client",
+    "bench_cachedb",
+    "bench_future",
+    "bench_fetch_image",
+    "bench_memory",
+    "bench_file_table",
+    "bench_rate_limit",
+)
+
+
+def single(module: str, duration: float):
+    """
+    run one benchmark in this process, the human readable report goes to stderr, the json result to stdout
+    """
+    with contextlib.redirect_stdout(sys.stderr):
+        results = importlib.import_module(f"benchmarks.{module}").run(duration)
+    print(json.dumps(results))
+
+
+def runModule(module: str, duration: float) -> dict:
+    process = subprocess.run(
+        [sys.executable, "-m", "benchmarks.run", "--single", module, "--duration", str(duration)],
+        cwd=PLUGIN_DIR, stdout=subprocess.PIPE, text=True
+    )
+    if process.returncode != 0:
+        raise RuntimeError(f"{module} exited with {process.returncode}")
+    return json.loads(process.stdout.strip().splitlines()[-1])
+
+
+def commit() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=PLUGIN_DIR, stdout=subprocess.PIPE,
+                              stderr=subprocess.DEVNULL, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def runSuite(modules, duration: float) -> dict:
+    results = {}
+    for module in modules:
+        print(f"== {module}", file=sys.stderr)
+        results[module] = runModule(module, duration)
+    return {
+        "commit": commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "duration": duration,
+        "results": results,
+    }
+
+
+def compare(old: dict, new: dict, threshold: float) -> int:
+    """
+    print the ratio of every numeric case present in both results, cases ending with "Bytes" are sizes
+    (lower is better), everything else is ops/s; nested results (stats, pass/fail runs) are skipped
+    :return: number of cases that got worse by more than threshold
+    """
+    regressions = 0
+    print(f"{old['commit']} -> {new['commit']}")
+    for module, cases in new["results"].items():
+        for case, ops in cases.items():
+            before = old["results"].get(module, {}).get(case)
+            if not before or not isinstance(before, (int, float)) or not isinstance(ops, (int, float)):
+                continue
+            ratio = ops / before
+            if case.endswith("Bytes"):
+                ratio = 1 / ratio if ratio else float("inf")
+            mark = ""
+            if ratio < 1 - threshold:
+                mark = "  <- worse"
+                regressions += 1
+            elif ratio > 1 + threshold:
+                mark = "  <- better"
+            print(f"{module + '.' + case:<56}{before:>14,.0f}{ops:>14,.0f}  x{ratio:.2f}{mark}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="run the ModPlaza benchmarks")
+    parser.add_argument("--duration", type=float, default=1.0, help="measuring time of each case (in seconds)")
+    parser.add_argument("--only", nargs="+", choices=SUITE, help="run only these benchmarks")
+    parser.add_argument("--out", help="write the results to this json file")
+    parser.add_argument("--single", choices=SUITE, help=argparse.SUPPRESS)
+    parser.add_argument("--compare", nargs=2, metavar=("OLD", "NEW"), help="compare two result files")
+    parser.add_argument("--threshold", type=float, default=0.1, help="relative change reported by --compare")
+    args = parser.parse_args()
+
+    if args.single:
+        return single(args.single, args.duration)
+    if args.compare:
+        with open(args.compare[0]) as old, open(args.compare[1]) as new:
+            sys.exit(1 if compare(json.load(old), json.load(new), args.threshold) else 0)
+
+    result = runSuite(args.only or SUITE, args.duration)
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(result, f, indent=2)
+    else:
+        print(json.dumps(result, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,47 @@
+import os
+import tempfile
+
+from benchmarks.common import setupPluginPackage
+
+setupPluginPackage()
+
+from Plugins.ModPlaza_Plugin.src.utils.CacheDB import CacheDB, EntryType
+
+with tempfile.TemporaryDirectory() as tmp:
+    filename = os.path.join(tmp, "test.cache")
+
+    # 写入已弹出的表不应进入数据库日志
+    db = CacheDB(filename)
+    db.root.addRecord("a/kept", b"kept")
+    db.save()  # kept 的值进入段文件
+    table = db.root.getNested("a", EntryType.Table)
+    db.root.pop("a", EntryType.Table)
+    table.addRecord("ghost", b"x")
+    assert table.path == () and table.parent is None
+    db.root.addRecord("b/1", b"1")
+    replaced = db.root.getNested("b", EntryType.Table)
+    db.root.createTable("b", replace=True)
+    replaced.addRecord("ghost", b"x")
+    db.save()
+    db.compact()  # 删除旧段文件, 已弹出的表仍可读取
+    assert bytes(table.getRecord("kept")) == b"kept"
+
+    reopened = CacheDB(filename)
+    assert not reopened.root.has("a", EntryType.Table)
+    assert not reopened.root.has("a/ghost")
+    assert not reopened.root.has("b/ghost") and not reopened.root.has("b/1")
+    assert reopened.root.has("b", EntryType.Table)
+    print("popped table test done")
+
+    # replace=False 不覆盖已有的记录和表
+    db = CacheDB(filename)
+    db.root.addRecord("c/1", b"old")
+    assert db.root.addRecord("c/1", b"new") is False
+    assert db.root.createTable("c") is False and db.root.has("c/1")
+    size = db.root.getSize()
+    assert bytes(db.root.getRecord("c/1")) == b"old"
+    assert db.root.addRecord("c/1", b"newer", replace=True) is True
+    assert db.root.getSize() == size + 2
+    db.save()
+    assert bytes(CacheDB(filename).root.getRecord("c/1")) == b"newer"
+    print("replace test done")
@@ -0,0 +1,63 @@
+import sys
+
+from benchmarks.common import setupPluginPackage
+from benchmarks.mock_server import SyntheticCatalogue
+
+setupPluginPackage()
+
+from PyQt5.QtCore import Qt
+from PyQt5.QtWidgets import QApplication
+
+from Plugins.ModPlaza_Plugin.src.curseforge import SchemaClasses as schemas
+from Plugins.ModPlaza_Plugin.src.model import ModFileEntry, getGameVersionAndModLoader
+from Plugins.ModPlaza_Plugin.src.model.modFileTable import ModFileTable
+from Plugins.ModPlaza_Plugin.src.model.modFilesModel import ModFilesModel
+
+app = QApplication(sys.argv)
+files = [schemas.File(**file) for file in SyntheticCatalogue(mods=3, filesPerMod=100).files.values()]
+table = ModFileTable.fromFiles(files)
+
+
+def expected(gameVersion=None, modLoader=None, releaseTypes=None):
+    rows = []
+    for row, file in enumerate(files):
+        gameVersions, modLoaders = getGameVersionAndModLoader(file.sortableGameVersions)
+        if ((gameVersion is None or gameVersion in gameVersions) and (modLoader is None or modLoader in modLoaders)
+                and (releaseTypes is None or file.releaseType in releaseTypes)):
+            rows.append(row)
+    return rows
+
+
+# 表格的筛选与逐个文件判断一致
+version, loader = (names[0] for names in getGameVersionAndModLoader(files[0].sortableGameVersions))
+assert expected(version, loader) and len(expected(version, loader)) < len(files)
+for releaseTypes in (None, (), (schemas.FileReleaseType.Release,), tuple(schemas.FileReleaseType)):
+    for gameVersion, modLoader in ((None, None), (version, None), (None, loader), (version, loader), ("0.0", None)):
+        assert table.rows(gameVersion, modLoader, releaseTypes) == expected(gameVersion, modLoader, releaseTypes)
+
+model = ModFilesModel()
+resets = []
+model.modelReset.connect(lambda: resets.append(model.rowCount()))
+assert model.rowCount() == 0
+
+# 先设置筛选, 文件到达后按筛选显示
+model.setFilter(version, loader)
+model.onModFilesGot(table)
+assert resets == [0, len(expected(version, loader))]
+assert model.modLoaders() == sorted({m for f in files for m in getGameVersionAndModLoader(f.sortableGameVersions)[1]})
+
+# UserRole 返回与 ModFileEntry.serialize 相同的 dict, DisplayRole 返回对应的列
+for i, row in enumerate(expected(version, loader)):
+    data = model.data(model.index(i, 0), Qt.ItemDataRole.UserRole)
+    assert isinstance(data, dict) and data == ModFileEntry.serialize(files[row])
+    assert model.data(model.index(i, 1), Qt.ItemDataRole.DisplayRole) == files[row].displayName
+    assert model.data(model.index(i, 0), Qt.ItemDataRole.DisplayRole) == data["releaseType"]
+
+model.setFilter(modLoader=loader)
+assert model.rowCount() == len(expected(None, loader))
+model.setFilter()
+assert model.rowCount() == len(files)
+assert model.data(model.index(len(files) - 1, 0), Qt.ItemDataRole.UserRole)["name"] == files[-1].displayName
+model.setFilter("0.0")
+assert model.rowCount() == 0
+print("mod files model test done")
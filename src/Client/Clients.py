@@ -6,8 +6,9 @@ import requests_cache as rqc
 try:
     from .API_KEY import __KEY__
 except ImportError:
-    pass
+    __KEY__ = os.environ.get("CURSEFORGE_API_KEY", "")
 from ..curseforge import CurseForgeAPI
+from ..curseforge import CachePolicy
 
 proxy = {
     "http": "127.0.0.1:7890",
@@ -34,13 +35,18 @@ def vacuum():
 shortCachedRequest = rqc.CachedSession(
     os.path.join(curdir, "cache", "CurseForgeRequest-Cache"),
     backend="sqlite",
-    expire_after=3600
+    expire_after=3600,  # endpoints missing from the policy table
+    urls_expire_after=CachePolicy.urlsExpireAfter()
 )
 # shortCachedRequest.cache.delete(expired=True)
 longCachedRequest = rqc.CachedSession(
     os.path.join(curdir, "cache", "CurseForgeBlob-Cache"),
     backend="sqlite",
-    expire_after=86400  # 1day
+    expire_after=86400,  # 1day
+    urls_expire_after=CachePolicy.BLOB_EXPIRE_AFTER
 )
 # longCachedRequest.cache.delete(expired=True)
-CfClient = CurseForgeAPI(__KEY__, shortCachedRequest)
+CfClient = CurseForgeAPI(
+    __KEY__, shortCachedRequest,
+    baseUrl=os.environ.get("CURSEFORGE_BASE_URL", "https://api.curseforge.com")  # e.g. benchmarks/mock_server.py
+)
@@ -5,6 +5,7 @@ from Plugins.ModPlaza_Plugin.src.concurrent.task.taskManager import BaseTaskExec
 from Plugins.ModPlaza_Plugin.src.concurrent.task.task import BaseTask
 from Plugins.ModPlaza_Plugin.src.concurrent.future.future import Future
 from ..curseforge import CurseForgeAPI, SchemaClasses as schemas
+from ..model.modFileTable import ModFileTable
 
 
 @dataclass
@@ -55,12 +56,14 @@ class MinecraftModSearchTask(BaseTask):
             future: Future,
             cfClient: CurseForgeAPI,
             search: CurseForgeSearchBody,
+            staleResponse: Optional[schemas.SearchModsResponse] = None,
             parent=None
     ):
         super().__init__(_id=_id, future=future)
         self._parent = parent
         self.cfClient: CurseForgeAPI = cfClient
         self.searchBody = search
+        self.staleResponse = staleResponse
 
     def run(self) -> None:
         cf = self.cfClient
@@ -76,7 +79,13 @@ class MinecraftModSearchTask(BaseTask):
             index=search.index,
             pageSize=search.pageSize
         )
-        self._taskDone(response=response)
+        if self.staleResponse is None:
+            self._taskDone(response=response, expired=cf.lastReadExpired)
+        else:  # the same body (a 304, or a 200 with the same ETag or digest) decodes to the stale object itself
+            self._taskDone(
+                response=response,
+                changed=not isinstance(response, schemas.ApiResponseCode) and response is not self.staleResponse
+            )
 
 
 class GetMinecraftInfoExecutor(BaseTaskExecutor):
@@ -106,29 +115,75 @@ class GetMinecraftInfoExecutor(BaseTaskExecutor):
 
 
 class MinecraftModSearchExecutor(BaseTaskExecutor):
-    def __init__(self, clClient: CurseForgeAPI, useGlobalThreadPool=True):
+    def __init__(self, clClient: CurseForgeAPI, useGlobalThreadPool=True, staleWhileRevalidate=False):
+        """
+        :param clClient: The CurseForge client
+        :param useGlobalThreadPool: Whether to run the tasks in the global QThreadPool
+        :param staleWhileRevalidate: Answer searches from the cache first, even if the entry expired,
+            then refresh expired ones in the background and emit Future.refreshed if the result changed
+        """
         super().__init__(useGlobalThreadPool=useGlobalThreadPool)
         self.cfClient = clClient
+        self.staleWhileRevalidate = staleWhileRevalidate
 
     def asyncSearchMod(self, searchBody: CurseForgeSearchBody) -> Future:
         future = Future()
+        if self.staleWhileRevalidate:
+            self.__searchTask(future, searchBody, stage="stale")
+        else:
+            task = MinecraftModSearchTask(
+                _id=self.taskCounter,
+                future=future,
+                cfClient=self.cfClient,
+                search=searchBody
+            )
+            self._taskRun(task, future)
+        return future
+
+    def __searchTask(
+            self,
+            original: Future,
+            searchBody: CurseForgeSearchBody,
+            stage: str,
+            staleResponse: Optional[schemas.SearchModsResponse] = None
+    ):
+        """
+        :param original: The future returned to the caller
+        :param stage: "stale": read the cache only, "fetch": a normal request after a cache miss,
+            "refresh": revalidate the stale response in the background
+        """
+        taskFuture = Future()
         task = MinecraftModSearchTask(
             _id=self.taskCounter,
-            future=future,
-            cfClient=self.cfClient,
-            search=searchBody
+            future=taskFuture,
+            cfClient=self.cfClient.cachedView() if stage == "stale" else self.cfClient,
+            search=searchBody,
+            staleResponse=staleResponse
         )
-        self._taskRun(task, future)
-        for d in searchBody.__dict__:
-            if d.startswith("_"):
-                continue
-            print(d, getattr(searchBody, d))
-        return future
+        taskFuture.setExtra("original", original)
+        taskFuture.setExtra("stage", stage)
+        taskFuture.setExtra("searchBody", searchBody)
+        self._taskRun(task, taskFuture)
 
     def _taskDone(self, fut: Future):
-        fut.setResult(
-            fut.getExtra("response")
-        )
+        response = fut.getExtra("response")
+        fut.setResult(response)
+        if not fut.hasExtra("original"):  # 未启用 stale-while-revalidate
+            return
+
+        original: Future = fut.getExtra("original")
+        stage = fut.getExtra("stage")
+        if stage == "stale":
+            if isinstance(response, schemas.ApiResponseCode):  # 缓存中没有, 正常请求
+                self.__searchTask(original, fut.getExtra("searchBody"), stage="fetch")
+            else:  # 先返回缓存结果, 已过期才在后台刷新
+                original.setResult(response)
+                if fut.getExtra("expired"):
+                    self.__searchTask(original, fut.getExtra("searchBody"), stage="refresh", staleResponse=response)
+        elif stage == "fetch":
+            original.setResult(response)
+        elif fut.getExtra("changed"):  # 刷新后的结果与缓存不同
+            original.setRefreshed(response)
 
 
 class MinecraftModFileEntriesTask(BaseTask):
@@ -223,21 +278,18 @@ class MinecraftModFileEntriesExecutor(BaseTaskExecutor):
     def _taskDone(self, fut: Future):
         if isinstance(resp := fut.getExtra("response"), schemas.ApiResponseCode):
             resp: schemas.ApiResponseCode
-            print(resp)
             fut.setFailed(Exception(resp.value))
             return
 
         if fut.hasExtra("head"):  # 如果是第二次gathered future
-            rv = fut.getExtra("head")
+            rv = ModFileTable.fromFiles(fut.getExtra("head"))
             for r in fut.getResult():
                 rv.extend(r)
             fut.getExtra("original").setResult(rv)  # 返回总结果
 
         elif fut.hasExtra("original"):  # 如果是第一次future
-            print('1 done')
             resp: schemas.GetModFilesResponse = fut.getExtra("response")
             pages = (resp.pagination.totalCount) // resp.pagination.pageSize + 1
-            print(resp.pagination.totalCount)
 
             if pages > 1:
                 futures = []
@@ -256,9 +308,8 @@ class MinecraftModFileEntriesExecutor(BaseTaskExecutor):
                 fut.setResult(resp.data)  # 第一次future的结果
             else:
                 fut.setResult(resp.data)  # 第一次future的结果
-                fut.getExtra("original").setResult(resp.data)  # 如果只有一页，直接返回结果
+                fut.getExtra("original").setResult(ModFileTable.fromFiles(resp.data))  # 如果只有一页，直接返回结果
 
         elif fut.hasExtra("index"):  # 第二次子future
-            print(fut.getExtra("index"), 'done')
             resp: schemas.GetModFilesResponse = fut.getExtra("response")
             fut.setResult(resp.data)
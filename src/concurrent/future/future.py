@@ -54,6 +54,7 @@ class Future(QObject):
     failed = pyqtSignal(object)  # self
     partialDone = pyqtSignal(object)  # child future
     childrenDone = pyqtSignal(object)  # self
+    refreshed = pyqtSignal(object)  # new result
 
     def __init__(self, semaphore=0):
         super().__init__()
@@ -146,6 +147,18 @@ class Future(QObject):
             raise RuntimeError("Future already done")
         # self.deleteLater()
 
+    def setRefreshed(self, result) -> None:
+        """
+        :param result: The newer result replacing the one already set, e.g. after revalidating a stale cache entry
+        :return: None
+
+        same as setResult, please use in main thread !!!
+        """
+        if not self._done:
+            raise RuntimeError("Future not done yet")
+        self._result = result
+        self.refreshed.emit(result)
+
     def setCallback(self, callback: Callable[[object, ], None]) -> None:
         self._callback = callback
 
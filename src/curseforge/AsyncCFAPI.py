@@ -0,0 +1,252 @@
+"""
+基于 asyncio 的 CurseForgeAPI
+全部请求在事件循环线程内通过 keep-alive 连接池(AsyncHttp, 仅依赖标准库)多路复用, 不占用额外线程,
+同时在途的请求数由 asyncio.Semaphore(maxConcurrency) 限制
+"""
+import asyncio
+import json
+from typing import Union, Optional, List, Dict, Tuple
+
+from ..curseforge import Endpoints as ep
+from ..curseforge.AsyncHttp import AsyncConnectionPool
+from ..curseforge import SchemaClasses as schemas
+from ..curseforge.BatchLoader import AsyncBatchLoader
+from ..curseforge.Metrics import ClientMetrics
+from ..curseforge.RateLimiter import RateLimiter
+from ..curseforge.SingleFlight import AsyncSingleFlight
+
+
+class AsyncCurseForgeAPI(object):
+    def __init__(self, api_key, maxConcurrency: int = 16, timeout: float = 30, proxy: Optional[str] = None,
+                 batchWindow: Optional[float] = None, maxBatchSize: int = 50,
+                 rateLimiter: Optional[RateLimiter] = None, baseUrl: str = "https://api.curseforge.com",
+                 trustResponses: bool = False) -> None:
+        """
+        :param api_key: The CurseForge api key
+        :param maxConcurrency: The maximum number of requests in flight, also the number of kept-alive connections
+        :param timeout: The timeout of a single request, connecting included (in seconds)
+        :param proxy: The http proxy url, e.g. "http://127.0.0.1:7890"
+        :param batchWindow: If set, getMod/getModFile calls made within this window (in seconds, 0 means the same
+            loop iteration) are merged into one getMods/getFiles request
+        :param maxBatchSize: The maximum number of ids in one merged request
+        :param rateLimiter: The limiter throttling requests sent to the api, may be shared with a CurseForgeAPI
+        :param baseUrl: The api root, e.g. a local stand-in server for benchmarks
+        :param trustResponses: Decode responses with Schema.fromApi, which skips the per field coercions,
+            off by default: the validating constructors are as fast once every field is read (see bench_decode)
+        """
+        self.__api_key: str = api_key
+        self.base_url: str = baseUrl
+        self.maxConcurrency = maxConcurrency
+        self.timeout = timeout
+        self.proxy = proxy
+        self.trustResponses = trustResponses
+        self.__headers: Dict[str, str] = {
+            'Content-Type': 'application/json',
+            "Accept": "application/json",
+            "x-api-key": self.__api_key
+        }
+        self.__pool = AsyncConnectionPool(maxConcurrency, timeout, proxy)
+        self.__semaphore = asyncio.Semaphore(maxConcurrency)
+        self.metrics = ClientMetrics()
+        self.rateLimiter = RateLimiter(metrics=self.metrics) if rateLimiter is None else rateLimiter
+        self.singleFlight = AsyncSingleFlight()
+        self.modLoader: Optional[AsyncBatchLoader] = None
+        self.modFileLoader: Optional[AsyncBatchLoader] = None
+        if batchWindow is not None:
+            self.modLoader = AsyncBatchLoader(self._loadMods, batchWindow, maxBatchSize,
+                                              default=schemas.ApiResponseCode.NotFound)
+            self.modFileLoader = AsyncBatchLoader(self._loadModFiles, batchWindow, maxBatchSize,
+                                                  default=schemas.ApiResponseCode.NotFound)
+
+    async def close(self):
+        await self.__pool.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+
+    async def _request(self, endpoint: ep.Endpoint, url: str, body: Optional[schemas.Base] = None):
+        """
+        Send the request described by endpoint and decode the response
+        :param endpoint: The endpoint descriptor
+        :param url: The full url built by endpoint.buildUrl
+        :param body: The request body, only for POST endpoints
+        :return: The decoded response schema, or the ApiResponseCode if the request failed
+
+        concurrent GETs of the same url share one network call and one decoded result
+        """
+        if endpoint.method == "GET":
+            return await self.singleFlight.do(url, lambda: self._send(endpoint, url))
+        return await self._send(endpoint, url, body)
+
+    async def _send(self, endpoint: ep.Endpoint, url: str, body: Optional[schemas.Base] = None):
+        data = body.toJson().encode() if body is not None else None
+        attempt = 0
+        while True:
+            if (delay := self.rateLimiter.reserve(url)) > 0:
+                await asyncio.sleep(delay)
+            async with self.__semaphore:
+                response = await self.__pool.request(endpoint.method, url, self.__headers, data)
+            retry = self.rateLimiter.retryDelay(url, response.status_code, response.headers.get("retry-after"),
+                                                attempt)
+            if retry is None:
+                break
+            await asyncio.sleep(retry)
+            attempt += 1
+
+        status = schemas.ApiResponseCode(response.status_code)
+        if status != schemas.ApiResponseCode.OK:
+            return status
+        data = json.loads(response.content)
+        return endpoint.schema.fromApi(data) if self.trustResponses else endpoint.schema(**data)
+
+    async def _loadMods(self, modIds: List[int]) -> Dict[int, Union[schemas.Mod, schemas.ApiResponseCode]]:
+        if len(modIds) == 1:
+            response = await self._request(ep.GetMod, ep.GetMod.buildUrl(self.base_url, (modIds[0],)))
+            mods = [response.data] if isinstance(response, schemas.GetModResponse) else response
+        else:
+            response = await self._request(ep.GetMods, ep.GetMods.buildUrl(self.base_url),
+                                           schemas.GetModsByIdsListRequestBody(modIds))
+            mods = response.data if isinstance(response, schemas.GetModsResponse) else response
+        if isinstance(mods, schemas.ApiResponseCode):
+            return {modId: mods for modId in modIds}
+        return {mod.id: mod for mod in mods}
+
+    async def _loadModFiles(self, keys: List[Tuple[int, int]]) -> Dict[
+        Tuple[int, int], Union[schemas.File, schemas.ApiResponseCode]]:
+        if len(keys) == 1:
+            response = await self._request(ep.GetModFile, ep.GetModFile.buildUrl(self.base_url, keys[0]))
+            files = [response.data] if isinstance(response, schemas.GetModFileResponse) else response
+        else:
+            response = await self._request(ep.GetFiles, ep.GetFiles.buildUrl(self.base_url),
+                                           schemas.GetModFilesRequestBody([fileId for _, fileId in keys]))
+            files = response.data if isinstance(response, schemas.GetFilesResponse) else response
+        if isinstance(files, schemas.ApiResponseCode):
+            return {key: files for key in keys}
+        return {(file.modId, file.id): file for file in files}
+
+    async def getGames(self, index: Optional[int] = None, pageSize: Optional[
+        int] = None) -> Union[schemas.GetGamesResponse, schemas.ApiResponseCode]:
+        query = (index, pageSize)
+        if not ep.GetGames.checkBounds(query):
+            return schemas.ApiResponseCode.BadRequest
+        return await self._request(ep.GetGames, ep.GetGames.buildUrl(self.base_url, (), query))
+
+    async def getGame(self, gameId: int) -> Union[schemas.GetGameResponse, schemas.ApiResponseCode]:
+        return await self._request(ep.GetGame, ep.GetGame.buildUrl(self.base_url, (gameId,)))
+
+    async def getVersions(self, gameId: int) -> Union[schemas.GetVersionsResponse, schemas.ApiResponseCode]:
+        return await self._request(ep.GetVersions, ep.GetVersions.buildUrl(self.base_url, (gameId,)))
+
+    async def getVersionTypes(self, gameId: int) -> Union[
+        schemas.GetVersionTypesResponse, schemas.ApiResponseCode]:
+        return await self._request(ep.GetVersionTypes, ep.GetVersionTypes.buildUrl(self.base_url, (gameId,)))
+
+    async def getCategories(self, gameId: int, classId: Optional[int] = None, classesOnly: Optional[
+        bool] = None) -> Union[schemas.GetCategoriesResponse, schemas.ApiResponseCode]:
+        return await self._request(
+            ep.GetCategories, ep.GetCategories.buildUrl(self.base_url, (), (gameId, classId, classesOnly))
+        )
+
+    async def searchMods(self, gameId: int, classId: Optional[int] = None, categoryId: Optional[int] = None,
+                         gameVersion: Optional[str] = None, searchFilter: Optional[str] = None,
+                         sortField: Optional[schemas.ModSearchSortField] = None,
+                         sortOrder: Optional[schemas.SortOrder] = None,
+                         modLoaderType: Optional[schemas.ModLoaderType] = None,
+                         gameVersionTypeId: Optional[int] = None, slug: Optional[str] = None,
+                         index: Optional[int] = None, pageSize: Optional[int] = None) -> Union[
+        schemas.SearchModsResponse, schemas.ApiResponseCode]:
+        query = (gameId, classId, categoryId, gameVersion, searchFilter, sortField, sortOrder, modLoaderType,
+                 gameVersionTypeId, slug, index, pageSize)
+        if not ep.SearchMods.checkBounds(query):
+            return schemas.ApiResponseCode.BadRequest
+        return await self._request(ep.SearchMods, ep.SearchMods.buildUrl(self.base_url, (), query))
+
+    async def getMod(self, modId: int) -> Union[schemas.GetModResponse, schemas.ApiResponseCode]:
+        if self.modLoader is not None:
+            mod = await self.modLoader.load(int(modId))
+            return schemas.GetModResponse(mod) if isinstance(mod, schemas.Mod) else mod
+        return await self._request(ep.GetMod, ep.GetMod.buildUrl(self.base_url, (modId,)))
+
+    async def getMods(self, modIds: Union[
+        schemas.GetModsByIdsListRequestBody, List[int]]) -> Union[schemas.GetModsResponse, schemas.ApiResponseCode]:
+        if isinstance(modIds, list):
+            modIds = schemas.GetModsByIdsListRequestBody(modIds)
+        return await self._request(ep.GetMods, ep.GetMods.buildUrl(self.base_url), modIds)
+
+    async def getFeatured_mods(self, body: schemas.GetFeaturedModsRequestBody) -> Union[
+        schemas.GetFeaturedModsResponse, schemas.ApiResponseCode]:
+        return await self._request(ep.GetFeaturedMods, ep.GetFeaturedMods.buildUrl(self.base_url), body)
+
+    async def getModDescription(self, modId: int) -> Union[schemas.StringResponse, schemas.ApiResponseCode]:
+        return await self._request(ep.GetModDescription, ep.GetModDescription.buildUrl(self.base_url, (modId,)))
+
+    async def getModFile(self, modId: int, fileId: int) -> Union[
+        schemas.GetModFileResponse, schemas.ApiResponseCode]:
+        if self.modFileLoader is not None:
+            file = await self.modFileLoader.load((int(modId), int(fileId)))
+            return schemas.GetModFileResponse(file) if isinstance(file, schemas.File) else file
+        return await self._request(ep.GetModFile, ep.GetModFile.buildUrl(self.base_url, (modId, fileId)))
+
+    async def getModFiles(self, modId: int, gameVersion: Optional[int] = None,
+                          modLoaderType: Optional[schemas.ModLoaderType] = None,
+                          gameVersionTypeId: Optional[int] = None, index: Optional[int] = None,
+                          pageSize: Optional[int] = None) -> Union[
+        schemas.GetModFilesResponse, schemas.ApiResponseCode]:
+        query = (gameVersion, modLoaderType, gameVersionTypeId, index, pageSize)
+        if not ep.GetModFiles.checkBounds(query):
+            return schemas.ApiResponseCode.BadRequest
+        return await self._request(ep.GetModFiles, ep.GetModFiles.buildUrl(self.base_url, (modId,), query))
+
+    async def getFiles(self, body: schemas.GetModFilesRequestBody) -> Union[
+        schemas.GetFilesResponse, schemas.ApiResponseCode]:
+        return await self._request(ep.GetFiles, ep.GetFiles.buildUrl(self.base_url), body)
+
+    async def getModFileChangelog(self, modId: int, fileId: int) -> Union[
+        schemas.StringResponse, schemas.ApiResponseCode]:
+        return await self._request(
+            ep.GetModFileChangelog, ep.GetModFileChangelog.buildUrl(self.base_url, (modId, fileId))
+        )
+
+    async def getModFileDownloadUrl(self, modId: int, fileId: int) -> Union[
+        schemas.StringResponse, schemas.ApiResponseCode]:
+        return await self._request(
+            ep.GetModFileDownloadUrl, ep.GetModFileDownloadUrl.buildUrl(self.base_url, (modId, fileId))
+        )
+
+    async def getFingerprintsMatches(self, body: schemas.GetFingerprintMatchesRequestBody) -> Union[
+        schemas.GetFingerprintMatchesResponse, schemas.ApiResponseCode]:
+        return await self._request(ep.GetFingerprintsMatches, ep.GetFingerprintsMatches.buildUrl(self.base_url), body)
+
+    async def getFingerprintsFuzzyMatches(self, body: schemas.GetFuzzyMatchesRequestBody) -> Union[
+        schemas.GetFingerprintsFuzzyMatchesResponse, schemas.ApiResponseCode]:
+        return await self._request(
+            ep.GetFingerprintsFuzzyMatches, ep.GetFingerprintsFuzzyMatches.buildUrl(self.base_url), body
+        )
+
+    async def getMinecraftVersions(self, sortDescending: Optional[
+        bool] = None) -> Union[schemas.ApiResponseOfListOfMinecraftGameVersion, schemas.ApiResponseCode]:
+        return await self._request(
+            ep.GetMinecraftVersions, ep.GetMinecraftVersions.buildUrl(self.base_url, (), (sortDescending,))
+        )
+
+    async def getSpecificMinecraftVersion(self, version: str) -> Union[
+        schemas.ApiResponseOfMinecraftGameVersion, schemas.ApiResponseCode]:
+        return await self._request(
+            ep.GetSpecificMinecraftVersion, ep.GetSpecificMinecraftVersion.buildUrl(self.base_url, (version,))
+        )
+
+    async def getMinecraftModloaders(self, version: Optional[str] = None, includeAll: Optional[
+        bool] = None) -> Union[schemas.ApiResponseOfListOfMinecraftModLoaderIndex, schemas.ApiResponseCode]:
+        return await self._request(
+            ep.GetMinecraftModloaders, ep.GetMinecraftModloaders.buildUrl(self.base_url, (), (version, includeAll))
+        )
+
+    async def getSpecificMinecraftModloader(self, modLoaderName: str) -> Union[
+        schemas.ApiResponseOfMinecraftModLoaderVersion, schemas.ApiResponseCode]:
+        return await self._request(
+            ep.GetSpecificMinecraftModloader,
+            ep.GetSpecificMinecraftModloader.buildUrl(self.base_url, (modLoaderName,))
+        )
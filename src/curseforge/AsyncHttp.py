@@ -0,0 +1,211 @@
+"""
+基于 asyncio streams 的最小 HTTP/1.1 客户端
+按 (scheme, host, port) 复用 keep-alive 连接, 全部请求在事件循环线程内多路复用, 不占用额外线程;
+支持 Content-Length / chunked 响应体, gzip 压缩和 http 代理(https 通过 CONNECT 隧道)
+"""
+import asyncio
+import collections
+import socket
+import ssl
+import zlib
+from typing import Deque, Dict, Optional, Tuple
+from urllib.parse import urlsplit
+
+_Connection = Tuple[asyncio.StreamReader, asyncio.StreamWriter]
+_Origin = Tuple[str, str, int]
+
+
+class HttpError(OSError):
+    """
+    the server sent something that is not a valid HTTP/1.1 response
+    """
+
+
+class AsyncHttpResponse(object):
+    __slots__ = ("status_code", "headers", "content")
+
+    def __init__(self, status: int, headers: Dict[str, str], content: bytes):
+        self.status_code = status
+        self.headers = headers  # lower case names
+        self.content = content
+
+
+class AsyncConnectionPool(object):
+    def __init__(self, maxIdle: int = 16, timeout: float = 30, proxy: Optional[str] = None):
+        """
+        :param maxIdle: The maximum number of idle keep-alive connections kept per origin
+        :param timeout: The timeout of a whole request, connecting included (in seconds)
+        :param proxy: The http proxy url, e.g. "http://127.0.0.1:7890"
+        """
+        self.maxIdle = maxIdle
+        self.timeout = timeout
+        self.proxy = urlsplit(proxy) if proxy else None
+        self._idle: Dict[_Origin, Deque[_Connection]] = collections.defaultdict(collections.deque)
+        self._sslContext: Optional[ssl.SSLContext] = None
+
+    async def request(self, method: str, url: str, headers: Dict[str, str],
+                      body: Optional[bytes] = None) -> AsyncHttpResponse:
+        """
+        :param method: "GET" or "POST"
+        :param url: The absolute url
+        :param headers: Extra request headers, Host, Content-Length and Accept-Encoding are added
+        :param body: The request body
+        :raise OSError: (HttpError included) if the connection failed
+        :raise asyncio.TimeoutError: if no response came within timeout
+        """
+        parts = urlsplit(url)
+        origin = (parts.scheme, parts.hostname, parts.port or (443 if parts.scheme == "https" else 80))
+        target = parts.path + ("?" + parts.query if parts.query else "")
+        if self.proxy is not None and parts.scheme == "http":
+            target = url  # absolute-form through a plain http proxy
+        head = [f"{method} {target or '/'} HTTP/1.1", f"Host: {parts.netloc}", "Accept-Encoding: gzip"]
+        head.extend(f"{key}: {value}" for key, value in headers.items())
+        if body is not None:
+            head.append(f"Content-Length: {len(body)}")
+        message = ("\r\n".join(head) + "\r\n\r\n").encode("latin-1") + (body or b"")
+
+        connection, response, keepAlive = await asyncio.wait_for(self._send(origin, method, message), self.timeout)
+        if keepAlive and len(self._idle[origin]) < self.maxIdle:
+            self._idle[origin].append(connection)
+        else:
+            connection[1].close()
+        return response
+
+    async def _send(self, origin: _Origin, method: str,
+                    message: bytes) -> Tuple[_Connection, AsyncHttpResponse, bool]:
+        connection, reused = self._takeIdle(origin), True
+        if connection is None:
+            connection, reused = await self._connect(origin), False
+        try:
+            return (connection, *await self._exchange(connection, method, message))
+        except (OSError, asyncio.IncompleteReadError):
+            connection[1].close()
+            if not reused:
+                raise
+        except BaseException:  # cancelled or timed out in the middle of a response
+            connection[1].close()
+            raise
+        # the server closed the idle connection in the meantime, try once more on a fresh one
+        connection = await self._connect(origin)
+        try:
+            return (connection, *await self._exchange(connection, method, message))
+        except BaseException:
+            connection[1].close()
+            raise
+
+    def _takeIdle(self, origin: _Origin) -> Optional[_Connection]:
+        idle = self._idle[origin]
+        while idle:
+            reader, writer = idle.pop()
+            if not reader.at_eof() and not writer.is_closing():
+                return reader, writer
+            writer.close()
+        return None
+
+    async def _connect(self, origin: _Origin) -> _Connection:
+        scheme, host, port = origin
+        if scheme != "https":
+            if self.proxy is not None:
+                return await asyncio.open_connection(self.proxy.hostname, self.proxy.port or 80)
+            return await asyncio.open_connection(host, port)
+
+        if self._sslContext is None:
+            self._sslContext = ssl.create_default_context()
+        if self.proxy is None:
+            return await asyncio.open_connection(host, port, ssl=self._sslContext)
+        sock = await self._tunnel(host, port)
+        try:
+            return await asyncio.open_connection(sock=sock, ssl=self._sslContext, server_hostname=host)
+        except BaseException:
+            sock.close()
+            raise
+
+    async def _tunnel(self, host: str, port: int) -> socket.socket:
+        """
+        :return: A socket connected to host:port through the proxy (HTTP CONNECT), TLS is not started yet
+        """
+        loop = asyncio.get_running_loop()
+        address = (await loop.getaddrinfo(self.proxy.hostname, self.proxy.port or 80, type=socket.SOCK_STREAM))[0]
+        sock = socket.socket(address[0], socket.SOCK_STREAM)
+        sock.setblocking(False)
+        try:
+            await loop.sock_connect(sock, address[4])
+            await loop.sock_sendall(sock, f"CONNECT {host}:{port} HTTP/1.1\r\nHost: {host}:{port}\r\n\r\n".encode())
+            head = b""
+            while b"\r\n\r\n" not in head:  # the proxy sends nothing after its head before the tunnel is used
+                if not (data := await loop.sock_recv(sock, 4096)):
+                    raise HttpError(f"proxy closed the connection to {host}:{port}")
+                head += data
+            status = head.split(None, 2)[1]
+            if status != b"200":
+                raise HttpError(f"proxy refused CONNECT {host}:{port} with {status.decode('latin-1')}")
+        except BaseException:
+            sock.close()
+            raise
+        return sock
+
+    async def _exchange(self, connection: _Connection, method: str,
+                        message: bytes) -> Tuple[AsyncHttpResponse, bool]:
+        """
+        :return: (the response, whether the connection can be reused)
+        """
+        reader, writer = connection
+        writer.write(message)
+        await writer.drain()
+        status, version, headers = await self._readHead(reader)
+        while 100 <= status < 200:  # interim responses
+            status, version, headers = await self._readHead(reader)
+
+        keepAlive = headers.get("connection", "").lower() != "close" and version != "HTTP/1.0"
+        if method == "HEAD" or status in (204, 304):
+            content = b""
+        elif "chunked" in headers.get("transfer-encoding", "").lower():
+            content = await self._readChunked(reader)
+        elif "content-length" in headers:
+            content = await reader.readexactly(int(headers["content-length"]))
+        else:  # delimited by the end of the connection
+            content, keepAlive = await reader.read(), False
+        if headers.get("content-encoding", "").lower() == "gzip":
+            content = zlib.decompress(content, 16 + zlib.MAX_WBITS)
+        return AsyncHttpResponse(status, headers, content), keepAlive
+
+    @staticmethod
+    async def _readHead(reader: asyncio.StreamReader) -> Tuple[int, str, Dict[str, str]]:
+        line = await reader.readline()
+        if not line:
+            raise asyncio.IncompleteReadError(b"", None)
+        try:
+            version, status = line.decode("latin-1").split(None, 2)[:2]
+            status = int(status)
+        except ValueError:
+            raise HttpError(f"invalid status line {line!r}") from None
+        headers = {}
+        while (line := await reader.readline()) not in (b"\r\n", b"\n", b""):
+            key, _, value = line.decode("latin-1").partition(":")
+            headers[key.strip().lower()] = value.strip()
+        return status, version, headers
+
+    @staticmethod
+    async def _readChunked(reader: asyncio.StreamReader) -> bytes:
+        chunks = []
+        while True:
+            if not (line := await reader.readline()):
+                raise asyncio.IncompleteReadError(b"", None)
+            if not (size := int(line.split(b";", 1)[0], 16)):
+                break
+            chunks.append(await reader.readexactly(size))
+            await reader.readexactly(2)  # CRLF
+        while (await reader.readline()) not in (b"\r\n", b"\n", b""):  # trailers
+            pass
+        return b"".join(chunks)
+
+    async def close(self):
+        writers = [writer for idle in self._idle.values() for _, writer in idle]
+        self._idle.clear()
+        for writer in writers:
+            writer.close()
+        for writer in writers:
+            try:
+                await writer.wait_closed()
+            except OSError:
+                pass
@@ -0,0 +1,122 @@
+"""
+请求合并(dataloader)
+在一个很短的时间窗口内收集多个单键请求, 合并为一次批量请求, 再把结果分发给各个调用者
+"""
+import asyncio
+import threading
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Optional
+
+
+class _Batch(object):
+    __slots__ = ("keys", "full", "done", "results", "exception")
+
+    def __init__(self):
+        self.keys: List[Hashable] = []
+        self.full = threading.Event()
+        self.done = threading.Event()
+        self.results: Dict[Hashable, Any] = {}
+        self.exception: Optional[BaseException] = None
+
+
+class BatchLoader(object):
+    """
+    线程版本: 第一个进入窗口的线程负责等待窗口结束并发出批量请求, 其余线程等待结果
+    """
+
+    def __init__(self, batchFn: Callable[[List[Hashable]], Dict[Hashable, Any]], window: float = 0.005,
+                 maxBatchSize: int = 50, default: Any = None):
+        """
+        :param batchFn: Load many keys at once, returns {key: value}
+        :param window: How long to collect keys before dispatching (in seconds)
+        :param maxBatchSize: Dispatch immediately once this many distinct keys are collected
+        :param default: The value returned for keys missing from the batch result
+        """
+        self.batchFn = batchFn
+        self.window = window
+        self.maxBatchSize = maxBatchSize
+        self.default = default
+        self._lock = threading.Lock()
+        self._current: Optional[_Batch] = None
+
+    def load(self, key: Hashable) -> Any:
+        """
+        Load a single key, blocks until the batch containing it is done
+        :param key: The key to load
+        :return: The value of the key, or self.default if the batch did not return it
+        """
+        with self._lock:
+            batch = self._current
+            leader = batch is None
+            if leader:
+                batch = self._current = _Batch()
+            if key not in batch.keys:
+                batch.keys.append(key)
+            if len(batch.keys) >= self.maxBatchSize:
+                self._current = None  # close the batch, later keys go to a new one
+                batch.full.set()
+
+        if leader:
+            batch.full.wait(self.window)
+            with self._lock:
+                if self._current is batch:
+                    self._current = None
+            try:
+                batch.results = self.batchFn(batch.keys)
+            except BaseException as e:
+                batch.exception = e
+            batch.done.set()
+        else:
+            batch.done.wait()
+
+        if batch.exception is not None:
+            raise batch.exception
+        return batch.results.get(key, self.default)
+
+
+class AsyncBatchLoader(object):
+    """
+    asyncio 版本: 同一事件循环中一个窗口(window 为 0 时为一个 tick)内的请求合并为一批
+    """
+
+    def __init__(self, batchFn: Callable[[List[Hashable]], Awaitable[Dict[Hashable, Any]]], window: float = 0,
+                 maxBatchSize: int = 50, default: Any = None):
+        self.batchFn = batchFn
+        self.window = window
+        self.maxBatchSize = maxBatchSize
+        self.default = default
+        self._pending: Dict[Hashable, asyncio.Future] = {}
+        self._handle: Optional[asyncio.Handle] = None
+
+    async def load(self, key: Hashable) -> Any:
+        loop = asyncio.get_running_loop()
+        future = self._pending.get(key)
+        if future is None:
+            future = self._pending[key] = loop.create_future()
+            if len(self._pending) >= self.maxBatchSize:
+                self._dispatch()
+            elif self._handle is None:
+                if self.window > 0:
+                    self._handle = loop.call_later(self.window, self._dispatch)
+                else:
+                    self._handle = loop.call_soon(self._dispatch)
+        return await future
+
+    def _dispatch(self):
+        if self._handle is not None:
+            self._handle.cancel()
+            self._handle = None
+        pending, self._pending = self._pending, {}
+        if pending:
+            asyncio.ensure_future(self._run(pending))
+
+    async def _run(self, pending: Dict[Hashable, asyncio.Future]):
+        try:
+            results = await self.batchFn(list(pending))
+        except BaseException as e:
+            for future in pending.values():
+                if not future.done():
+                    future.set_exception(e)
+            return
+        for key, future in pending.items():
+            if not future.done():
+                future.set_result(results.get(key, self.default))
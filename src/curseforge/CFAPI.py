@@ -1,36 +1,226 @@
-import enum
-import sys
-from typing import Union, Optional, List, Dict
-from urllib.parse import quote
+import copy
+import functools
+import hashlib
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Union, Optional, List, Dict, Tuple, Iterator, IO
 
 import requests_cache as rqc
 
+from ..curseforge import CachePolicy
+from ..curseforge import Endpoints as ep
 from ..curseforge import SchemaClasses as schemas
+from ..curseforge.BatchLoader import BatchLoader
+from ..curseforge.DecodedCache import DecodedCache
+from ..curseforge.Metrics import ClientMetrics, Instrumentation
+from ..curseforge.RateLimiter import RateLimiter, RateLimitedAdapter
+from ..curseforge.SingleFlight import SingleFlight
+
+
+class ApiError(Exception):
+    def __init__(self, code: schemas.ApiResponseCode):
+        super().__init__(code)
+        self.code = code
 
 
 class CurseForgeAPI(object):
-    def __init__(self, api_key, csesh=None, **kwargs) -> None:
+    def __init__(self, api_key, csesh=None, batchWindow: Optional[float] = None, maxBatchSize: int = 50,
+                 rateLimiter: Optional[RateLimiter] = None, baseUrl: str = "https://api.curseforge.com",
+                 instrument: bool = False, trustResponses: bool = False, **kwargs) -> None:
+        """
+        :param api_key: The CurseForge api key
+        :param csesh: The (cached) requests session to use
+        :param batchWindow: If set, getMod/getModFile calls made within this window (in seconds) are merged into
+            one getMods/getFiles request
+        :param maxBatchSize: The maximum number of ids in one merged request
+        :param rateLimiter: The limiter throttling requests sent to the api, may be shared between clients,
+            a default one is created if not given
+        :param baseUrl: The api root, e.g. a local stand-in server for benchmarks
+        :param instrument: Whether to record per endpoint counters and latencies from the start,
+            can be switched later with self.instrumentation.enable()/disable()
+        :param trustResponses: Decode responses with Schema.fromApi, which skips the per field coercions,
+            off by default: the validating constructors are as fast once every field is read (see bench_decode)
+        :param kwargs: Extra arguments passed to every GET request
+        """
         self.__api_key: str = api_key
-        self.base_url: str = "https://api.curseforge.com"
+        self.base_url: str = baseUrl
         self.__headers: Dict[str, str] = {
             'Content-Type': 'application/json',
             "Accept": "application/json",
             "x-api-key": self.__api_key
         }
-        self.csesh = rqc.CachedSession("CurseForgeAPY-Cache", backend="sqlite",
-                                       expire_after=300) if csesh is None else csesh
+        self.csesh = rqc.CachedSession("CurseForgeAPY-Cache", backend="sqlite", expire_after=300,
+                                       urls_expire_after=CachePolicy.urlsExpireAfter()) if csesh is None else csesh
         self.kwargs = kwargs
+        self.trustResponses = trustResponses
+        self.metrics = ClientMetrics()
+        self.instrumentation = Instrumentation(instrument)
+        self.rateLimiter = RateLimiter(metrics=self.metrics) if rateLimiter is None else rateLimiter
+        self.mountRateLimiter(self.csesh)
+        self.singleFlight = SingleFlight()
+        self.decodedCache = DecodedCache()
+        self.cachedOnly = False
+        self.lastReadExpired = False  # cached views only, see cachedView
+        self.modLoader: Optional[BatchLoader] = None
+        self.modFileLoader: Optional[BatchLoader] = None
+        if batchWindow is not None:
+            self.modLoader = BatchLoader(self._loadMods, batchWindow, maxBatchSize,
+                                         default=schemas.ApiResponseCode.NotFound)
+            self.modFileLoader = BatchLoader(self._loadModFiles, batchWindow, maxBatchSize,
+                                             default=schemas.ApiResponseCode.NotFound)
+
+    def mountRateLimiter(self, session):
+        """
+        Throttle every request the session sends to the api with this client's limiter,
+        cached responses never reach the adapter and cost no tokens
+        :param session: A requests.Session or requests_cache.CachedSession
+        """
+        session.mount(self.base_url, RateLimitedAdapter(self.rateLimiter))
+
+    def cachedView(self, maxStale: int = 7 * CachePolicy.DAY) -> 'CurseForgeAPI':
+        """
+        A view of this client answering from the cache only, used for stale-while-revalidate reads
+        :param maxStale: How long after expiring a cached response is still returned (in seconds)
+        :return: A client sharing the session and limiter of this one,
+            requests missing from the cache return ApiResponseCode.GatewayTimeout without touching the network,
+            lastReadExpired tells whether the last response it read was past its expiry (use one view per thread)
+        """
+        view = copy.copy(self)
+        view.__headers = dict(self.__headers, **{"Cache-Control": f"max-stale={maxStale}"})
+        view.kwargs = dict(self.kwargs, only_if_cached=True)
+        view.singleFlight = SingleFlight()  # a cache read must never join a network call of the same url
+        view.modLoader = view.modFileLoader = None
+        view.cachedOnly = True
+        return view
+
+    def _request(self, endpoint: ep.Endpoint, url: str, body: Optional[schemas.Base] = None):
+        """
+        Send the request described by endpoint and decode the response
+        :param endpoint: The endpoint descriptor
+        :param url: The full url built by endpoint.buildUrl
+        :param body: The request body, only for POST endpoints
+        :return: The decoded response schema, or the ApiResponseCode if the request failed
+
+        concurrent GETs of the same url share one network call and one decoded result,
+        so the returned schema must be treated as read-only
+        """
+        if endpoint.method == "GET":
+            return self.singleFlight.do(url, lambda: self._send(endpoint, url))
+        return self._send(endpoint, url, body)
+
+    def _send(self, endpoint: ep.Endpoint, url: str, body: Optional[schemas.Base] = None):
+        instrumented = self.instrumentation.enabled
+        if instrumented:
+            start = time.perf_counter()
+        if endpoint.method == "GET":
+            response = self.csesh.get(url, headers=self.__headers, **self.kwargs)
+            if self.cachedOnly:
+                self.lastReadExpired = bool(getattr(response, "is_expired", False))
+        else:
+            response = self.csesh.post(url, headers=self.__headers, data=body.toJson())
+        if instrumented:
+            self._observeResponse(endpoint, response, time.perf_counter() - start)
+        status = schemas.ApiResponseCode(response.status_code)
+
+        if status == schemas.ApiResponseCode.OK:
+            if endpoint.method == "GET":
+                return self._decode(endpoint, url, response)
+            return self._build(endpoint, response)
+        else:
+            return status
+
+    def _build(self, endpoint: ep.Endpoint, response):
+        if not self.instrumentation.enabled:
+            return self._fromJson(endpoint, response.json())
+        start = time.perf_counter()
+        data = response.json()
+        parsed = time.perf_counter()
+        decoded = self._fromJson(endpoint, data)
+        self.instrumentation.observe(endpoint.name, "json", parsed - start)
+        self.instrumentation.observe(endpoint.name, "schema", time.perf_counter() - parsed)
+        return decoded
+
+    def _fromJson(self, endpoint: ep.Endpoint, data: dict):
+        return endpoint.schema.fromApi(data) if self.trustResponses else endpoint.schema(**data)
+
+    def _observeResponse(self, endpoint: ep.Endpoint, response, elapsed: float):
+        """
+        Record where a response came from, how long it took and how many bytes it carried
+        a revalidated (304) response went to the network but its body came from the cache
+        """
+        stats = self.instrumentation
+        name = endpoint.name
+        size = len(response.content)
+        stats.count(name, "requests")
+        if getattr(response, "revalidated", False):
+            stats.count(name, "revalidated")
+            stats.count(name, "bytes.cache", size)
+            stats.observe(name, "network", elapsed)
+        elif getattr(response, "from_cache", False):
+            stats.count(name, "cacheHits")
+            stats.count(name, "bytes.cache", size)
+            stats.observe(name, "cacheLookup", elapsed)
+        else:
+            stats.count(name, "cacheMisses")
+            stats.count(name, "bytes.network", size)
+            stats.observe(name, "network", elapsed)
+        if response.status_code != 200:
+            stats.count(name, f"status.{response.status_code}")
 
-    def __query_builder(self, func, *params):
-        assert type(func) == type(self.getGames), "func must be a function"
+    def dumpInstrumentation(self, fp: IO[str]):
+        """
+        Write the per endpoint instrumentation and the client counters as json
+        :param fp: A text file object
+        """
+        self.instrumentation.dump(fp, counters=self.metrics.snapshot())
 
-        values = {}
-        for i, v in enumerate(params):
-            if v is not None:
-                if isinstance(v, enum.Enum):
-                    v = v.value
-                values[func.__code__.co_varnames[:func.__code__.co_argcount][i + 1]] = v
-        return "?" + "&".join([quote(f"{k}={v}", safe="=") for k, v in values.items()])
+    def _decode(self, endpoint: ep.Endpoint, url: str, response):
+        """
+        Decode a GET response, reusing the object decoded from the same version (same ETag/Last-Modified) if any
+        requests_cache stores the validators and revalidates expired entries with If-None-Match/If-Modified-Since,
+        a 304 comes back as the cached response with revalidated set and its body was not downloaded again,
+        responses without validators are keyed by a digest of their body instead,
+        so a byte-identical body always decodes to the very same object
+        """
+        validator = response.headers.get("ETag") or response.headers.get("Last-Modified")
+        if validator is None:
+            validator = "blake2b:" + hashlib.blake2b(response.content, digest_size=16).hexdigest()
+        if getattr(response, "revalidated", False):
+            self.metrics.add("revalidate.notModified")
+            self.metrics.add("revalidate.bytesSaved", len(response.content))
+        if (decoded := self.decodedCache.get(url, validator)) is not None:
+            self.metrics.add("revalidate.decodeSkipped")
+            if self.instrumentation.enabled:
+                self.instrumentation.count(endpoint.name, "decodeSkipped")
+            return decoded
+        decoded = self._build(endpoint, response)
+        self.decodedCache.put(url, validator, decoded)
+        return decoded
+
+    def _loadMods(self, modIds: List[int]) -> Dict[int, Union[schemas.Mod, schemas.ApiResponseCode]]:
+        if len(modIds) == 1:  # nothing to merge, keep the cacheable GET
+            response = self._request(ep.GetMod, ep.GetMod.buildUrl(self.base_url, (modIds[0],)))
+            mods = [response.data] if isinstance(response, schemas.GetModResponse) else response
+        else:
+            response = self._request(ep.GetMods, ep.GetMods.buildUrl(self.base_url),
+                                     schemas.GetModsByIdsListRequestBody(modIds))
+            mods = response.data if isinstance(response, schemas.GetModsResponse) else response
+        if isinstance(mods, schemas.ApiResponseCode):
+            return {modId: mods for modId in modIds}
+        return {mod.id: mod for mod in mods}
+
+    def _loadModFiles(self, keys: List[Tuple[int, int]]) -> Dict[
+        Tuple[int, int], Union[schemas.File, schemas.ApiResponseCode]]:
+        if len(keys) == 1:
+            response = self._request(ep.GetModFile, ep.GetModFile.buildUrl(self.base_url, keys[0]))
+            files = [response.data] if isinstance(response, schemas.GetModFileResponse) else response
+        else:
+            response = self._request(ep.GetFiles, ep.GetFiles.buildUrl(self.base_url),
+                                     schemas.GetModFilesRequestBody([fileId for _, fileId in keys]))
+            files = response.data if isinstance(response, schemas.GetFilesResponse) else response
+        if isinstance(files, schemas.ApiResponseCode):
+            return {key: files for key in keys}
+        return {(file.modId, file.id): file for file in files}
 
     def getGames(self, index: Optional[int] = None, pageSize: Optional[
         int] = None) -> Union[schemas.GetGamesResponse, schemas.ApiResponseCode]:
@@ -43,34 +233,10 @@ class CurseForgeAPI(object):
         
         returns GetGamesResponse
         """
-        # region init
-        # region bounds checking
-        if index is not None:
-            if not 0 <= index <= 10000:
-                return schemas.ApiResponseCode.BadRequest
-        if pageSize is not None:
-            if not 0 <= pageSize <= 50:
-                return schemas.ApiResponseCode.BadRequest
-        if index is not None and pageSize is not None:
-            if not index + pageSize <= 10000:
-                return schemas.ApiResponseCode.BadRequest
-        # endregion
-        # region this init
-        this = eval(f"self.{sys._getframe().f_code.co_name}")
-        lvars = []
-        for i in this.__code__.co_varnames[:this.__code__.co_argcount][1:]:
-            lvars.append(locals()[i])
-        # endregion
-        url = self.base_url + f"/v1/games{self.__query_builder(this, *lvars)}"
-        # endregion
-
-        response = self.csesh.get(url, headers=self.__headers, **self.kwargs)
-        status = schemas.ApiResponseCode(response.status_code)
-
-        if status == schemas.ApiResponseCode.OK:
-            return schemas.GetGamesResponse(**response.json())
-        else:
-            return status
+        query = (index, pageSize)
+        if not ep.GetGames.checkBounds(query):
+            return schemas.ApiResponseCode.BadRequest
+        return self._request(ep.GetGames, ep.GetGames.buildUrl(self.base_url, (), query))
 
     def getGame(self, gameId: int) -> Union[schemas.GetGameResponse, schemas.ApiResponseCode]:
         """
@@ -80,24 +246,7 @@ class CurseForgeAPI(object):
 
         returns GetGameResponse
         """
-
-        # region init
-        # region this init
-        this = eval(f"self.{sys._getframe().f_code.co_name}")
-        lvars = []
-        for i in this.__code__.co_varnames[:this.__code__.co_argcount][1:]:
-            lvars.append(locals()[i])
-        # endregion
-        url = self.base_url + f"/v1/games/{gameId}"
-        # endregion
-
-        response = self.csesh.get(url, headers=self.__headers, **self.kwargs)
-        status = schemas.ApiResponseCode(response.status_code)
-
-        if status == schemas.ApiResponseCode.OK:
-            return schemas.GetGameResponse(**response.json())
-        else:
-            return status
+        return self._request(ep.GetGame, ep.GetGame.buildUrl(self.base_url, (gameId,)))
 
     def getVersions(self, gameId: int) -> Union[schemas.GetVersionsResponse, schemas.ApiResponseCode]:
         """
@@ -107,18 +256,7 @@ class CurseForgeAPI(object):
 
         returns GetVersionsResponse
         """
-
-        # region init
-        url = self.base_url + f"/v1/games/{gameId}/versions"
-        # endregion
-
-        response = self.csesh.get(url, headers=self.__headers, **self.kwargs)
-        status = schemas.ApiResponseCode(response.status_code)
-
-        if status == schemas.ApiResponseCode.OK:
-            return schemas.GetVersionsResponse(**response.json())
-        else:
-            return status
+        return self._request(ep.GetVersions, ep.GetVersions.buildUrl(self.base_url, (gameId,)))
 
     def getVersionTypes(self, gameId: int) -> Union[schemas.GetVersionTypesResponse, schemas.ApiResponseCode]:
         """
@@ -128,18 +266,7 @@ class CurseForgeAPI(object):
 
         returns GetVersionTypesResponse
         """
-
-        # region init
-        url = self.base_url + f"/v1/games/{gameId}/version-types"
-        # endregion
-
-        response = self.csesh.get(url, headers=self.__headers, **self.kwargs)
-        status = schemas.ApiResponseCode(response.status_code)
-
-        if status == schemas.ApiResponseCode.OK:
-            return schemas.GetVersionTypesResponse(**response.json())
-        else:
-            return status
+        return self._request(ep.GetVersionTypes, ep.GetVersionTypes.buildUrl(self.base_url, (gameId,)))
 
     def getCategories(self, gameId: int, classId: Optional[int] = None, classesOnly: Optional[
         bool] = None) -> Union[schemas.GetCategoriesResponse, schemas.ApiResponseCode]:
@@ -152,24 +279,9 @@ class CurseForgeAPI(object):
 
         returns GetCategoriesResponse
         """
-
-        # region init
-        # region this init
-        this = eval(f"self.{sys._getframe().f_code.co_name}")
-        lvars = []
-        for i in this.__code__.co_varnames[:this.__code__.co_argcount][1:]:
-            lvars.append(locals()[i])
-        # endregion
-        url = self.base_url + f"/v1/categories{self.__query_builder(this, *lvars)}"
-        # endregion
-
-        response = self.csesh.get(url, headers=self.__headers, **self.kwargs)
-        status = schemas.ApiResponseCode(response.status_code)
-
-        if status == schemas.ApiResponseCode.OK:
-            return schemas.GetCategoriesResponse(**response.json())
-        else:
-            return status
+        return self._request(
+            ep.GetCategories, ep.GetCategories.buildUrl(self.base_url, (), (gameId, classId, classesOnly))
+        )
 
     def searchMods(self, gameId: int, classId: Optional[int] = None, categoryId: Optional[int] = None, gameVersion:
     Optional[str] = None, searchFilter: Optional[str] = None, sortField: Optional[schemas.ModSearchSortField] = None,
@@ -200,265 +312,141 @@ class CurseForgeAPI(object):
         returns SearchModsResponse
 
         """
+        query = (gameId, classId, categoryId, gameVersion, searchFilter, sortField, sortOrder, modLoaderType,
+                 gameVersionTypeId, slug, index, pageSize)
+        if not ep.SearchMods.checkBounds(query):
+            return schemas.ApiResponseCode.BadRequest
+        return self._request(ep.SearchMods, ep.SearchMods.buildUrl(self.base_url, (), query))
+
+    def iterSearchMods(self, gameId: int, classId: Optional[int] = None, categoryId: Optional[int] = None,
+                       gameVersion: Optional[str] = None, searchFilter: Optional[str] = None,
+                       sortField: Optional[schemas.ModSearchSortField] = None,
+                       sortOrder: Optional[schemas.SortOrder] = None,
+                       modLoaderType: Optional[schemas.ModLoaderType] = None, gameVersionTypeId: Optional[int] = None,
+                       slug: Optional[str] = None, index: int = 0, pageSize: int = ep.MAX_PAGE_SIZE,
+                       prefetch: bool = True) -> Iterator[schemas.Mod]:
+        """
+        Iterate over the search results mod by mod, the pages are requested lazily
+        takes the same filters as searchMods
 
-        # region init
-        # region bounds checking
-        if index is not None:
-            if not 0 <= index <= 10000:
-                return schemas.ApiResponseCode.BadRequest
-        if pageSize is not None:
-            if not 0 <= pageSize <= 50:
-                return schemas.ApiResponseCode.BadRequest
-        if index is not None and pageSize is not None:
-            if not index + pageSize <= 10000:
-                return schemas.ApiResponseCode.BadRequest
-        # endregion
-        # region this init
-        this = eval(f"self.{sys._getframe().f_code.co_name}")
-        lvars = []
-        for i in this.__code__.co_varnames[:this.__code__.co_argcount][1:]:
-            lvars.append(locals()[i])
-        # endregion
-        url = self.base_url + f"/v1/mods/search{self.__query_builder(this, *lvars)}"
-        # endregion
-
-        response = self.csesh.get(url, headers=self.__headers, **self.kwargs)
-        status = schemas.ApiResponseCode(response.status_code)
+        :param index: The index of the first result
+        :param pageSize: The number of results requested per page
+        :param prefetch: Request page N+1 in the background while page N is being consumed
+        :return: A generator of Mod, it stops at the last result or at the api limit of 10000 results
 
-        if status == schemas.ApiResponseCode.OK:
-            return schemas.SearchModsResponse(**response.json())
-        else:
-            return status
+        :raise ValueError: If pageSize is not within 1..50
+        :raise ApiError: If a page could not be fetched
+        """
+        if not 1 <= pageSize <= ep.MAX_PAGE_SIZE:
+            raise ValueError(f"pageSize must be within 1..{ep.MAX_PAGE_SIZE}, got {pageSize}")
+
+        def fetch(start: int) -> Union[schemas.SearchModsResponse, schemas.ApiResponseCode]:
+            return self.searchMods(gameId, classId, categoryId, gameVersion, searchFilter, sortField, sortOrder,
+                                   modLoaderType, gameVersionTypeId, slug, start,
+                                   min(pageSize, ep.MAX_RESULT_WINDOW - start))  # the last page may be shorter
+
+        if index >= ep.MAX_RESULT_WINDOW:
+            return
+        pool = ThreadPoolExecutor(1, thread_name_prefix="iterSearchMods") if prefetch else None
+        try:
+            pending = functools.partial(fetch, index)
+            while True:
+                response = pending()
+                if isinstance(response, schemas.ApiResponseCode):
+                    raise ApiError(response)
+
+                pagination = response.pagination
+                index += pagination.resultCount
+                last = (
+                        pagination.resultCount < min(pageSize, ep.MAX_RESULT_WINDOW - pagination.index)
+                        or index >= pagination.totalCount
+                        or index >= ep.MAX_RESULT_WINDOW
+                )
+                if not last:
+                    pending = pool.submit(fetch, index).result if pool else functools.partial(fetch, index)
+                yield from response.data
+                if last:
+                    return
+        finally:
+            if pool is not None:
+                pool.shutdown(wait=False, cancel_futures=True)
 
     def getMod(self, modId: int) -> Union[schemas.GetModResponse, schemas.ApiResponseCode]:
-        # region init
-        url = self.base_url + f"/v1/mods/{modId}"
-        # endregion
-
-        response = self.csesh.get(url, headers=self.__headers, **self.kwargs)
-        status = schemas.ApiResponseCode(response.status_code)
-
-        if status == schemas.ApiResponseCode.OK:
-            return schemas.GetModResponse(**response.json())
-        else:
-            return status
+        if self.modLoader is not None:
+            mod = self.modLoader.load(int(modId))
+            return schemas.GetModResponse(mod) if isinstance(mod, schemas.Mod) else mod
+        return self._request(ep.GetMod, ep.GetMod.buildUrl(self.base_url, (modId,)))
 
     def getMods(self, modIds: Union[
         schemas.GetModsByIdsListRequestBody, List[int]]) -> Union[schemas.GetModsResponse, schemas.ApiResponseCode]:
-        # region init
-        url = self.base_url + f"/v1/mods"
-        # endregion
-
         if isinstance(modIds, list):
             modIds = schemas.GetModsByIdsListRequestBody(modIds)
-        response = self.csesh.post(url, headers=self.__headers, data=str(modIds))
-        status = schemas.ApiResponseCode(response.status_code)
-
-        if status == schemas.ApiResponseCode.OK:
-            return schemas.GetModsResponse(**response.json())
-        else:
-            return status
+        return self._request(ep.GetMods, ep.GetMods.buildUrl(self.base_url), modIds)
 
     def getFeatured_mods(self, body: schemas.GetFeaturedModsRequestBody) -> Union[
         schemas.GetFeaturedModsResponse, schemas.ApiResponseCode]:
-        # region init
-        # endregion
-        response = self.csesh.post(self.base_url + '/v1/mods/featured', headers=self.__headers, data=str(body))
-
-        status = schemas.ApiResponseCode(response.status_code)
-
-        if status == schemas.ApiResponseCode.OK:
-            return schemas.GetFeaturedModsResponse(**response.json())
-        else:
-            return status
+        return self._request(ep.GetFeaturedMods, ep.GetFeaturedMods.buildUrl(self.base_url), body)
 
     def getModDescription(self, modId: int) -> Union[schemas.StringResponse, schemas.ApiResponseCode]:
-        # region init
-        url = self.base_url + f"/v1/mods/{modId}/description"
-        # endregion
-
-        response = self.csesh.get(url, headers=self.__headers, **self.kwargs)
-        status = schemas.ApiResponseCode(response.status_code)
-
-        if status == schemas.ApiResponseCode.OK:
-            return schemas.StringResponse(**response.json())
-        else:
-            return status
+        return self._request(ep.GetModDescription, ep.GetModDescription.buildUrl(self.base_url, (modId,)))
 
     def getModFile(self, modId: int, fileId: int) -> Union[schemas.GetModFileResponse, schemas.ApiResponseCode]:
-        # region init
-        url = self.base_url + f"/v1/mods/{modId}/files/{fileId}"
-        # endregion
-
-        response = self.csesh.get(url, headers=self.__headers, **self.kwargs)
-        status = schemas.ApiResponseCode(response.status_code)
-
-        if status == schemas.ApiResponseCode.OK:
-            return schemas.GetModFileResponse(**response.json())
-        else:
-            return status
+        if self.modFileLoader is not None:
+            file = self.modFileLoader.load((int(modId), int(fileId)))
+            return schemas.GetModFileResponse(file) if isinstance(file, schemas.File) else file
+        return self._request(ep.GetModFile, ep.GetModFile.buildUrl(self.base_url, (modId, fileId)))
 
     def getModFiles(self, modId: int, gameVersion: Optional[int] = None, modLoaderType: Optional[
         schemas.ModLoaderType] = None, gameVersionTypeId: Optional[int] = None, index: Optional[int] = None, pageSize:
     Optional[int] = None) -> Union[schemas.GetModFilesResponse, schemas.ApiResponseCode]:
-        # region init
-        # region bounds checking
-        if index is not None:
-            if not 0 <= index <= 10000:
-                return schemas.ApiResponseCode.BadRequest
-        if pageSize is not None:
-            if not 0 <= pageSize <= 50:
-                return schemas.ApiResponseCode.BadRequest
-        if index is not None and pageSize is not None:
-            if not index + pageSize <= 10000:
-                return schemas.ApiResponseCode.BadRequest
-        # endregion
-        # region this init
-        this = eval(f"self.{sys._getframe().f_code.co_name}")
-        lvars = []
-        for i in this.__code__.co_varnames[:this.__code__.co_argcount][1:]:
-            lvars.append(locals()[i])
-        # endregion
-        url = self.base_url + f"/v1/mods/{modId}/files{self.__query_builder(this, *lvars)}"
-        # endregion
-
-        response = self.csesh.get(url, headers=self.__headers, **self.kwargs)
-        status = schemas.ApiResponseCode(response.status_code)
-
-        if status == schemas.ApiResponseCode.OK:
-            return schemas.GetModFilesResponse(**response.json())
-        else:
-            return status
+        query = (gameVersion, modLoaderType, gameVersionTypeId, index, pageSize)
+        if not ep.GetModFiles.checkBounds(query):
+            return schemas.ApiResponseCode.BadRequest
+        return self._request(ep.GetModFiles, ep.GetModFiles.buildUrl(self.base_url, (modId,), query))
 
     def getFiles(self, body: schemas.GetModFilesRequestBody) -> Union[
         schemas.GetFilesResponse, schemas.ApiResponseCode]:
-        # region init
-        # endregion
-        response = self.csesh.post(self.base_url + '/v1/mods/files', headers=self.__headers, data=str(body))
-
-        status = schemas.ApiResponseCode(response.status_code)
-
-        if status == schemas.ApiResponseCode.OK:
-            return schemas.GetFilesResponse(**response.json())
-        else:
-            return status
+        return self._request(ep.GetFiles, ep.GetFiles.buildUrl(self.base_url), body)
 
     def getModFileChangelog(self, modId: int, fileId: int) -> Union[schemas.StringResponse, schemas.ApiResponseCode]:
-        # region init
-        url = self.base_url + f"/v1/mods/{modId}/files/{fileId}/changelog"
-        # endregion
-
-        response = self.csesh.get(url, headers=self.__headers, **self.kwargs)
-        status = schemas.ApiResponseCode(response.status_code)
-
-        if status == schemas.ApiResponseCode.OK:
-            return schemas.StringResponse(**response.json())
-        else:
-            return status
+        return self._request(ep.GetModFileChangelog, ep.GetModFileChangelog.buildUrl(self.base_url, (modId, fileId)))
 
     def getModFileDownloadUrl(self, modId: int, fileId: int) -> Union[schemas.StringResponse, schemas.ApiResponseCode]:
-        # region init
-        url = self.base_url + f"/v1/mods/{modId}/files/{fileId}/download-url"
-        # endregion
-
-        response = self.csesh.get(url, headers=self.__headers, **self.kwargs)
-        status = schemas.ApiResponseCode(response.status_code)
-
-        if status == schemas.ApiResponseCode.OK:
-            return schemas.StringResponse(**response.json())
-        else:
-            return status
+        return self._request(
+            ep.GetModFileDownloadUrl, ep.GetModFileDownloadUrl.buildUrl(self.base_url, (modId, fileId))
+        )
 
     def getFingerprintsMatches(self, body: schemas.GetFingerprintMatchesRequestBody) -> Union[
         schemas.GetFingerprintMatchesResponse, schemas.ApiResponseCode]:
-        # region init
-        # endregion
-        response = self.csesh.post(self.base_url + '/v1/fingerprints/', headers=self.__headers, data=str(body))
-
-        status = schemas.ApiResponseCode(response.status_code)
-
-        if status == schemas.ApiResponseCode.OK:
-            return schemas.GetFingerprintMatchesResponse(**response.json())
-        else:
-            return status
+        return self._request(ep.GetFingerprintsMatches, ep.GetFingerprintsMatches.buildUrl(self.base_url), body)
 
     def getFingerprintsFuzzyMatches(self, body: schemas.GetFuzzyMatchesRequestBody) -> Union[
         schemas.GetFingerprintsFuzzyMatchesResponse, schemas.ApiResponseCode]:
-        # region init
-        # endregion
-        response = self.csesh.post(self.base_url + '/v1/fingerprints/fuzzy', headers=self.__headers, data=str(body))
-
-        status = schemas.ApiResponseCode(response.status_code)
-
-        if status == schemas.ApiResponseCode.OK:
-            return schemas.GetFingerprintsFuzzyMatchesResponse(**response.json())
-        else:
-            return status
+        return self._request(
+            ep.GetFingerprintsFuzzyMatches, ep.GetFingerprintsFuzzyMatches.buildUrl(self.base_url), body
+        )
 
     def getMinecraftVersions(self, sortDescending: Optional[
         bool] = None) -> Union[schemas.ApiResponseOfListOfMinecraftGameVersion, schemas.ApiResponseCode]:
-        # region init
-        # region this init
-        this = eval(f"self.{sys._getframe().f_code.co_name}")
-        lvars = []
-        for i in this.__code__.co_varnames[:this.__code__.co_argcount][1:]:
-            lvars.append(locals()[i])
-        # endregion
-        url = self.base_url + f"/v1/minecraft/version{self.__query_builder(this, *lvars)}"
-        # endregion
-
-        response = self.csesh.get(url, headers=self.__headers, **self.kwargs)
-        status = schemas.ApiResponseCode(response.status_code)
-
-        if status == schemas.ApiResponseCode.OK:
-            return schemas.ApiResponseOfListOfMinecraftGameVersion(**response.json())
-        else:
-            return status
+        return self._request(
+            ep.GetMinecraftVersions, ep.GetMinecraftVersions.buildUrl(self.base_url, (), (sortDescending,))
+        )
 
     def getSpecificMinecraftVersion(self, version: str) -> Union[
         schemas.ApiResponseOfMinecraftGameVersion, schemas.ApiResponseCode]:
-        # region init
-        url = self.base_url + f"/v1/minecraft/version/{version}"
-        # endregion
-
-        response = self.csesh.get(url, headers=self.__headers, **self.kwargs)
-        status = schemas.ApiResponseCode(response.status_code)
-
-        if status == schemas.ApiResponseCode.OK:
-            return schemas.ApiResponseOfMinecraftGameVersion(**response.json())
-        else:
-            return status
+        return self._request(
+            ep.GetSpecificMinecraftVersion, ep.GetSpecificMinecraftVersion.buildUrl(self.base_url, (version,))
+        )
 
     def getMinecraftModloaders(self, version: Optional[str] = None, includeAll: Optional[
         bool] = None) -> Union[schemas.ApiResponseOfListOfMinecraftModLoaderIndex, schemas.ApiResponseCode]:
-        # region init
-        # region this init
-        this = eval(f"self.{sys._getframe().f_code.co_name}")
-        lvars = []
-        for i in this.__code__.co_varnames[:this.__code__.co_argcount][1:]:
-            lvars.append(locals()[i])
-        # endregion
-        url = self.base_url + f"/v1/minecraft/modloader{self.__query_builder(this, *lvars)}"
-        # endregion
-
-        response = self.csesh.get(url, headers=self.__headers, **self.kwargs)
-        status = schemas.ApiResponseCode(response.status_code)
-
-        if status == schemas.ApiResponseCode.OK:
-            return schemas.ApiResponseOfListOfMinecraftModLoaderIndex(**response.json())
-        else:
-            return status
+        return self._request(
+            ep.GetMinecraftModloaders, ep.GetMinecraftModloaders.buildUrl(self.base_url, (), (version, includeAll))
+        )
 
     def getSpecificMinecraftModloader(self, modLoaderName: str) -> Union[
         schemas.ApiResponseOfMinecraftModLoaderVersion, schemas.ApiResponseCode]:
-        # region init
-        url = self.base_url + f"/v1/minecraft/modloader/{modLoaderName}"
-        # endregion
-
-        response = self.csesh.get(url, headers=self.__headers, **self.kwargs)
-        status = schemas.ApiResponseCode(response.status_code)
-
-        if status == schemas.ApiResponseCode.OK:
-            return schemas.ApiResponseOfMinecraftModLoaderVersion(**response.json())
-        else:
-            return status
+        return self._request(
+            ep.GetSpecificMinecraftModloader,
+            ep.GetSpecificMinecraftModloader.buildUrl(self.base_url, (modLoaderName,))
+        )
@@ -0,0 +1,65 @@
+"""
+请求缓存过期策略
+按端点给出缓存时间(秒), 生成 requests_cache 的 urls_expire_after 表:
+几乎不变的数据(游戏, 版本, 分类, 加载器, 按ID查询的文件信息)缓存数天, 搜索结果等易变数据只缓存几分钟
+"""
+import re
+from typing import Dict, Pattern, Tuple
+
+from ..curseforge import Endpoints as ep
+
+MINUTE = 60
+HOUR = 60 * MINUTE
+DAY = 24 * HOUR
+
+# (endpoint, expire after in seconds), the first matching pattern wins,
+# so endpoints whose path could be matched by a shorter template (e.g. /v1/mods/search vs /v1/mods/{}) come first
+# POST endpoints are not cached by requests_cache and are left out
+ENDPOINT_TTL: Tuple[Tuple[ep.Endpoint, int], ...] = (
+    # volatile: results and download counts change all the time
+    (ep.SearchMods, 5 * MINUTE),
+    (ep.GetModFiles, 30 * MINUTE),
+    (ep.GetMod, HOUR),
+    (ep.GetModDescription, DAY),
+    # a published file never changes apart from its download count
+    (ep.GetModFileChangelog, 30 * DAY),
+    (ep.GetModFileDownloadUrl, 7 * DAY),
+    (ep.GetModFile, 7 * DAY),
+    # new game versions and modloaders are appended a few times a month
+    (ep.GetVersions, 3 * DAY),
+    (ep.GetMinecraftVersions, 3 * DAY),
+    (ep.GetMinecraftModloaders, 3 * DAY),
+    # static
+    (ep.GetGames, 7 * DAY),
+    (ep.GetGame, 7 * DAY),
+    (ep.GetVersionTypes, 7 * DAY),
+    (ep.GetCategories, 7 * DAY),
+    (ep.GetSpecificMinecraftVersion, 7 * DAY),
+    (ep.GetSpecificMinecraftModloader, 7 * DAY),
+)
+
+# thumbnails and files on the cdn are addressed by id and never change
+BLOB_EXPIRE_AFTER: Dict[str, int] = {
+    "media.forgecdn.net": 30 * DAY,
+    "edge.forgecdn.net": 30 * DAY,
+}
+
+
+def endpointPattern(endpoint: ep.Endpoint) -> Pattern:
+    """
+    :param endpoint: The endpoint descriptor
+    :return: A regex matching the full urls of the endpoint on any host, with or without a query string
+    """
+    path = "[^/?]+".join(re.escape(part) for part in endpoint.path.split("{}"))
+    return re.compile(rf"^https?://[^/]+{path}(?:\?|$)")
+
+
+def urlsExpireAfter(defaults: Tuple[Tuple[ep.Endpoint, int], ...] = ENDPOINT_TTL,
+                    **overrides: int) -> Dict[Pattern, int]:
+    """
+    Build the urls_expire_after argument of requests_cache.CachedSession
+    :param defaults: ((endpoint, expire after), ...) in matching order
+    :param overrides: {endpoint name: expire after} replacing single entries, e.g. searchMods=60
+    :return: {url regex: expire after in seconds}, urls not matched fall back to the session's expire_after
+    """
+    return {endpointPattern(endpoint): overrides.get(endpoint.name, ttl) for endpoint, ttl in defaults}
@@ -0,0 +1,150 @@
+"""
+全量目录爬取
+searchMods 只能访问前 10000 条结果, 这里按 分类 -> 游戏版本 -> 加载器 -> 排序方向 递归切分搜索空间,
+直到每个分区都在上限之内, 再用有限的线程并发抓取各分区, 并按模组ID去重
+"""
+import itertools
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterator, List
+
+from ..curseforge import Endpoints as ep
+from ..curseforge import SchemaClasses as schemas
+from ..curseforge.CFAPI import ApiError, CurseForgeAPI
+
+_DONE = object()
+
+
+class CatalogueCrawler(object):
+    # the filters a partition is split by, in order
+    DIMENSIONS = ("categoryId", "gameVersion", "modLoaderType")
+
+    def __init__(self, cfClient: CurseForgeAPI, gameId: int = 432, classId: int = schemas.MinecraftClassId.Mod.value,
+                 maxWorkers: int = 8, sortField: schemas.ModSearchSortField = schemas.ModSearchSortField.Name):
+        """
+        :param cfClient: The client used to search
+        :param gameId: The game to enumerate
+        :param classId: The class to enumerate, e.g. mods or modpacks
+        :param maxWorkers: The maximum number of partitions fetched at the same time
+        :param sortField: The field giving a stable order across pages, also used for the last split by sort order
+        """
+        self.cf = cfClient
+        self.gameId = gameId
+        self.classId = classId
+        self.maxWorkers = maxWorkers
+        self.sortField = sortField
+        self.metrics = cfClient.metrics
+
+    def partitionValues(self) -> Dict[str, List[Any]]:
+        """
+        :return: {dimension: the values a partition is split into}
+
+        :raise ApiError: If the categories or versions could not be fetched
+        """
+        categories = self.cf.getCategories(self.gameId, self.classId)
+        versions = self.cf.getMinecraftVersions(True)
+        for response in (categories, versions):
+            if isinstance(response, schemas.ApiResponseCode):
+                raise ApiError(response)
+        return {
+            "categoryId": [c.id for c in categories.data if not c.isClass],
+            "gameVersion": [v.versionString for v in versions.data],
+            "modLoaderType": [t for t in schemas.ModLoaderType if t.value > 0],
+        }
+
+    def crawl(self) -> Iterator[schemas.Mod]:
+        """
+        Enumerate the whole catalogue
+        :return: A generator yielding every mod once, in no particular order
+
+        :raise ApiError: If a search request failed, the crawl is stopped
+        """
+        values = self.partitionValues()
+        results: queue.Queue = queue.Queue()
+        stop = threading.Event()
+        lock = threading.Lock()
+        pending = 0
+        pool = ThreadPoolExecutor(self.maxWorkers, thread_name_prefix="CatalogueCrawler")
+
+        def submit(filters: Dict[str, Any]):
+            nonlocal pending
+            with lock:
+                pending += 1
+            pool.submit(work, filters)
+
+        def work(filters: Dict[str, Any]):
+            nonlocal pending
+            try:
+                if not stop.is_set():
+                    self._crawlPartition(filters, values, submit, results.put, stop)
+            except BaseException as e:
+                results.put(e)
+            finally:
+                with lock:  # children are submitted before the parent finishes, so 0 means everything is done
+                    pending -= 1
+                    if pending == 0:
+                        results.put(_DONE)
+
+        seen = set()
+        submit({})
+        try:
+            while (item := results.get()) is not _DONE:
+                if isinstance(item, BaseException):
+                    raise item
+                if item.id in seen:
+                    self.metrics.add("crawler.duplicates")
+                    continue
+                seen.add(item.id)
+                yield item
+        finally:
+            stop.set()
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    def _search(self, filters: Dict[str, Any], index: int) -> schemas.SearchModsResponse:
+        response = self.cf.searchMods(
+            self.gameId, self.classId, filters.get("categoryId"), filters.get("gameVersion"), None, self.sortField,
+            filters.get("sortOrder", schemas.SortOrder.Ascending), filters.get("modLoaderType"), None, None,
+            index, ep.MAX_PAGE_SIZE
+        )
+        if isinstance(response, schemas.ApiResponseCode):
+            raise ApiError(response)
+        return response
+
+    def _crawlPartition(self, filters: Dict[str, Any], values: Dict[str, List[Any]],
+                        submit: Callable[[Dict[str, Any]], None], emit: Callable[[schemas.Mod], None],
+                        stop: threading.Event):
+        first = self._search(filters, 0)
+        total = first.pagination.totalCount
+        self.metrics.add("crawler.partitions")
+
+        if total > ep.MAX_RESULT_WINDOW and "sortOrder" not in filters:
+            dimension = next((d for d in self.DIMENSIONS if d not in filters), None)
+            if dimension is not None:
+                for value in values[dimension]:
+                    submit(dict(filters, **{dimension: value}))
+                return
+            # every filter is fixed: read the first 10000 from both ends of the sort order
+            if total > 2 * ep.MAX_RESULT_WINDOW:
+                self.metrics.add("crawler.unreachable", total - 2 * ep.MAX_RESULT_WINDOW)
+            submit(dict(filters, sortOrder=schemas.SortOrder.Ascending))
+            submit(dict(filters, sortOrder=schemas.SortOrder.Descending, limit=total - ep.MAX_RESULT_WINDOW))
+            return
+
+        limit = min(filters.get("limit", total), ep.MAX_RESULT_WINDOW)
+        for mod in first.data[:limit]:
+            emit(mod)
+        if len(first.data) >= limit:
+            return
+        mods = self.cf.iterSearchMods(
+            self.gameId, self.classId, filters.get("categoryId"), filters.get("gameVersion"), None, self.sortField,
+            filters.get("sortOrder", schemas.SortOrder.Ascending), filters.get("modLoaderType"),
+            index=len(first.data), prefetch=False  # the partitions already run in parallel
+        )
+        try:
+            for mod in itertools.islice(mods, limit - len(first.data)):
+                if stop.is_set():
+                    return
+                emit(mod)
+        finally:
+            mods.close()
@@ -0,0 +1,45 @@
+"""
+已解码响应的内存缓存
+以 (url, 校验器 ETag/Last-Modified, 没有校验器时为响应体摘要) 为键保存解码后的 Schema 对象,
+重新验证得到 304 或命中同一版本的缓存时直接复用, 不再重复解析 JSON
+"""
+import threading
+from collections import OrderedDict
+from typing import Any, Optional, Tuple
+
+
+class DecodedCache(object):
+    def __init__(self, maxSize: int = 256):
+        """
+        :param maxSize: The maximum number of decoded responses kept, the least recently used ones are dropped first
+        """
+        self.maxSize = maxSize
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, Tuple[str, Any]]" = OrderedDict()
+
+    def get(self, url: str, validator: str) -> Optional[Any]:
+        """
+        :param url: The request url
+        :param validator: The ETag or Last-Modified of the response, or the digest of its body
+        :return: The object decoded from the same version of the response, or None
+        """
+        with self._lock:
+            entry = self._entries.get(url)
+            if entry is None or entry[0] != validator:
+                return None
+            self._entries.move_to_end(url)
+            return entry[1]
+
+    def put(self, url: str, validator: str, decoded: Any):
+        with self._lock:
+            self._entries[url] = (validator, decoded)
+            self._entries.move_to_end(url)
+            while len(self._entries) > self.maxSize:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
@@ -0,0 +1,129 @@
+"""
+CurseForge API 端点描述表
+每个端点只在导入时构建一次(路径模板, 参数名, 分页边界, 响应Schema),
+CurseForgeAPI 调用时只需按位置填入参数即可拼出URL, 不再逐次反射函数帧
+"""
+import enum
+from typing import Tuple, Type
+from urllib.parse import quote
+
+from ..curseforge import SchemaClasses as schemas
+
+MAX_PAGE_SIZE = 50
+MAX_RESULT_WINDOW = 10000
+
+
+class Endpoint(object):
+    __slots__ = ("name", "method", "path", "query", "paginated", "schema", "_prefixes", "_indexPos", "_pageSizePos")
+
+    def __init__(self, name: str, method: str, path: str, schema: Type[schemas.Base],
+                 query: Tuple[str, ...] = (), paginated: bool = False):
+        """
+        :param name: The name of the CurseForgeAPI method using this endpoint
+        :param method: The http method, "GET" or "POST"
+        :param path: The path template, e.g. "/v1/mods/{}/files", filled positionally
+        :param schema: The schema class of the response
+        :param query: The query parameter names, in the order of the method signature
+        :param paginated: Whether the endpoint accepts index/pageSize and needs bounds checking
+        """
+        self.name = name
+        self.method = method
+        self.path = path
+        self.schema = schema
+        self.query = query
+        self.paginated = paginated
+        self._prefixes = tuple(name + "=" for name in query)
+        self._indexPos = query.index("index") if paginated else -1
+        self._pageSizePos = query.index("pageSize") if paginated else -1
+
+    def checkBounds(self, queryArgs: tuple) -> bool:
+        """
+        Check the pagination bounds: 0 <= index, 0 <= pageSize <= 50, index + pageSize <= 10000
+        :param queryArgs: The query values, in the same order as self.query
+        :return: Whether the values are valid
+        """
+        if not self.paginated:
+            return True
+        index = queryArgs[self._indexPos]
+        pageSize = queryArgs[self._pageSizePos]
+        if index is not None and not 0 <= index <= MAX_RESULT_WINDOW:
+            return False
+        if pageSize is not None and not 0 <= pageSize <= MAX_PAGE_SIZE:
+            return False
+        if index is not None and pageSize is not None and not index + pageSize <= MAX_RESULT_WINDOW:
+            return False
+        return True
+
+    def buildUrl(self, baseUrl: str, pathArgs: tuple = (), queryArgs: tuple = ()) -> str:
+        """
+        :param baseUrl: The api base url
+        :param pathArgs: The values of the path template placeholders
+        :param queryArgs: The query values, in the same order as self.query, None values are skipped
+        :return: The full url
+        """
+        url = baseUrl + (self.path.format(*pathArgs) if pathArgs else self.path)
+        if not queryArgs:
+            return url
+        pairs = []
+        for prefix, value in zip(self._prefixes, queryArgs):
+            if value is None:
+                continue
+            if isinstance(value, enum.Enum):
+                value = value.value
+            if type(value) is int or type(value) is bool:  # nothing to quote
+                pairs.append(prefix + str(value))
+            else:
+                pairs.append(prefix + quote(str(value), safe="="))
+        return url + "?" + "&".join(pairs) if pairs else url + "?"
+
+    def __repr__(self):
+        return f"Endpoint({self.method} {self.path})"
+
+
+# region Endpoints
+GetGames = Endpoint("getGames", "GET", "/v1/games", schemas.GetGamesResponse,
+                    query=("index", "pageSize"), paginated=True)
+GetGame = Endpoint("getGame", "GET", "/v1/games/{}", schemas.GetGameResponse)
+GetVersions = Endpoint("getVersions", "GET", "/v1/games/{}/versions", schemas.GetVersionsResponse)
+GetVersionTypes = Endpoint("getVersionTypes", "GET", "/v1/games/{}/version-types", schemas.GetVersionTypesResponse)
+GetCategories = Endpoint("getCategories", "GET", "/v1/categories", schemas.GetCategoriesResponse,
+                         query=("gameId", "classId", "classesOnly"))
+SearchMods = Endpoint("searchMods", "GET", "/v1/mods/search", schemas.SearchModsResponse,
+                      query=("gameId", "classId", "categoryId", "gameVersion", "searchFilter", "sortField",
+                             "sortOrder", "modLoaderType", "gameVersionTypeId", "slug", "index", "pageSize"),
+                      paginated=True)
+GetMod = Endpoint("getMod", "GET", "/v1/mods/{}", schemas.GetModResponse)
+GetMods = Endpoint("getMods", "POST", "/v1/mods", schemas.GetModsResponse)
+GetFeaturedMods = Endpoint("getFeatured_mods", "POST", "/v1/mods/featured", schemas.GetFeaturedModsResponse)
+GetModDescription = Endpoint("getModDescription", "GET", "/v1/mods/{}/description", schemas.StringResponse)
+GetModFile = Endpoint("getModFile", "GET", "/v1/mods/{}/files/{}", schemas.GetModFileResponse)
+GetModFiles = Endpoint("getModFiles", "GET", "/v1/mods/{}/files", schemas.GetModFilesResponse,
+                       query=("gameVersion", "modLoaderType", "gameVersionTypeId", "index", "pageSize"),
+                       paginated=True)
+GetFiles = Endpoint("getFiles", "POST", "/v1/mods/files", schemas.GetFilesResponse)
+GetModFileChangelog = Endpoint("getModFileChangelog", "GET", "/v1/mods/{}/files/{}/changelog",
+                               schemas.StringResponse)
+GetModFileDownloadUrl = Endpoint("getModFileDownloadUrl", "GET", "/v1/mods/{}/files/{}/download-url",
+                                 schemas.StringResponse)
+GetFingerprintsMatches = Endpoint("getFingerprintsMatches", "POST", "/v1/fingerprints/",
+                                  schemas.GetFingerprintMatchesResponse)
+GetFingerprintsFuzzyMatches = Endpoint("getFingerprintsFuzzyMatches", "POST", "/v1/fingerprints/fuzzy",
+                                       schemas.GetFingerprintsFuzzyMatchesResponse)
+GetMinecraftVersions = Endpoint("getMinecraftVersions", "GET", "/v1/minecraft/version",
+                                schemas.ApiResponseOfListOfMinecraftGameVersion, query=("sortDescending",))
+GetSpecificMinecraftVersion = Endpoint("getSpecificMinecraftVersion", "GET", "/v1/minecraft/version/{}",
+                                       schemas.ApiResponseOfMinecraftGameVersion)
+GetMinecraftModloaders = Endpoint("getMinecraftModloaders", "GET", "/v1/minecraft/modloader",
+                                  schemas.ApiResponseOfListOfMinecraftModLoaderIndex,
+                                  query=("version", "includeAll"))
+GetSpecificMinecraftModloader = Endpoint("getSpecificMinecraftModloader", "GET", "/v1/minecraft/modloader/{}",
+                                         schemas.ApiResponseOfMinecraftModLoaderVersion)
+# endregion
+
+ENDPOINTS: Tuple[Endpoint, ...] = (
+    GetGames, GetGame, GetVersions, GetVersionTypes, GetCategories, SearchMods, GetMod, GetMods, GetFeaturedMods,
+    GetModDescription, GetModFile, GetModFiles, GetFiles, GetModFileChangelog, GetModFileDownloadUrl,
+    GetFingerprintsMatches, GetFingerprintsFuzzyMatches, GetMinecraftVersions, GetSpecificMinecraftVersion,
+    GetMinecraftModloaders, GetSpecificMinecraftModloader,
+)
+
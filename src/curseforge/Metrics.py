@@ -0,0 +1,142 @@
+"""
+CurseForgeAPI 客户端运行指标
+ClientMetrics: 全局计数器; Instrumentation: 按端点的计数和分阶段(网络/缓存查询/json/schema)耗时直方图
+"""
+import bisect
+import json
+import threading
+from typing import Dict, Union, IO
+
+Number = Union[int, float]
+
+LATENCY_BOUNDS = tuple(0.0001 * 2 ** i for i in range(20))  # upper bounds of the buckets, 0.1ms .. 52s
+PHASES = ("network", "cacheLookup", "json", "schema")
+
+
+class ClientMetrics(object):
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters: Dict[str, Number] = {}
+
+    def add(self, name: str, value: Number = 1):
+        """
+        Add value to the counter `name`, the counter is created on first use
+        """
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + value
+
+    def get(self, name: str) -> Number:
+        return self._counters.get(name, 0)
+
+    def snapshot(self) -> Dict[str, Number]:
+        with self._lock:
+            return dict(self._counters)
+
+    def reset(self):
+        with self._lock:
+            self._counters.clear()
+
+
+class LatencyHistogram(object):
+    __slots__ = ("counts", "count", "total", "max")
+
+    def __init__(self):
+        self.counts = [0] * (len(LATENCY_BOUNDS) + 1)  # the last bucket holds everything above the bounds
+        self.count = 0
+        self.total = 0.
+        self.max = 0.
+
+    def add(self, seconds: float):
+        self.counts[bisect.bisect_left(LATENCY_BOUNDS, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def quantile(self, q: float) -> float:
+        """
+        :param q: 0 <= q <= 1
+        :return: The upper bound of the bucket holding the q quantile (the maximum for the last bucket)
+        """
+        if self.count == 0:
+            return 0.
+        rank = q * self.count
+        seen = 0
+        for i, n in enumerate(self.counts[:-1]):
+            seen += n
+            if seen >= rank and seen:
+                return min(LATENCY_BOUNDS[i], self.max)
+        return self.max
+
+    def snapshot(self) -> Dict[str, Number]:
+        return {
+            "count": self.count,
+            "total": self.total,
+            "mean": self.total / self.count if self.count else 0.,
+            "p50": self.quantile(.5),
+            "p90": self.quantile(.9),
+            "p99": self.quantile(.99),
+            "max": self.max,
+        }
+
+
+class Instrumentation(object):
+    def __init__(self, enabled: bool = False):
+        """
+        :param enabled: Whether the client records anything, when disabled the only cost is one attribute check
+            per request
+        """
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._counters: Dict[str, Dict[str, Number]] = {}
+        self._latency: Dict[str, Dict[str, LatencyHistogram]] = {}
+
+    def enable(self):
+        self.enabled = True
+
+    def disable(self):
+        self.enabled = False
+
+    def count(self, endpoint: str, name: str, value: Number = 1):
+        """
+        Add value to the counter `name` of endpoint
+        """
+        with self._lock:
+            counters = self._counters.setdefault(endpoint, {})
+            counters[name] = counters.get(name, 0) + value
+
+    def observe(self, endpoint: str, phase: str, seconds: float):
+        """
+        Record the time spent in one phase (see PHASES) of a request to endpoint
+        """
+        with self._lock:
+            phases = self._latency.setdefault(endpoint, {})
+            if (histogram := phases.get(phase)) is None:
+                histogram = phases[phase] = LatencyHistogram()
+            histogram.add(seconds)
+
+    def snapshot(self) -> Dict[str, Dict[str, Dict]]:
+        """
+        :return: {endpoint: {"counters": {name: value}, "latency": {phase: {count, total, mean, p50, p90, p99, max}}}}
+        """
+        with self._lock:
+            return {
+                endpoint: {
+                    "counters": dict(self._counters.get(endpoint, {})),
+                    "latency": {phase: h.snapshot() for phase, h in self._latency.get(endpoint, {}).items()},
+                }
+                for endpoint in sorted(self._counters.keys() | self._latency.keys())
+            }
+
+    def dump(self, fp: IO[str], **extra):
+        """
+        Write the snapshot as json
+        :param fp: A text file object
+        :param extra: Other top level entries of the document, e.g. the client counters
+        """
+        json.dump(dict(extra, endpoints=self.snapshot()), fp, indent=2)
+
+    def reset(self):
+        with self._lock:
+            self._counters.clear()
+            self._latency.clear()
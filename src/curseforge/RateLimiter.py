@@ -0,0 +1,175 @@
+"""
+客户端限流
+按端点类别划分令牌桶预算, 遇到 429/503 时遵循 Retry-After, 否则按指数退避加随机抖动重试
+"""
+import random
+import re
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional, Tuple
+from urllib.parse import urlsplit
+
+from requests.adapters import HTTPAdapter
+
+from ..curseforge.Metrics import ClientMetrics
+
+# class name -> (tokens per second, burst)
+DEFAULT_BUDGETS: Dict[str, Tuple[float, int]] = {
+    "search": (4, 8),
+    "files": (8, 16),
+    "default": (16, 32),
+}
+
+# (path pattern, class name), the first match wins
+DEFAULT_CLASSES: Tuple[Tuple[str, str], ...] = (
+    (r"^/v1/mods/search", "search"),
+    (r"^/v1/mods/(\d+/)?files", "files"),
+    (r"^/v1/fingerprints", "files"),
+)
+
+RETRY_STATUS = frozenset({429, 502, 503, 504})
+
+
+class TokenBucket(object):
+    def __init__(self, rate: float, capacity: int):
+        """
+        :param rate: Tokens added per second
+        :param capacity: The maximum number of stored tokens (burst size)
+        """
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._last = time.monotonic()
+        self._blockedUntil = 0.0
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        """
+        Take one token, possibly borrowing from the future
+        :return: How long the caller has to wait before sending (in seconds)
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._last) * self.rate)
+            self._last = now
+            self._tokens -= 1
+            delay = -self._tokens / self.rate if self._tokens < 0 else 0.0
+            return max(delay, self._blockedUntil - now)
+
+    def block(self, seconds: float):
+        """
+        Stop handing out tokens for the given time, e.g. after the server answered with Retry-After
+        """
+        with self._lock:
+            self._blockedUntil = max(self._blockedUntil, time.monotonic() + seconds)
+
+
+class RateLimiter(object):
+    def __init__(self, budgets: Optional[Dict[str, Tuple[float, int]]] = None,
+                 classes: Tuple[Tuple[str, str], ...] = DEFAULT_CLASSES, maxRetries: int = 4,
+                 backoffBase: float = 0.5, backoffMax: float = 30, metrics: Optional[ClientMetrics] = None):
+        """
+        :param budgets: {class name: (tokens per second, burst)}, must contain "default"
+        :param classes: ((path regex, class name), ...) used to classify request paths
+        :param maxRetries: How many times a throttled request is retried
+        :param backoffBase: The first backoff step (in seconds), doubled on every retry
+        :param backoffMax: The upper bound of a single backoff or Retry-After wait (in seconds)
+        :param metrics: Where to record waits and retries
+        """
+        budgets = DEFAULT_BUDGETS if budgets is None else budgets
+        self.buckets: Dict[str, TokenBucket] = {
+            name: TokenBucket(rate, capacity) for name, (rate, capacity) in budgets.items()
+        }
+        self.classes = tuple((re.compile(pattern), name) for pattern, name in classes)
+        self.maxRetries = maxRetries
+        self.backoffBase = backoffBase
+        self.backoffMax = backoffMax
+        self.metrics = ClientMetrics() if metrics is None else metrics
+
+    def classify(self, url: str) -> str:
+        path = urlsplit(url).path
+        for pattern, name in self.classes:
+            if pattern.match(path) and name in self.buckets:
+                return name
+        return "default"
+
+    def reserve(self, url: str) -> float:
+        """
+        Reserve a token for the request
+        :param url: The request url
+        :return: How long to wait before sending (in seconds)
+        """
+        delay = self.buckets[self.classify(url)].reserve()
+        if delay > 0:
+            self.metrics.add("limiter.waits")
+            self.metrics.add("limiter.waitSeconds", delay)
+        return delay
+
+    def retryDelay(self, url: str, status: int, retryAfter: Optional[str], attempt: int) -> Optional[float]:
+        """
+        Decide whether a response should be retried
+        :param url: The request url
+        :param status: The response status code
+        :param retryAfter: The Retry-After header of the response
+        :param attempt: How many retries were already made
+        :return: How long to wait before retrying (in seconds), or None if the response should be returned
+        """
+        if status not in RETRY_STATUS:
+            return None
+        self.metrics.add(f"limiter.status.{status}")
+        if attempt >= self.maxRetries:
+            self.metrics.add("limiter.gaveUp")
+            return None
+
+        delay = self.parseRetryAfter(retryAfter)
+        if delay is not None:
+            delay = min(delay, self.backoffMax)
+            self.buckets[self.classify(url)].block(delay)  # hold back the other requests of this class too
+        else:
+            delay = random.uniform(0, min(self.backoffMax, self.backoffBase * 2 ** attempt))  # full jitter
+        self.metrics.add("limiter.retries")
+        self.metrics.add("limiter.waitSeconds", delay)
+        return delay
+
+    @staticmethod
+    def parseRetryAfter(value: Optional[str]) -> Optional[float]:
+        """
+        :param value: Retry-After header, either delay-seconds or an HTTP-date
+        :return: The delay in seconds, or None if the value is absent or invalid
+        """
+        if not value:
+            return None
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+        try:
+            return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+        except (TypeError, ValueError):
+            return None
+
+
+class RateLimitedAdapter(HTTPAdapter):
+    """
+    挂载到 requests/requests_cache 会话上的传输适配器
+    只有真正发往网络的请求才会经过这里, 缓存命中不消耗令牌
+    """
+
+    def __init__(self, limiter: RateLimiter, **kwargs):
+        super().__init__(**kwargs)
+        self.limiter = limiter
+
+    def send(self, request, **kwargs):
+        attempt = 0
+        while True:
+            if (delay := self.limiter.reserve(request.url)) > 0:
+                time.sleep(delay)
+            response = super().send(request, **kwargs)
+            retry = self.limiter.retryDelay(request.url, response.status_code, response.headers.get("Retry-After"),
+                                            attempt)
+            if retry is None:
+                return response
+            response.close()
+            time.sleep(retry)
+            attempt += 1
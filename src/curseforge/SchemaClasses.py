@@ -1,33 +1,46 @@
 from __future__ import annotations
 
 import enum
-from datetime import datetime
-from typing import List
+import functools
+import inspect
+import json
+import re
+import sys
+import threading
+import weakref
+from datetime import datetime, timedelta
+from typing import List, Tuple, Dict, Any, Callable
 
 import jsonpickle
+import jsonpickle.handlers
 
 
-def create_datetime(date_string: str) -> datetime:
-    # Find the index of "T"
-    t_index = date_string.index("T")
-
-    # Slice the string into its date and time parts
-    date_part = date_string[:t_index]
-    time_part = date_string[t_index + 1:]
-
-    # Split the date and time parts into their individual components
-    year, month, day = date_part.split("-")
-    hour, minute, second = time_part.split(":")
-    second = second[0:2]
-
-    # Parse the microseconds part if it is present
-    if "." in time_part:
-        dot_index = time_part.index(".")
-        microseconds_part = time_part[dot_index + 1:-1]
-        date = datetime(int(year), int(month), int(day), int(hour), int(minute), int(second), int(microseconds_part))
-    else:
-        date = datetime(int(year), int(month), int(day), int(hour), int(minute), int(second))
+_ISO_DATETIME = re.compile(
+    r"(\d{4})-(\d\d)-(\d\d)[T ](\d\d):(\d\d)(?::(\d\d)(?:[.,](\d+))?)?(Z|[+-]\d\d(?::?\d\d)?)?"
+)
+
 
+@functools.lru_cache(maxsize=4096)  # the same timestamps come back on every page (categories, game versions)
+def create_datetime(date_string: str) -> datetime:
+    """
+    Parse an api timestamp, e.g. "2023-06-01T12:34:56.47Z"
+    :return: A naive datetime in UTC, fractional seconds of any width are truncated to microseconds
+    """
+    if date_string[-1:] == "Z":
+        try:
+            return datetime.fromisoformat(date_string[:-1])  # C parser, any fraction width on 3.11+
+        except ValueError:
+            pass  # older pythons only take 3 or 6 fraction digits
+    match = _ISO_DATETIME.fullmatch(date_string)
+    if match is None:
+        raise ValueError(f"Invalid isoformat string: {date_string!r}")
+    year, month, day, hour, minute, second, fraction, offset = match.groups()
+    date = datetime(int(year), int(month), int(day), int(hour), int(minute), int(second or 0),
+                    int(fraction[:6].ljust(6, "0")) if fraction else 0)
+    if offset and offset != "Z":
+        offset = offset.replace(":", "")
+        delta = timedelta(hours=int(offset[1:3]), minutes=int(offset[3:5] or 0))
+        date = date - delta if offset[0] == "+" else date + delta
     return date
 
 
@@ -35,8 +48,277 @@ def create_datetime(date_string: str) -> datetime:
 
 # Base Class
 class Base(object):
+    """
+    Schema objects are built by the thousand for a single page, so every schema declares __slots__
+    (the attributes its __init__ sets) instead of carrying a per-instance __dict__
+    """
+    __slots__ = ()
+    _fields: Tuple[str, ...] = ()  # all slots, in declaration order, filled in by __init_subclass__
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        # the hidden "_name" slot of a LazyField is exposed under the field name
+        cls._fields = cls.__base__._fields + tuple(
+            name[1:] if isinstance(cls.__dict__.get(name[1:]), LazyField) else name
+            for name in cls.__dict__.get("__slots__", ()) if not name.startswith("__")
+        )
+
+    def _asDict(self) -> Dict[str, Any]:
+        return {name: getattr(self, name) for name in self._fields}
+
+    @classmethod
+    def fromApi(cls, raw: Dict[str, Any]):
+        """
+        Trusted decoding of a json object returned by the api: the values already have the right types,
+        so they are stored as they are instead of going through the coercions of __init__.
+        Enums and nested schemas are still built, unknown fields are ignored (Mod keeps them in extra).
+        Use cls(**raw) for anything that did not come straight from response.json()
+        :raise KeyError: If a required field is missing
+        """
+        if (table := cls.__dict__.get("_apiFields")) is None:
+            table = cls._apiFields = _apiTable(cls)  # built once per class
+        fields, fillers, extra, known = table
+        self = object.__new__(cls)
+        for slot, key, default, decode in fields:
+            value = raw[key] if default is _REQUIRED else raw.get(key, default)
+            setattr(self, slot, value if decode is None else decode(value))
+        for slot, fill in fillers:
+            setattr(self, slot, fill())
+        if extra is not None:
+            setattr(self, extra, {key: raw[key] for key in raw.keys() - known})
+        return self
+
+    def toJson(self) -> str:
+        """
+        :return: Plain compact json of the fields (no jsonpickle tags), the wire format of request bodies
+        """
+        return _JSON_ENCODER.encode(self)
+
     def __str__(self):
-        return jsonpickle.dumps(self.__dict__)
+        # interned sub-objects appear many times, write them out in full instead of as back references
+        return jsonpickle.dumps(self._asDict(), make_refs=False)
+
+
+@jsonpickle.handlers.register(Base, base=True)
+class _BaseHandler(jsonpickle.handlers.BaseHandler):
+    """
+    nested schemas are flattened field by field too, jsonpickle would otherwise walk the raw slots
+    """
+
+    def flatten(self, obj: Base, data: dict) -> dict:
+        for name, value in obj._asDict().items():
+            data[name] = self.context.flatten(value, reset=False)
+        return data
+
+
+def _jsonDefault(value):
+    if isinstance(value, Base):
+        return value._asDict()
+    if isinstance(value, enum.Enum):
+        return value.value
+    if isinstance(value, datetime):
+        return value.isoformat() + "Z"  # naive datetimes are UTC, see create_datetime
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+_JSON_ENCODER = json.JSONEncoder(default=_jsonDefault, separators=(",", ":"))
+
+
+class Raw(object):
+    """
+    The undecoded json value of a LazyField
+    """
+    __slots__ = ("value",)
+
+    def __init__(self, value):
+        self.value = value
+
+
+class TrustedRaw(Raw):
+    """
+    The undecoded json value of a LazyField stored by fromApi, decoded with the trusted decoder
+    """
+    __slots__ = ()
+
+
+class LazyField(object):
+    """
+    A nested field kept in the hidden slot "_<name>". Values assigned to it (by __init__ too) are decoded at once,
+    unless LazyField.enabled is set: then Raw(value) is stored and the first read decodes it and keeps the result.
+    Lazy decoding only pays off when most fields of a response are never read, which is not the case for the
+    plugin's pages (see bench_decode), so it is off by default.
+    Decoders must accept already decoded values, so the schemas can still be built from objects
+    """
+    __slots__ = ("decode", "trusted", "slot")
+    enabled = False
+
+    def __init__(self, decode: Callable[[Any], Any], trusted: Callable[[Any], Any] | None = None):
+        """
+        :param decode: Decoder of the values given to __init__
+        :param trusted: Decoder of the values stored by fromApi, derived from the annotation if not given
+        """
+        self.decode = decode
+        self.trusted = trusted
+        self.slot = None
+
+    def __set_name__(self, owner, name):
+        self.slot = owner.__dict__["_" + name]
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+        value = self.slot.__get__(instance, owner)
+        cls = type(value)
+        if cls is Raw or cls is TrustedRaw:
+            # racing readers decode twice at worst, both results are equal
+            value = (self.decode if cls is Raw else self.trusted)(value.value)
+            self.slot.__set__(instance, value)
+        return value
+
+    def __set__(self, instance, value):
+        self.slot.__set__(instance, Raw(value) if LazyField.enabled else self.decode(value))
+
+    def fromApi(self, value):
+        """
+        :return: What fromApi stores in the hidden slot
+        """
+        return TrustedRaw(value) if LazyField.enabled else self.trusted(value)
+
+
+def decodeDate(value) -> datetime:
+    return create_datetime(value) if isinstance(value, str) else value
+
+
+def _modLoaderType(value) -> ModLoaderType:
+    # FileIndex.modLoader and MinecraftModLoaderIndex.type may be missing
+    return ModLoaderType(value) if value is not None else ModLoaderType.NoneFound
+
+
+_REQUIRED = object()  # fromApi field table: the key has no default
+
+
+def _apiDecoder(annotation) -> Callable[[Any], Any] | None:
+    """
+    :param annotation: The (string) annotation of an __init__ parameter, e.g. "List[File]" or "ModLoaderType | None"
+    :return: The decoder of the json value: enums and schemas are built,
+        None for everything else (int, str, bool, object, datetime (lazy) and lists of them), kept as is
+    """
+    if not isinstance(annotation, str):
+        return None
+    optional = annotation.endswith(" | None")
+    name = annotation[:-len(" | None")] if optional else annotation
+    many = name.startswith("List[")
+    if many:
+        name = name[len("List["):-1]
+    cls = globals().get(name)
+    if not (isinstance(cls, type) and issubclass(cls, (Base, enum.Enum))):
+        return None
+    build = cls.fromApi if issubclass(cls, Base) else cls
+    if many:
+        return lambda v: [build(i) for i in v]
+    if optional:
+        return lambda v: None if v is None else build(v)
+    return build
+
+
+def _apiTable(cls: type) -> Tuple[tuple, tuple, str | None, frozenset]:
+    """
+    Build the fromApi field table of a schema class from its __init__ signature
+    cls._apiDecoders overrides the decoding of a parameter (interned or defaulted fields),
+    slots that are not parameters are filled by calling their _apiDecoders entry without arguments,
+    the **parameter (Mod.extra) receives the unknown fields
+    :return: ((slot, json key, default or _REQUIRED, decoder or None), ...), ((slot, filler), ...),
+        the slot collecting the unknown keys or None, the known keys
+    """
+    overrides: Dict[str, Callable] = cls.__dict__.get("_apiDecoders", {})
+    fields, fillers, filled, known, extra = [], [], set(), set(), None
+    for param in list(inspect.signature(cls.__init__).parameters.values())[1:]:
+        name = param.name
+        if param.kind is param.VAR_KEYWORD:
+            extra = name
+            continue
+        known.add(name)
+        default = _REQUIRED if param.default is param.empty else param.default
+        if isinstance(lazy := cls.__dict__.get(name), LazyField):
+            if lazy.trusted is None:
+                lazy.trusted = _apiDecoder(param.annotation) or lazy.decode
+            fields.append(("_" + name, name, default, lazy.fromApi))
+            filled.add("_" + name)
+            continue
+        fields.append((name, name, default, overrides[name] if name in overrides else _apiDecoder(param.annotation)))
+        filled.add(name)
+
+    for slot in cls.__dict__.get("__slots__", ()):
+        if slot in filled or slot.startswith("__") or slot == extra:
+            continue
+        if slot not in overrides:
+            raise TypeError(f"{cls.__name__}.{slot} is not an __init__ parameter and has no _apiDecoders entry")
+        fillers.append((slot, overrides[slot]))
+    if extra not in cls.__dict__.get("__slots__", ()):
+        extra = None
+    return tuple(fields), tuple(fillers), extra, frozenset(known)
+
+
+class Interner(object):
+    """
+    Flyweight registry: equal sub-objects (same raw json) decoded from different responses share one instance
+    for as long as any response still holds it, so paging through results does not pile up copies of the same
+    categories, authors and game versions.
+    Interned objects are shared, treat them as read-only.
+    The schema class needs a "__weakref__" slot
+    """
+
+    def __init__(self):
+        self.enabled = True
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._pools: Dict[type, weakref.WeakValueDictionary] = {}
+
+    def schema(self, cls: type, raw, trusted: bool = False):
+        """
+        :param cls: The schema class
+        :param raw: The json object, anything else is returned as is (already decoded)
+        :param trusted: Build new instances with cls.fromApi instead of cls(**raw)
+        :return: The shared instance equal to cls(**raw)
+        """
+        if not isinstance(raw, dict):
+            return raw
+        build = cls.fromApi if trusted else lambda r: cls(**r)
+        if not self.enabled:
+            return build(raw)
+        if (pool := self._pools.get(cls)) is None:
+            pool = self._pools.setdefault(cls, weakref.WeakValueDictionary())
+        key = tuple(raw.items())
+        try:
+            with self._lock:
+                obj = pool.get(key)
+        except TypeError:  # an unhashable (nested) value, nothing to share
+            return build(raw)
+        if obj is not None:
+            self.hits += 1
+            return obj
+        self.misses += 1
+        obj = build(raw)
+        with self._lock:
+            return pool.setdefault(key, obj)
+
+    def string(self, value: str) -> str:
+        """
+        :return: The shared copy of a repeated string such as a game version name
+        """
+        return sys.intern(str(value)) if self.enabled else str(value)
+
+    def __len__(self):
+        return sum(len(pool) for pool in self._pools.values())
+
+    def clear(self):
+        with self._lock:
+            self._pools.clear()
+            self.hits = self.misses = 0
+
+
+INTERNER = Interner()
 
 
 # ApiResponseOfListOfMinecraftGameVersion Schema
@@ -49,6 +331,8 @@ data 	[MinecraftGameVersion] 	The response data
 
 # ApiResponseOfListOfMinecraftGameVersion Class
 class ApiResponseOfListOfMinecraftGameVersion(Base):
+    __slots__ = ("data",)
+
     def __init__(self, data: List[MinecraftGameVersion]):
         self.data: List[MinecraftGameVersion] = list(
             map(lambda x: MinecraftGameVersion(**x) if isinstance(x, dict) else x, data))
@@ -64,6 +348,8 @@ data 	[MinecraftModLoaderIndex] 	The response data
 
 # ApiResponseOfListOfMinecraftModLoaderIndex Class
 class ApiResponseOfListOfMinecraftModLoaderIndex(Base):
+    __slots__ = ("data",)
+
     def __init__(self, data: List[MinecraftModLoaderIndex]):
         self.data: List[MinecraftModLoaderIndex] = list(
             map(lambda x: MinecraftModLoaderIndex(**x) if isinstance(x, dict) else x, data))
@@ -79,6 +365,8 @@ data 	MinecraftGameVersion 	The response data
 
 # ApiResponseOfMinecraftGameVersion Class
 class ApiResponseOfMinecraftGameVersion(Base):
+    __slots__ = ("data",)
+
     def __init__(self, data: MinecraftGameVersion):
         self.data: MinecraftGameVersion = MinecraftGameVersion(**data) if isinstance(data, dict) else data
 
@@ -93,6 +381,8 @@ data 	MinecraftModLoaderVersion 	The response data
 
 # ApiResponseOfMinecraftModLoaderVersion Class
 class ApiResponseOfMinecraftModLoaderVersion(Base):
+    __slots__ = ("data",)
+
     def __init__(self, data: MinecraftModLoaderVersion):
         self.data: MinecraftModLoaderVersion = MinecraftModLoaderVersion(**data) if isinstance(data, dict) else data
 
@@ -116,6 +406,13 @@ displayIndex 	integer(int32)¦null 	The display index for this category
 
 # Category Class
 class Category(Base):
+    __slots__ = (
+        "id", "gameId", "name", "slug", "url", "iconUrl", "_dateModified", "isClass", "classId", "parentCategoryId",
+        "displayIndex", "children", "__weakref__"
+    )
+    dateModified = LazyField(decodeDate)
+    _apiDecoders = {"children": list}
+
     def __init__(self, id, gameId: int, name: str, slug: str, url: str, iconUrl: str, dateModified: datetime,
                  isClass: bool | None = None, classId: int | None = None, parentCategoryId: int | None = None,
                  displayIndex: int | None = None):
@@ -125,7 +422,7 @@ class Category(Base):
         self.slug: str = str(slug)
         self.url: str = str(url)
         self.iconUrl: str = str(iconUrl)
-        self.dateModified: datetime = create_datetime(dateModified) if isinstance(dateModified, str) else dateModified
+        self.dateModified = dateModified
         self.isClass: bool | None = bool(isClass) if isClass is not None else None
         self.classId: int | None = int(classId) if classId is not None else None
         self.parentCategoryId: int | None = int(parentCategoryId) if parentCategoryId is not None else None
@@ -218,6 +515,8 @@ recentlyUpdated 	[Mod] 	none
 
 # FeaturedModsResponse Class
 class FeaturedModsResponse(Base):
+    __slots__ = ("featured", "popular", "recentlyUpdated")
+
     def __init__(self, featured: List[Mod], popular: List[Mod], recentlyUpdated: List[Mod]):
         self.featured: List[Mod] = list(map(lambda x: Mod(**x) if isinstance(x, dict) else x, featured))
         self.popular: List[Mod] = list(map(lambda x: Mod(**x) if isinstance(x, dict) else x, popular))
@@ -256,6 +555,19 @@ modules 	[FileModule] 	none
 
 # File Class
 class File(Base):
+    __slots__ = (
+        "id", "gameId", "modId", "isAvailable", "displayName", "fileName", "releaseType", "fileStatus", "_hashes",
+        "fileDate", "fileLength", "downloadCount", "downloadUrl", "gameVersions", "_sortableGameVersions",
+        "_dependencies", "exposeAsAlternative", "parentProjectFileId", "alternateFileId", "isServerPack",
+        "serverPackFileId", "fileFingerprint", "_modules"
+    )
+    hashes = LazyField(lambda v: list(map(lambda x: FileHash(**x) if isinstance(x, dict) else x, v)))
+    sortableGameVersions = LazyField(lambda v: [INTERNER.schema(SortableGameVersion, x) for x in v],
+                                     lambda v: [INTERNER.schema(SortableGameVersion, x, trusted=True) for x in v])
+    dependencies = LazyField(lambda v: list(map(lambda x: FileDependency(**x) if isinstance(x, dict) else x, v)))
+    modules = LazyField(lambda v: list(map(lambda x: FileModule(**x) if isinstance(x, dict) else x, v)))
+    _apiDecoders = {"gameVersions": lambda v: list(map(INTERNER.string, v))}
+
     def __init__(self, id: int, gameId: int, modId: int, isAvailable: bool, displayName: str, fileName: str,
                  releaseType: FileReleaseType, fileStatus: FileStatus, hashes: List[FileHash], fileDate: str,
                  fileLength: int, downloadCount: int, downloadUrl: str, gameVersions: List[str],
@@ -271,23 +583,21 @@ class File(Base):
         self.fileName: str = str(fileName)
         self.releaseType: FileReleaseType = FileReleaseType(releaseType)
         self.fileStatus: FileStatus = FileStatus(fileStatus)
-        self.hashes: List[FileHash] = list(map(lambda x: FileHash(**x) if isinstance(x, dict) else x, hashes))
+        self.hashes = hashes
         self.fileDate: str = str(fileDate)
         self.fileLength: int = int(fileLength)
         self.downloadCount: int = int(downloadCount)
         self.downloadUrl: str = str(downloadUrl)
-        self.gameVersions: List[str] = list(map(lambda x: str(x), gameVersions))
-        self.sortableGameVersions: List[SortableGameVersion] = list(
-            map(lambda x: SortableGameVersion(**x) if isinstance(x, dict) else x, sortableGameVersions))
-        self.dependencies: List[FileDependency] = list(
-            map(lambda x: FileDependency(**x) if isinstance(x, dict) else x, dependencies))
+        self.gameVersions: List[str] = list(map(INTERNER.string, gameVersions))
+        self.sortableGameVersions = sortableGameVersions
+        self.dependencies = dependencies
         self.exposeAsAlternative: bool | None = bool(exposeAsAlternative) if exposeAsAlternative is not None else None
         self.parentProjectFileId: int | None = int(parentProjectFileId) if parentProjectFileId is not None else None
         self.alternateFileId: int | None = int(alternateFileId) if alternateFileId is not None else None
         self.isServerPack: bool | None = bool(isServerPack) if isServerPack is not None else None
         self.serverPackFileId: int | None = int(serverPackFileId) if serverPackFileId is not None else None
         self.fileFingerprint: int = int(fileFingerprint)
-        self.modules: List[FileModule] = list(map(lambda x: FileModule(**x) if isinstance(x, dict) else x, modules))
+        self.modules = modules
 
 
 # FileDependency Schema
@@ -306,6 +616,8 @@ relationType 	FileRelationType 	1 = EmbeddedLibrary
 
 # FileDependency Class
 class FileDependency(Base):
+    __slots__ = ("modId", "relationType")
+
     def __init__(self, modId: int, relationType: FileRelationType):
         self.modId: int = int(modId)
         self.relationType: FileRelationType = FileRelationType(relationType)
@@ -323,6 +635,8 @@ algo 	HashAlgo 	1 = Sha1
 
 # FileHash Class
 class FileHash(Base):
+    __slots__ = ("value", "algo")
+
     def __init__(self, value: str, algo: HashAlgo):
         self.value: str = str(value)
         self.algo: HashAlgo = HashAlgo(algo)
@@ -351,9 +665,12 @@ modLoader 	ModLoaderType 	0 = Any
 
 # FileIndex Class
 class FileIndex(Base):
+    __slots__ = ("gameVersion", "fileId", "filename", "releaseType", "gameVersionTypeId", "modLoader")
+    _apiDecoders = {"gameVersion": INTERNER.string, "modLoader": _modLoaderType}
+
     def __init__(self, gameVersion: str, fileId: int, filename: str, releaseType: FileReleaseType,
                  modLoader: ModLoaderType | None = None, gameVersionTypeId: int | None = None):
-        self.gameVersion: str = str(gameVersion)
+        self.gameVersion: str = INTERNER.string(gameVersion)
         self.fileId: int = int(fileId)
         self.filename: str = str(filename)
         self.releaseType: FileReleaseType = FileReleaseType(releaseType)
@@ -372,6 +689,8 @@ fingerprint 	integer(int64) 	none
 
 # FileModule Class
 class FileModule(Base):
+    __slots__ = ("name", "fingerprint")
+
     def __init__(self, name: str, fingerprint: int):
         self.name: str = str(name)
         self.fingerprint: int = int(fingerprint)
@@ -492,6 +811,8 @@ fingerprints 	[integer] 	none
 
 # FingerprintFuzzyMatch Class
 class FingerprintFuzzyMatch(Base):
+    __slots__ = ("id", "file", "latestFiles", "fingerprints")
+
     def __init__(self, id: int, file: File, latestFiles: List[File], fingerprints: List[int]):
         self.id: int = int(id)
         self.file: File = File(**file) if isinstance(file, dict) else file
@@ -509,6 +830,8 @@ fuzzyMatches 	[FingerprintFuzzyMatch] 	none
 
 # FingerprintFuzzyMatchResult Class
 class FingerprintFuzzyMatchResult(Base):
+    __slots__ = ("fuzzyMatches",)
+
     def __init__(self, fuzzyMatches: List[FingerprintFuzzyMatch]):
         self.fuzzyMatches: List[FingerprintFuzzyMatch] = list(
             map(lambda x: FingerprintFuzzyMatch(**x) if isinstance(x, dict) else x, fuzzyMatches))
@@ -526,6 +849,8 @@ latestFiles 	[File] 	none
 
 # FingerprintMatch Class
 class FingerprintMatch(Base):
+    __slots__ = ("id", "file", "latestFiles")
+
     def __init__(self, id: int, file: File, latestFiles: List[File]):
         self.id: int = int(id)
         self.file: File = File(**file) if isinstance(file, dict) else file
@@ -549,6 +874,15 @@ unmatchedFingerprints 	[integer] 	none
 
 # FingerprintsMatchesResult Class
 class FingerprintsMatchesResult(Base):
+    __slots__ = (
+        "isCacheBuilt", "exactMatches", "exactFingerprints", "partialMatches", "partialMatchFingerprints",
+        "installedFingerprints", "unmatchedFingerprints"
+    )
+    _apiDecoders = {
+        "partialMatches": lambda v: v,  # kept as the json, same as __init__
+        "unmatchedFingerprints": lambda v: v or [],
+    }
+
     def __init__(self, isCacheBuilt: bool, exactMatches: List[FingerprintMatch], exactFingerprints: List[int],
                  partialMatches: List[FingerprintMatch], partialMatchFingerprints: object,
                  installedFingerprints: List[int], unmatchedFingerprints: List[int]):
@@ -573,6 +907,8 @@ fingerprints 	[integer] 	none
 
 # FolderFingerprint Class
 class FolderFingerprint(Base):
+    __slots__ = ("foldername", "fingerprints")
+
     def __init__(self, foldername: str, fingerprints: List[int]):
         self.foldername: str = str(foldername)
         self.fingerprints: List[int] = list(map(int, fingerprints))
@@ -600,12 +936,15 @@ apiStatus 	CoreApiStatus 	1 = Private
 
 # Game Class
 class Game(Base):
+    __slots__ = ("id", "name", "slug", "_dateModified", "assets", "status", "apiStatus")
+    dateModified = LazyField(decodeDate)
+
     def __init__(self, id: int, name: str, slug: str, dateModified: datetime, assets: GameAssets, status: CoreStatus,
                  apiStatus: CoreApiStatus):
         self.id: int = int(id)
         self.name: str = str(name)
         self.slug: str = str(slug)
-        self.dateModified: datetime = create_datetime(dateModified) if isinstance(dateModified, str) else dateModified
+        self.dateModified = dateModified
         self.assets: GameAssets = GameAssets(**assets) if isinstance(assets, dict) else assets
         self.status: CoreStatus = CoreStatus(status)
         self.apiStatus: CoreApiStatus = CoreApiStatus(apiStatus)
@@ -623,6 +962,8 @@ coverUrl 	string 	none
 
 # GameAssets Class
 class GameAssets(Base):
+    __slots__ = ("iconUrl", "tileUrl", "coverUrl")
+
     def __init__(self, iconUrl: str, tileUrl: str, coverUrl: str):
         self.iconUrl: str = str(iconUrl)
         self.tileUrl: str = str(tileUrl)
@@ -640,6 +981,8 @@ versions 	[string] 	none
 
 # GameVersionsByType Class
 class GameVersionsByType(Base):
+    __slots__ = ("type", "versions")
+
     def __init__(self, type: int, versions: List[str]):
         self.type: int = int(type)
         self.versions: List[str] = list(map(str, versions))
@@ -677,6 +1020,8 @@ slug 	string 	none
 
 # GameVersionType Class
 class GameVersionType(Base):
+    __slots__ = ("id", "gameId", "name", "slug")
+
     def __init__(self, id: int, gameId: int, name: str, slug: str):
         self.id: int = int(id)
         self.gameId: int = int(gameId)
@@ -710,6 +1055,8 @@ data 	[Category] 	The response data
 
 # GetCategoriesResponse Class
 class GetCategoriesResponse(Base):
+    __slots__ = ("data",)
+
     def __init__(self, data: List[Category]):
         # self.data: List[Category] = Category(**data) if isinstance(data, dict) else data
         self.data: List[Category] = list(map(lambda x: Category(**x) if isinstance(x, dict) else x, data))
@@ -725,6 +1072,8 @@ data 	FeaturedModsResponse 	The response data
 
 # GetFeaturedModsResponse Class
 class GetFeaturedModsResponse(Base):
+    __slots__ = ("data",)
+
     def __init__(self, data: FeaturedModsResponse):
         self.data: FeaturedModsResponse = FeaturedModsResponse(**data) if isinstance(data, dict) else data
 
@@ -739,6 +1088,8 @@ data 	[File] 	The response data
 
 # GetFilesResponse Class
 class GetFilesResponse(Base):
+    __slots__ = ("data",)
+
     def __init__(self, data: List[File]):
         self.data: List[File] = list(map(lambda x: File(**x) if isinstance(x, dict) else x, data))
 
@@ -753,6 +1104,8 @@ data 	FingerprintsMatchesResult 	The response data
 
 # GetFingerprintMatchesResponse Class
 class GetFingerprintMatchesResponse(Base):
+    __slots__ = ("data",)
+
     def __init__(self, data: FingerprintsMatchesResult):
         self.data: FingerprintsMatchesResult = FingerprintsMatchesResult(**data) if isinstance(data, dict) else data
 
@@ -767,6 +1120,8 @@ data 	FingerprintFuzzyMatchResult 	The response data
 
 # GetFingerprintsFuzzyMatchesResponse Class
 class GetFingerprintsFuzzyMatchesResponse(Base):
+    __slots__ = ("data",)
+
     def __init__(self, data: FingerprintFuzzyMatchResult):
         self.data: FingerprintFuzzyMatchResult = FingerprintFuzzyMatchResult(**data) if isinstance(data, dict) else data
 
@@ -781,6 +1136,8 @@ data 	Game 	The response data
 
 # GetGameResponse Class
 class GetGameResponse(Base):
+    __slots__ = ("data",)
+
     def __init__(self, data: Game):
         self.data: Game = Game(**data) if isinstance(data, dict) else data
 
@@ -796,6 +1153,8 @@ pagination 	Pagination 	The response pagination information
 
 # GetGamesResponse Class
 class GetGamesResponse(Base):
+    __slots__ = ("data", "pagination")
+
     def __init__(self, data: List[Game], pagination: Pagination):
         self.data: List[Game] = list(map(lambda x: Game(**x) if isinstance(x, dict) else x, data))
         self.pagination: Pagination = Pagination(**pagination) if isinstance(pagination, dict) else pagination
@@ -811,6 +1170,8 @@ data 	File 	The response data
 
 # GetModFileResponse Class
 class GetModFileResponse(Base):
+    __slots__ = ("data",)
+
     def __init__(self, data: File):
         self.data: File = File(**data) if isinstance(data, dict) else data
 
@@ -826,6 +1187,8 @@ pagination 	Pagination 	The response pagination information
 
 # GetModFilesResponse Class
 class GetModFilesResponse(Base):
+    __slots__ = ("data", "pagination")
+
     def __init__(self, data: List[File], pagination: Pagination):
         self.data: List[File] = list(map(lambda x: File(**x) if isinstance(x, dict) else x, data))
         self.pagination: Pagination = Pagination(**pagination) if isinstance(pagination, dict) else pagination
@@ -841,6 +1204,8 @@ data 	Mod 	The response data
 
 # GetModResponse Class
 class GetModResponse(Base):
+    __slots__ = ("data",)
+
     def __init__(self, data: Mod):
         self.data: Mod = Mod(**data) if isinstance(data, dict) else data
 
@@ -855,6 +1220,8 @@ data 	[Mod] 	The response data
 
 # GetModsResponse Class
 class GetModsResponse(Base):
+    __slots__ = ("data",)
+
     def __init__(self, data: List[Mod]):
         self.data: List[Mod] = list(map(lambda x: Mod(**x) if isinstance(x, dict) else x, data))
 
@@ -869,6 +1236,8 @@ data 	[GameVersionType] 	The response data
 
 # GetVersionTypesResponse Class
 class GetVersionTypesResponse(Base):
+    __slots__ = ("data",)
+
     def __init__(self, data: List[GameVersionType]):
         self.data: List[GameVersionType] = list(map(lambda x: GameVersionType(**x) if isinstance(x, dict) else x, data))
 
@@ -883,6 +1252,8 @@ data 	[GameVersionsByType] 	The response data
 
 # GetVersionsResponse Class
 class GetVersionsResponse(Base):
+    __slots__ = ("data",)
+
     def __init__(self, data: List[GameVersionsByType]):
         self.data: List[GameVersionsByType] = list(
             map(lambda x: GameVersionsByType(**x) if isinstance(x, dict) else x, data))
@@ -900,6 +1271,8 @@ gameVersionTypeId 	integer(int32)¦null 	none
 
 # GetFeaturedModsRequestBody Class
 class GetFeaturedModsRequestBody(Base):
+    __slots__ = ("gameId", "excludedModIds", "gameVersionTypeId")
+
     def __init__(self, gameId: int, excludedModIds: List[int], gameVersionTypeId: int | None = None):
         self.gameId: int = int(gameId)
         self.excludedModIds: List[int] = list(map(int, excludedModIds))
@@ -916,6 +1289,8 @@ fingerprints 	[integer] 	none
 
 # GetFingerprintMatchesRequestBody Class
 class GetFingerprintMatchesRequestBody(Base):
+    __slots__ = ("fingerprints",)
+
     def __init__(self, fingerprints: List[int]):
         self.fingerprints: List[int] = list(map(int, fingerprints))
 
@@ -931,6 +1306,8 @@ fingerprints 	[FolderFingerprint] 	none
 
 # GetFuzzyMatchesRequestBody Class
 class GetFuzzyMatchesRequestBody(Base):
+    __slots__ = ("gameId", "fingerprints")
+
     def __init__(self, gameId: int, fingerprints: List[FolderFingerprint]):
         self.gameId: int = int(gameId)
         self.fingerprints: List[FolderFingerprint] = list(
@@ -947,6 +1324,8 @@ fileIds 	[integer] 	none
 
 # GetModFilesRequestBody Class
 class GetModFilesRequestBody(Base):
+    __slots__ = ("fileIds",)
+
     def __init__(self, fileIds: List[int]):
         self.fileIds: List[int] = list(map(int, fileIds))
 
@@ -961,6 +1340,8 @@ modIds 	[integer] 	none
 
 # GetModsByIdsListRequestBody Class
 class GetModsByIdsListRequestBody(Base):
+    __slots__ = ("modIds",)
+
     def __init__(self, modIds: List[int]):
         self.modIds: List[int] = list(map(int, modIds))
 
@@ -1018,6 +1399,12 @@ gameVersionTypeStatus 	GameVersionTypeStatus 	1 = Normal
 
 # MinecraftGameVersion Class
 class MinecraftGameVersion(Base):
+    __slots__ = (
+        "id", "gameVersionId", "versionString", "jarDownloadUrl", "jsonDownloadUrl", "approved", "_dateModified",
+        "gameVersionTypeId", "gameVersionStatus", "gameVersionTypeStatus"
+    )
+    dateModified = LazyField(decodeDate)
+
     def __init__(self, id: int, gameVersionId: int, versionString: str, jarDownloadUrl: str, jsonDownloadUrl: str,
                  approved: bool, dateModified: datetime, gameVersionTypeId: int, gameVersionStatus: GameVersionStatus,
                  gameVersionTypeStatus: GameVersionTypeStatus):
@@ -1027,7 +1414,7 @@ class MinecraftGameVersion(Base):
         self.jarDownloadUrl: str = str(jarDownloadUrl)
         self.jsonDownloadUrl: str = str(jsonDownloadUrl)
         self.approved: bool = bool(approved)
-        self.dateModified: datetime = create_datetime(dateModified) if isinstance(dateModified, str) else dateModified
+        self.dateModified = dateModified
         self.gameVersionTypeId: int = int(gameVersionTypeId)
         self.gameVersionStatus: GameVersionStatus = GameVersionStatus(gameVersionStatus)
         self.gameVersionTypeStatus: GameVersionTypeStatus = GameVersionTypeStatus(gameVersionTypeStatus)
@@ -1054,13 +1441,17 @@ type 	ModLoaderType 	0 = Any
 
 # MinecraftModLoaderIndex Class
 class MinecraftModLoaderIndex(Base):
+    __slots__ = ("name", "gameVersion", "latest", "recommended", "_dateModified", "type")
+    dateModified = LazyField(decodeDate)
+    _apiDecoders = {"type": _modLoaderType}
+
     def __init__(self, name: str, gameVersion: str, latest: bool, recommended: bool, dateModified: datetime,
                  type: ModLoaderType | None = None):
         self.name: str = str(name)
         self.gameVersion: str = str(gameVersion)
         self.latest: bool = bool(latest)
         self.recommended: bool = bool(recommended)
-        self.dateModified: datetime = create_datetime(dateModified) if isinstance(dateModified, str) else dateModified
+        self.dateModified = dateModified
         self.type: ModLoaderType = ModLoaderType(type) if type is not None else ModLoaderType.NoneFound
 
 
@@ -1114,6 +1505,15 @@ installProfileJson 	string 	none
 
 # MinecraftModLoaderVersion Class
 class MinecraftModLoaderVersion(Base):
+    __slots__ = (
+        "id", "gameVersionId", "minecraftGameVersionId", "forgeVersion", "name", "type", "downloadUrl", "filename",
+        "installMethod", "latest", "recommended", "approved", "_dateModified", "mavenVersionString", "versionJson",
+        "librariesInstallLocation", "minecraftVersion", "additionalFilesJson", "modLoaderGameVersionId",
+        "modLoaderGameVersionTypeId", "modLoaderGameVersionStatus", "modLoaderGameVersionTypeStatus", "mcGameVersionId",
+        "mcGameVersionTypeId", "mcGameVersionStatus", "mcGameVersionTypeStatus", "installProfileJson"
+    )
+    dateModified = LazyField(decodeDate)
+
     def __init__(self, id: int, gameVersionId: int, minecraftGameVersionId: int, forgeVersion: str, name: str,
                  type: ModLoaderType, downloadUrl: str, filename: str, installMethod: ModLoaderInstallMethod,
                  latest: bool, recommended: bool, approved: bool, dateModified: datetime, mavenVersionString: str,
@@ -1134,7 +1534,7 @@ class MinecraftModLoaderVersion(Base):
         self.latest: bool = bool(latest)
         self.recommended: bool = bool(recommended)
         self.approved: bool = bool(approved)
-        self.dateModified: datetime = create_datetime(dateModified) if isinstance(dateModified, str) else dateModified
+        self.dateModified = dateModified
         self.mavenVersionString: str = str(mavenVersionString)
         self.versionJson: str = str(versionJson)
         self.librariesInstallLocation: str = str(librariesInstallLocation)
@@ -1142,7 +1542,7 @@ class MinecraftModLoaderVersion(Base):
         self.additionalFilesJson: str = str(additionalFilesJson)
         self.modLoaderGameVersionId: int = int(modLoaderGameVersionId)
         self.modLoaderGameVersionTypeId: int = int(modLoaderGameVersionTypeId)
-        self.modLoaderGameVersionStatus: GameVersionStatus = (modLoaderGameVersionStatus)
+        self.modLoaderGameVersionStatus: GameVersionStatus = GameVersionStatus(modLoaderGameVersionStatus)
         self.modLoaderGameVersionTypeStatus: GameVersionTypeStatus = GameVersionTypeStatus(
             modLoaderGameVersionTypeStatus)
         self.mcGameVersionId: int = int(mcGameVersionId)
@@ -1186,12 +1586,32 @@ thumbsUpCount 	integer(int32) 	The mod's thumbs up count
 
 # Mod Class
 class Mod(Base):
+    __slots__ = (
+        "id", "gameId", "name", "slug", "links", "summary", "status", "downloadCount", "isFeatured",
+        "primaryCategoryId", "_categories", "classId", "authors", "logo", "_screenshots", "mainFileId",
+        "_latestFiles", "_latestFilesIndexes", "_dateCreated", "_dateModified", "_dateReleased",
+        "allowModDistribution", "gamePopularityRank", "isAvailable", "thumbsUpCount", "extra"
+    )
+    # a search page only shows a few fields of every hit, the rest is decoded when a detail view reads it
+    categories = LazyField(lambda v: [INTERNER.schema(Category, i) for i in v],
+                           lambda v: [INTERNER.schema(Category, i, trusted=True) for i in v])
+    screenshots = LazyField(lambda v: list(map(lambda i: ModAsset(**i) if isinstance(i, dict) else i, v)))
+    latestFiles = LazyField(lambda v: list(map(lambda i: File(**i) if isinstance(i, dict) else i, v)))
+    latestFilesIndexes = LazyField(lambda v: list(map(lambda i: FileIndex(**i) if isinstance(i, dict) else i, v)))
+    dateCreated = LazyField(decodeDate)
+    dateModified = LazyField(decodeDate)
+    dateReleased = LazyField(decodeDate)
+    _apiDecoders = {
+        "classId": lambda v: v or None,
+        "authors": lambda v: [INTERNER.schema(ModAuthor, i, trusted=True) for i in v],
+    }
+
     def __init__(self, id: int, gameId: int, name: str, slug: str, links: ModLinks, summary: str, status: ModStatus,
                  downloadCount: int, isFeatured: bool, primaryCategoryId: int, categories: List[Category],
                  authors: List[ModAuthor], logo: ModAsset, screenshots: List[ModAsset], mainFileId: int,
                  latestFiles: List[File], latestFilesIndexes: List[FileIndex], dateCreated: datetime,
                  dateModified: datetime, dateReleased: datetime, gamePopularityRank: int, isAvailable: bool,
-                 thumbsUpCount: int, classId: int | None = None, allowModDistribution: bool | None = None, **kwargs):
+                 thumbsUpCount: int, classId: int | None = None, allowModDistribution: bool | None = None, **extra):
         self.id: int = int(id)
         self.gameId: int = int(gameId)
         self.name: str = str(name)
@@ -1202,26 +1622,38 @@ class Mod(Base):
         self.downloadCount: int = int(downloadCount)
         self.isFeatured: bool = bool(isFeatured)
         self.primaryCategoryId: int = int(primaryCategoryId)
-        self.categories: List[Category] = list(map(lambda i: Category(**i) if isinstance(i, dict) else i, categories))
+        self.categories = categories
         self.classId: int | None = int(classId) if classId else None
-        self.authors: List[ModAuthor] = list(map(lambda i: ModAuthor(**i) if isinstance(i, dict) else i, authors))
+        self.authors: List[ModAuthor] = [INTERNER.schema(ModAuthor, i) for i in authors]
         self.logo: ModAsset = ModAsset(**logo) if isinstance(logo, dict) else logo
-        self.screenshots: List[ModAsset] = list(map(lambda i: ModAsset(**i) if isinstance(i, dict) else i, screenshots))
+        self.screenshots = screenshots
         self.mainFileId: int = int(mainFileId)
-        self.latestFiles: List[File] = list(map(lambda i: File(**i) if isinstance(i, dict) else i, latestFiles))
-        self.latestFilesIndexes: List[FileIndex] = list(
-            map(lambda i: FileIndex(**i) if isinstance(i, dict) else i, latestFilesIndexes)
-        )
-        self.dateCreated: datetime = create_datetime(dateCreated) if isinstance(dateCreated, str) else dateCreated
-        self.dateModified: datetime = create_datetime(dateModified) if isinstance(dateModified, str) else dateModified
-        self.dateReleased: datetime = create_datetime(dateReleased) if isinstance(dateReleased, str) else dateReleased
+        self.latestFiles = latestFiles
+        self.latestFilesIndexes = latestFilesIndexes
+        self.dateCreated = dateCreated
+        self.dateModified = dateModified
+        self.dateReleased = dateReleased
         self.allowModDistribution: bool | None = bool(
             allowModDistribution) if allowModDistribution is not None else None
         self.gamePopularityRank: int = int(gamePopularityRank)
         self.isAvailable: bool = bool(isAvailable)
         self.thumbsUpCount: int = int(thumbsUpCount)
-        for key, value in kwargs.items():
-            setattr(self, key, value)
+        self.extra: Dict[str, Any] = extra  # fields the api added after this schema was written
+
+    def __getattr__(self, name):
+        # only reached when no slot matched, the unknown fields keep reading like attributes
+        if name != "extra":
+            try:
+                return self.extra[name]
+            except (KeyError, AttributeError):
+                pass
+        raise AttributeError(f"'Mod' object has no attribute '{name}'")
+
+    def _asDict(self) -> Dict[str, Any]:
+        fields = super()._asDict()
+        del fields["extra"]
+        fields.update(self.extra)
+        return fields
 
 
 # ModAsset Schema
@@ -1239,6 +1671,8 @@ url 	string 	none
 
 # ModAsset Class
 class ModAsset(Base):
+    __slots__ = ("id", "modId", "title", "description", "thumbnailUrl", "url")
+
     def __init__(self, id: int, modId: int, title: str, description: str, thumbnailUrl: str, url: str):
         self.id: int = int(id)
         self.modId: int = int(modId)
@@ -1260,6 +1694,8 @@ url 	string 	none
 
 # ModAuthor Class
 class ModAuthor(Base):
+    __slots__ = ("id", "name", "url", "__weakref__")
+
     def __init__(self, id: int, name: str, url: str):
         self.id: int = int(id)
         self.name: str = str(name)
@@ -1279,6 +1715,8 @@ sourceUrl 	string 	none
 
 # ModLinks Class
 class ModLinks(Base):
+    __slots__ = ("websiteUrl", "wikiUrl", "issuesUrl", "sourceUrl")
+
     def __init__(self, websiteUrl: str, wikiUrl: str, issuesUrl: str, sourceUrl: str):
         self.websiteUrl: str = str(websiteUrl)
         self.wikiUrl: str = str(wikiUrl)
@@ -1424,6 +1862,8 @@ totalCount 	integer(int64) 	The total number of items available by the request
 
 # Pagination Class
 class Pagination(Base):
+    __slots__ = ("index", "pageSize", "resultCount", "totalCount")
+
     def __init__(self, index: int, pageSize: int, resultCount: int, totalCount: int):
         self.index: int = int(index)
         self.pageSize: int = int(pageSize)
@@ -1442,6 +1882,8 @@ pagination 	Pagination 	The response pagination information
 
 # SearchModsResponse Class
 class SearchModsResponse(Base):
+    __slots__ = ("data", "pagination")
+
     def __init__(self, data: List[Mod], pagination: Pagination):
         self.data: List[Mod] = list(map(lambda x: Mod(**x) if isinstance(x, dict) else x, data))
         self.pagination: Pagination = Pagination(**pagination) if isinstance(pagination, dict) else pagination
@@ -1461,6 +1903,11 @@ gameVersionTypeId 	integer(int32)¦null 	Game version type id
 
 # SortableGameVersion Class
 class SortableGameVersion(Base):
+    __slots__ = (
+        "gameVersionName", "gameVersionPadded", "gameVersion", "gameVersionReleaseDate", "gameVersionTypeId",
+        "__weakref__"
+    )
+
     def __init__(self, gameVersionName: str, gameVersionPadded: str, gameVersion: str, gameVersionReleaseDate: str,
                  gameVersionTypeId: int | None = None):
         self.gameVersionName: str = str(gameVersionName)
@@ -1486,6 +1933,8 @@ data 	string 	The response data
 
 # StringResponse Class
 class StringResponse(Base):
+    __slots__ = ("data",)
+
     def __init__(self, data: str):
         self.data: str = str(data)
 
@@ -0,0 +1,77 @@
+"""
+相同请求的单飞(single-flight)去重
+同一时刻对同一个键的多个调用只会真正执行一次, 其余调用等待并共享同一个结果
+"""
+import asyncio
+import functools
+import threading
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+
+class _Call(object):
+    __slots__ = ("done", "result", "exception")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.exception: BaseException = None
+
+
+class SingleFlight(object):
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, _Call] = {}
+
+    def do(self, key: Hashable, func: Callable[[], Any]) -> Any:
+        """
+        Run func for key, or wait for the call already running for the same key
+        :param key: The deduplication key
+        :param func: The function to run
+        :return: The (shared) result of func
+
+        :raise: The exception raised by func, re-raised in every waiting caller
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+
+        if not leader:
+            call.done.wait()
+        else:
+            try:
+                call.result = func()
+            except BaseException as e:
+                call.exception = e
+            finally:
+                with self._lock:
+                    del self._calls[key]
+                call.done.set()
+
+        if call.exception is not None:
+            raise call.exception
+        return call.result
+
+    def inFlight(self) -> int:
+        return len(self._calls)
+
+
+class AsyncSingleFlight(object):
+    def __init__(self):
+        self._calls: Dict[Hashable, asyncio.Future] = {}
+
+    async def do(self, key: Hashable, func: Callable[[], Awaitable[Any]]) -> Any:
+        future = self._calls.get(key)
+        if future is None:
+            future = self._calls[key] = asyncio.ensure_future(func())
+            future.add_done_callback(functools.partial(self._forget, key))
+        # shield: one cancelled caller must not cancel the call shared with the others
+        return await asyncio.shield(future)
+
+    def _forget(self, key: Hashable, future: asyncio.Future):
+        if self._calls.get(key) is future:
+            del self._calls[key]
+
+    def inFlight(self) -> int:
+        return len(self._calls)
@@ -1,4 +1,4 @@
-from typing import List
+from typing import Dict, List, Tuple
 
 from .CFAPI import CurseForgeAPI
 from .SchemaClasses import FileReleaseType, ApiResponseCode, Category
@@ -29,10 +29,14 @@ def downloadFileFromModIDVersion(self: CurseForgeAPI, modID: str, version: str,
     raise Exception('Version not found matching the given release type.')
 
 
-def getStructureCategories(categories: List[Category], classID: int) -> List[Category]:
-    _map = {c.id: c for c in categories}
+def getStructureCategories(categories: List[Category], classID: int) -> List[Tuple[Category, List[Category]]]:
+    """
+    :return: (root category, its children) pairs; the categories are left untouched,
+        they may be shared by cached responses and interned mod categories
+    """
+    _map: Dict[int, List[Category]] = {c.id: [] for c in categories}
     roots = [c for c in categories if c.parentCategoryId == classID]
     for c in categories:
         if c.parentCategoryId != classID:
-            _map[c.parentCategoryId].children.append(c)
-    return roots
+            _map[c.parentCategoryId].append(c)
+    return [(root, _map[root.id]) for root in roots]
@@ -1,4 +1,6 @@
-from .CFAPI import CurseForgeAPI
+from .AsyncCFAPI import AsyncCurseForgeAPI
+from .CFAPI import CurseForgeAPI, ApiError
+from .Crawler import CatalogueCrawler
 from .SchemaClasses import (
     ApiResponseCode,
     ApiResponseOfListOfMinecraftGameVersion,
@@ -4,7 +4,7 @@ from .concurrent.curseforgeTask import GetMinecraftInfoExecutor, MinecraftModSea
 from .utils.FetchImageManager import FetchImageManagerBase
 
 minecraftInfoManager = GetMinecraftInfoExecutor(CfClient)
-minecraftModSearchManager = MinecraftModSearchExecutor(CfClient)
+minecraftModSearchManager = MinecraftModSearchExecutor(CfClient, staleWhileRevalidate=True)
 fetchImageManager = FetchImageManagerBase()
 minecraftModFileEntriesManager = MinecraftModFileEntriesExecutor(CfClient)
 
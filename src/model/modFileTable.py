@@ -0,0 +1,210 @@
+"""
+按列存储的模组文件列表
+热门模组有上千个文件, 每行一个 File + ModFileEntry 对象太重;
+数值列用 array, 重复的字符串(日期, 版本组合)存进去重字符串表, 游戏版本和加载器的归属用位集表示,
+表格模型和筛选直接读列
+"""
+import array
+import json
+from typing import Dict, Iterable, List, Optional
+
+from . import getReleaseTypeString, getFormatFileSizeString, getGameVersionAndModLoader
+from ..curseforge import SchemaClasses as schemas
+
+_RELEASE_TYPE_STRINGS = {releaseType.value: getReleaseTypeString(releaseType) for releaseType in schemas.FileReleaseType}
+
+
+class StringTable(object):
+    """
+    Deduplicated strings, a column stores the codes
+    """
+    __slots__ = ("strings", "codes")
+
+    def __init__(self):
+        self.strings: List[str] = []
+        self.codes: Dict[str, int] = {}
+
+    def add(self, value: str) -> int:
+        """
+        :return: The code of value, added if new
+        """
+        if (code := self.codes.get(value)) is None:
+            code = self.codes[value] = len(self.strings)
+            self.strings.append(value)
+        return code
+
+    def get(self, value: str) -> Optional[int]:
+        return self.codes.get(value)
+
+    def __getitem__(self, code: int) -> str:
+        return self.strings[code]
+
+    def __len__(self):
+        return len(self.strings)
+
+
+class Bitsets(object):
+    """
+    One growable bitset (rows) per code of a StringTable, e.g. the rows supporting each game version
+    """
+    __slots__ = ("keys", "bits")
+
+    def __init__(self):
+        self.keys = StringTable()
+        self.bits: List[bytearray] = []
+
+    def add(self, key: str, row: int):
+        code = self.keys.add(key)
+        if code == len(self.bits):
+            self.bits.append(bytearray())
+        bits = self.bits[code]
+        if len(bits) <= row >> 3:
+            bits.extend(bytes((row >> 3) + 1 - len(bits)))
+        bits[row >> 3] |= 1 << (row & 7)
+
+    def mask(self, key: str) -> int:
+        """
+        :return: The rows of key as an int bitset (bit i set = row i), 0 if key is unknown
+        """
+        code = self.keys.get(key)
+        return 0 if code is None else int.from_bytes(self.bits[code], "little")
+
+
+class ModFileTable(object):
+    """
+    Columns, one entry per file:
+    ids, fileLength, downloadCount, releaseType: typed arrays
+    names, downloadUrls: plain lists (unique per file)
+    uploaded, gameVersionText, modLoaderText: codes into self.text
+    hashes: {algo name: [value or ""]}
+    versions, loaders, releaseTypes: Bitsets of the rows supporting each game version / mod loader,
+        and of the rows of each release type (keyed by its name)
+    """
+
+    def __init__(self):
+        self.ids = array.array("q")
+        self.fileLength = array.array("q")
+        self.downloadCount = array.array("q")
+        self.releaseType = array.array("b")
+        self.names: List[str] = []
+        self.downloadUrls: List[str] = []
+        self.text = StringTable()
+        self.uploaded = array.array("I")
+        self.gameVersionText = array.array("I")
+        self.modLoaderText = array.array("I")
+        self.hashes: Dict[str, List[str]] = {algo.name: [] for algo in schemas.HashAlgo}
+        self.versions = Bitsets()
+        self.loaders = Bitsets()
+        self.releaseTypes = Bitsets()
+
+    @classmethod
+    def fromFiles(cls, files: Iterable[schemas.File]) -> 'ModFileTable':
+        table = cls()
+        table.extend(files)
+        return table
+
+    def append(self, file: schemas.File):
+        row = len(self.ids)
+        self.ids.append(file.id)
+        self.fileLength.append(file.fileLength)
+        self.downloadCount.append(file.downloadCount)
+        self.releaseType.append(file.releaseType.value)
+        self.releaseTypes.add(file.releaseType.name, row)
+        self.names.append(file.displayName)
+        self.downloadUrls.append(file.downloadUrl)
+        self.uploaded.append(self.text.add(file.fileDate.split("T")[0]))
+
+        gameVersions, modLoaders = getGameVersionAndModLoader(file.sortableGameVersions)
+        self.gameVersionText.append(self.text.add(",".join(gameVersions)))
+        self.modLoaderText.append(self.text.add(",".join(modLoaders)))
+        for version in gameVersions:
+            self.versions.add(version, row)
+        for loader in modLoaders:
+            self.loaders.add(loader, row)
+
+        hashes = {h.algo.name: h.value for h in file.hashes}
+        for algo, column in self.hashes.items():
+            column.append(hashes.get(algo, ""))
+
+    def extend(self, files: Iterable[schemas.File]):
+        for file in files:
+            self.append(file)
+
+    def __len__(self):
+        return len(self.ids)
+
+    # region filters
+    def mask(self, gameVersion: Optional[str] = None, modLoader: Optional[str] = None,
+             releaseTypes: Optional[Iterable[schemas.FileReleaseType]] = None) -> int:
+        """
+        :return: The matching rows as an int bitset, a None filter matches everything
+        """
+        mask = (1 << len(self)) - 1
+        if gameVersion is not None:
+            mask &= self.versions.mask(gameVersion)
+        if modLoader is not None:
+            mask &= self.loaders.mask(modLoader)
+        if releaseTypes is not None:
+            wanted = 0
+            for releaseType in set(releaseTypes):
+                wanted |= self.releaseTypes.mask(releaseType.name)
+            mask &= wanted
+        return mask
+
+    def rows(self, gameVersion: Optional[str] = None, modLoader: Optional[str] = None,
+             releaseTypes: Optional[Iterable[schemas.FileReleaseType]] = None) -> List[int]:
+        """
+        :return: The matching row numbers, in order
+        """
+        bits = bin(self.mask(gameVersion, modLoader, releaseTypes))[:1:-1]  # bit 0 first
+        rows = []
+        row = bits.find("1")
+        while row != -1:
+            rows.append(row)
+            row = bits.find("1", row + 1)
+        return rows
+    # endregion
+
+    # region rows
+    def display(self, row: int, column: int):
+        """
+        The same columns as ModFileEntry:
+        0: releaseType, 1: name, 2: uploadedTime, 3: size, 4: gameVersion, 5: modLoaders, 6: downloadLink, 7: fileHash
+        """
+        if column == 0:
+            return _RELEASE_TYPE_STRINGS[self.releaseType[row]]
+        if column == 1:
+            return self.names[row]
+        if column == 2:
+            return self.text[self.uploaded[row]]
+        if column == 3:
+            return getFormatFileSizeString(self.fileLength[row])
+        if column == 4:
+            return self.text[self.gameVersionText[row]]
+        if column == 5:
+            return self.text[self.modLoaderText[row]]
+        if column == 6:
+            return self.downloadUrls[row]
+        if column == 7:
+            return self.fileHash(row)
+        raise IndexError(column)
+
+    def fileHash(self, row: int) -> Dict[str, str]:
+        return {algo: column[row] for algo, column in self.hashes.items() if column[row]}
+
+    def serialize(self, row: int) -> Dict[str, str]:
+        """
+        :return: The same dict as ModFileEntry.serialize
+        """
+        text = self.text.strings
+        return {
+            "releaseType": _RELEASE_TYPE_STRINGS[self.releaseType[row]],
+            "name": self.names[row],
+            "uploadedTime": text[self.uploaded[row]],
+            "size": getFormatFileSizeString(self.fileLength[row]),
+            "gameVersions": text[self.gameVersionText[row]],
+            "modLoaders": text[self.modLoaderText[row]],
+            "downloadLink": self.downloadUrls[row],
+            "fileHash": json.dumps(self.fileHash(row)),
+        }
+    # endregion
@@ -2,7 +2,7 @@ import typing
 
 from PyQt5.QtCore import QObject, QAbstractTableModel, QModelIndex, Qt
 
-from . import ModFileEntry
+from .modFileTable import ModFileTable
 from ..curseforge import SchemaClasses as schemas
 from ..managers import minecraftModFileEntriesManager
 
@@ -19,16 +19,19 @@ class ModFilesModel(QAbstractTableModel):
     6: downloads
 
     user role:
-    1: downloadLink
-    2: fileHash
+    the dict of ModFileTable.serialize (the same as ModFileEntry.serialize and a ModFilesSqlModel record),
+    e.g. ["downloadLink"] and ["fileHash"] (json text), for any column
     """
 
     def __init__(self, parent: QObject = None):
         super().__init__(parent=parent)
-        self.__tableData: typing.List[ModFileEntry] = []
+        self.__table = ModFileTable()
+        self.__rows: typing.List[int] = []  # 筛选后可见的行
+        self.__gameVersion: typing.Optional[str] = None
+        self.__modLoader: typing.Optional[str] = None
 
     def rowCount(self, parent: QModelIndex = ...) -> int:
-        return len(self.__tableData)
+        return len(self.__rows)
 
     # TODO: Implement this
     def columnCount(self, parent: QModelIndex = ...) -> int:
@@ -37,23 +40,33 @@ class ModFilesModel(QAbstractTableModel):
 
     def data(self, index: QModelIndex, role: int = ...) -> typing.Any:
         if role == Qt.ItemDataRole.DisplayRole:
-            return self.__tableData[index.row()][index.column()]
+            return self.__table.display(self.__rows[index.row()], index.column())
         if role == Qt.ItemDataRole.UserRole:
-            return self.__tableData[index.row()]
+            return self.__table.serialize(self.__rows[index.row()])
 
-    def onModFilesGot(self, modList: typing.List[schemas.File]):
+    def onModFilesGot(self, table: ModFileTable):
         self.beginResetModel()
-        self.__tableData = [ModFileEntry(
-            releaseType=mod.releaseType,
-            name=mod.displayName,
-            uploadedTime=mod.fileDate,
-            size=mod.fileLength,
-            gameVersions=mod.sortableGameVersions,
-            downloadLink=mod.downloadUrl,
-            fileHash=mod.hashes
-        ) for mod in modList]
+        self.__table = table
+        self.__rows = table.rows(self.__gameVersion, self.__modLoader)
         self.endResetModel()
 
+    def setFilter(self, gameVersion: typing.Optional[str] = None, modLoader: typing.Optional[str] = None):
+        """
+        Only show the files supporting gameVersion and modLoader, None shows all
+        :param gameVersion: e.g. "1.20.1"
+        :param modLoader: e.g. "Forge"
+        """
+        self.beginResetModel()
+        self.__gameVersion, self.__modLoader = gameVersion, modLoader
+        self.__rows = self.__table.rows(gameVersion, modLoader)
+        self.endResetModel()
+
+    def modLoaders(self) -> typing.List[str]:
+        """
+        :return: The mod loaders supported by at least one file, for the filter combo box
+        """
+        return sorted(self.__table.loaders.keys.strings)
+
     def headerData(self, section: int, orientation: Qt.Orientation, role: int = ...) -> typing.Any:
         if orientation == Qt.Orientation.Horizontal and role == Qt.ItemDataRole.DisplayRole:
             return {
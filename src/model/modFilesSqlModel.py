@@ -1,8 +1,6 @@
-import typing
-
 from PyQt5.QtSql import QSqlTableModel, QSqlDatabase, QSqlQuery
 
-from . import ModFileEntry
+from .modFileTable import ModFileTable
 from ..curseforge import SchemaClasses as schemas
 from ..managers import minecraftModFileEntriesManager
 
@@ -12,7 +10,7 @@ class ModFilesSqlModel(QSqlTableModel):
         super().__init__(parent=parent, db=db)
         self.mod = None
 
-    def onModFilesGot(self, modList: typing.List[schemas.File]):
+    def onModFilesGot(self, table: ModFileTable):
         self.beginResetModel()
         self.setTable("modFiles")
 
@@ -23,8 +21,8 @@ class ModFilesSqlModel(QSqlTableModel):
         sql.prepare(
             f"INSERT INTO modFiles VALUES ({', '.join(['?' for _ in range(8)])})"
         )
-        for mod in modList:
-            serialized = ModFileEntry.serialize(mod)
+        for row in range(len(table)):
+            serialized = table.serialize(row)
             sql.addBindValue(serialized["releaseType"])
             sql.addBindValue(serialized["name"])
             sql.addBindValue(serialized["uploadedTime"])
@@ -18,7 +18,7 @@ from .modDetailPage_DL import ModDetailPage_DL
 from Plugins.ModPlaza_Plugin.src.concurrent.future.future import Future
 from ..curseforge import SchemaClasses as schemas
 from ..managers import fetchImageManager
-from ..model.modFilesSqlModel import ModFilesSqlModel
+from ..model.modFilesModel import ModFilesModel
 
 
 class ModDetailPage(QtWidgets.QFrame):
@@ -32,7 +32,7 @@ class ModDetailPage(QtWidgets.QFrame):
         self.ui.backButton.clicked.connect(lambda: self.backSignal.emit(self))
 
     def deleteModel(self):
-        self.ui.modFilesInterface.ui.TableView.model().delete()
+        self.ui.modFilesInterface.ui.TableView.model().deleteLater()
         self.ui.modFilesInterface.ui.TableView.setModel(None)
 
     def onBackButtonClicked(self):
@@ -91,7 +91,7 @@ class ModDetailPage(QtWidgets.QFrame):
     def getInstance(mod: schemas.Mod):
         modDetailPage = ModDetailPage()
         modDetailPage.setModInfo(mod)
-        modDetailPage.ui.modFilesInterface.ui.TableView.setModel(model := ModFilesSqlModel.getModel(mod))
+        modDetailPage.ui.modFilesInterface.ui.TableView.setModel(model := ModFilesModel.getModel(mod))
         model.modelReset.connect(modDetailPage.ui.modFilesInterface.onModFilesGot)
         return modDetailPage
 
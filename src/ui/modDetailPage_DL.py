@@ -1,5 +1,5 @@
 # -*- coding: utf-8 -*-
-from typing import List
+from typing import List, Optional
 
 from PyQt5 import QtCore, QtGui, QtWidgets
 from qfluentwidgets import BodyLabel, ComboBox, StrongBodyLabel, SwitchButton, TableView, TransparentPushButton
@@ -7,6 +7,7 @@ from qfluentwidgets import BodyLabel, ComboBox, StrongBodyLabel, SwitchButton, T
 from ..Client.Clients import CfClient
 from Plugins.ModPlaza_Plugin.src.concurrent.task.taskManager import TaskExecutor
 from ..curseforge import SchemaClasses as sc
+from ..model.modFilesModel import ModFilesModel
 
 
 # Form implementation generated from reading ui file '.\modDetailPage_DL.ui'
@@ -29,6 +30,9 @@ class ModDetailPage_DL(QtWidgets.QWidget):
         self.taskExecutor.asyncRun(
             CfClient.getMinecraftVersions, True
         ).done.connect(self.onMinecraftVersionsGot)
+        self.ui.ComboBox.currentIndexChanged.connect(self.onFilterChanged)
+        self.ui.ComboBox_2.currentIndexChanged.connect(self.onFilterChanged)
+        self.ui.TransparentPushButton.clicked.connect(self.clearFilter)
 
     def deleteLater(self) -> None:
         self.ui.TableView.model().deleteLater()
@@ -47,12 +51,34 @@ class ModDetailPage_DL(QtWidgets.QWidget):
         self.ui.TableView.setWordWrap(False)
         self.ui.TableView.setCornerButtonEnabled(False)
 
+        model = self.ui.TableView.model()
+        if isinstance(model, ModFilesModel) and self.ui.ComboBox_2.count() == 0:  # 首次获取文件后填充加载器
+            self.ui.ComboBox_2.blockSignals(True)  # 填充时不触发筛选, 此时仍在 modelReset 中
+            self.ui.ComboBox_2.addItem("所有加载器", userData=None)
+            for modLoader in model.modLoaders():
+                self.ui.ComboBox_2.addItem(modLoader, userData=modLoader)
+            self.ui.ComboBox_2.blockSignals(False)
+
     def onMinecraftVersionsGot(self, fut):
         self.versions: List[sc.MinecraftGameVersion] = fut.getResult().data
         self.ui.ComboBox.addItem("所有版本", None)
         for version in self.versions:
             self.ui.ComboBox.addItem(version.versionString, userData=version)
 
+    def onFilterChanged(self):
+        model = self.ui.TableView.model()
+        if not isinstance(model, ModFilesModel):
+            return
+        version: Optional[sc.MinecraftGameVersion] = self.ui.ComboBox.currentData()
+        model.setFilter(version.versionString if version else None, self.ui.ComboBox_2.currentData())
+
+    def clearFilter(self):
+        for comboBox in (self.ui.ComboBox, self.ui.ComboBox_2):
+            comboBox.blockSignals(True)
+            comboBox.setCurrentIndex(0)
+            comboBox.blockSignals(False)
+        self.onFilterChanged()
+
 
 class Ui_Form(object):
     def setupUi(self, Form):
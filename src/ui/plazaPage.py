@@ -85,6 +85,7 @@ class PlazaPage(QWidget):
 
         # other
         self.lastPageTaskFuture: Optional[Future] = None
+        self.lastSearchFuture: Optional[Future] = None
         self.currentPage = 1
         self.maxPage = 1
         self.maxPageSize = 50
@@ -106,8 +107,8 @@ class PlazaPage(QWidget):
     def onCurseForgeInfoGet(self, data):
         self.titleLabel.setText(f"{CLASS_NAME}广场")
         minecraftVersions: List[schemas.MinecraftGameVersion] = data["minecraftVersions"]
-        modCategories: List[schemas.Category] = getStructureCategories(data["modCategories"], 6)  # Mod
-        pluginCategories: List[schemas.Category] = getStructureCategories(data["pluginCategories"], 5)  # Plugin
+        modCategories = getStructureCategories(data["modCategories"], 6)  # Mod
+        pluginCategories = getStructureCategories(data["pluginCategories"], 5)  # Plugin
 
         # REGION
         self.mcVersionComboBox.addItem("Any")
@@ -120,24 +121,22 @@ class PlazaPage(QWidget):
         self.modTypeComboBox.addItem("Any")
         if self.classID == schemas.MinecraftClassId.Mod:
 
-            for root in modCategories:
+            for root, children in modCategories:
                 self.modCategoryMap[root.name] = root
                 self.modTypeComboBox.addItem(root.name)
-                if root.children:
-                    for child in root.children:
-                        name = f"{root.name} > {child.name}"
-                        self.modCategoryMap[name] = child
-                        self.modTypeComboBox.addItem(name)
+                for child in children:
+                    name = f"{root.name} > {child.name}"
+                    self.modCategoryMap[name] = child
+                    self.modTypeComboBox.addItem(name)
 
         elif self.classID == schemas.MinecraftClassId.BukkitPlugin:
-            for root in pluginCategories:
+            for root, children in pluginCategories:
                 self.pluginCategoryMap[root.name] = root
                 self.modTypeComboBox.addItem(root.name)
-                if root.children:
-                    for child in root.children:
-                        name = f"{root.name} > {child.name}"
-                        self.pluginCategoryMap[name] = child
-                        self.modTypeComboBox.addItem(name)
+                for child in children:
+                    name = f"{root.name} > {child.name}"
+                    self.pluginCategoryMap[name] = child
+                    self.modTypeComboBox.addItem(name)
         # ENDREGION
 
         self.SearchLineEdit.setEnabled(True)
@@ -198,6 +197,17 @@ class PlazaPage(QWidget):
         self.searchMod()
 
     def searchMod(self):
+        self.cancelLastPageTask()
+        self.thumbnailImages = 0
+
+        self.titleLabel.setText(f"{CLASS_NAME}广场 (正在搜索...)")
+        self.clearWidget()
+        future = self.minecraftModSearchManager.asyncSearchMod(self.getCurrentSearchBody())
+        future.result.connect(self.onSearchModDone)
+        future.refreshed.connect(lambda response, fut=future: self.onSearchModRefreshed(fut, response))
+        self.lastSearchFuture = future
+
+    def cancelLastPageTask(self):
         # cancel last page task
         if (fut := self.lastPageTaskFuture) is not None:
             if not fut.isDone():
@@ -212,12 +222,7 @@ class PlazaPage(QWidget):
                 self.lastPageTaskFuture.deleteLater()  # delete last page task
             except RuntimeError as e:
                 print(e)
-        self.thumbnailImages = 0
-
-        self.titleLabel.setText(f"{CLASS_NAME}广场 (正在搜索...)")
-        self.clearWidget()
-        future = self.minecraftModSearchManager.asyncSearchMod(self.getCurrentSearchBody())
-        future.result.connect(self.onSearchModDone)
+            self.lastPageTaskFuture = None
 
     def clearWidget(self):
         while self.resultScrollAreaWidgetContents.layout().count():
@@ -254,6 +259,15 @@ class PlazaPage(QWidget):
             fut.partialDone.connect(self.onThumbnailsPartialFetched)
         self.lastPageTaskFuture = fut
 
+    def onSearchModRefreshed(self, future: Future, response: schemas.SearchModsResponse):
+        if future is not self.lastSearchFuture:  # 已经发起了新的搜索
+            return
+        # 后台刷新的结果与缓存不同, 原地更新
+        self.cancelLastPageTask()
+        self.thumbnailImages = 0
+        self.clearWidget()
+        self.onSearchModDone(response)
+
     @pyqtSlot(schemas.Mod)
     def onSingleModWidgetClicked(self, widget: SingleModWidget):
         p = self.parent()
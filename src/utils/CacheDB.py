@@ -1,13 +1,24 @@
 """
 使用dict作为缓存的管理器
-并使用pickle模块将dict序列化
+每次修改以一条小记录追加到日志文件(pickle + 长度 + crc32), 保存只写入新增的记录;
+日志过长时压缩为当前内容的快照, 打开时重放日志, 末尾写了一半的记录会被丢弃;
+值保存在单独的段文件中, 读取时通过 mmap 映射, 内存中的树只保存偏移和长度;
+每个表增量维护子树中值的总字节数, 可为根或任意表设置字节预算, 超出时按 LRU 或 LFU 淘汰;
+可选后台线程定期清理过期条目;
+数据库的根表另有从完整路径到条目和表的扁平索引, 热点查找只需一次 dict 查询
 """
 import enum
+import functools
 import json
+import mmap
 import os.path
 import _pickle as pickle
+import struct
+import threading
 import time
-from typing import Dict, Union, Optional, List
+import zlib
+from collections import OrderedDict
+from typing import Dict, Union, Optional, List, Tuple, Iterator, Iterable
 
 from PyQt5.QtCore import QReadWriteLock
 
@@ -94,9 +105,7 @@ class EntryMixin:
 
     @property
     def parent(self) -> Optional['CacheEntryTable']:
-        if p := self.__parent:
-            raise ParentNotFound
-        return p
+        return self.__parent
 
     @property
     def entryType(self) -> EntryType:
@@ -123,7 +132,7 @@ class CacheEntry(EntryMixin):
     def dump(self):
         return {
             "key": self.key,
-            "value": str(self.value[:10]) + "...",
+            "value": repr(self.value) if isinstance(self.value, SegmentRef) else str(self.value[:10]) + "...",
             "expireTime": self.expireTime
         }
 
@@ -143,6 +152,318 @@ class CacheDBUtils:
     def checkEntryNameValid(name: str) -> bool:
         return not name.startswith(".") and not name.startswith("_") and not name.startswith("$")
 
+    @staticmethod
+    @functools.lru_cache(maxsize=8192)
+    def splitKey(key: str) -> Tuple[Tuple[str, ...], bool]:
+        """
+        :return: The normalized keys of key1/key2/key3/..., and whether they are all names (no "." or "..")
+        """
+        keys = tuple(os.path.normpath(key).split(os.sep))
+        return keys, "." not in keys and ".." not in keys
+
+
+class SegmentRef:
+    """
+    Where a saved value lives: a byte range of a segment file, read through mmap on demand
+    """
+    __slots__ = ("segment", "offset", "length")
+
+    def __init__(self, segment: int, offset: int, length: int):
+        self.segment = segment
+        self.offset = offset
+        self.length = length
+
+    def __len__(self):
+        return self.length
+
+    def __repr__(self):
+        return f"<segment {self.segment} [{self.offset}:+{self.length}]>"
+
+
+class CacheLog:
+    """
+    The append-only write log of a CacheDB file
+    records: ("put", path, segment, offset, length, expireTime), ("table", path) (an empty table, replacing any
+    existing one), ("pop", path, entryType value)
+    each record is framed as <payload length, crc32> + pickled payload, so a torn write is detected on replay.
+    The values themselves are appended to segment files "<filename>.<n>.seg" and mapped into memory when read,
+    the tree only keeps their SegmentRef; compaction copies the live values into a new segment
+    """
+    MAGIC = b"CACHEDB-LOG\x01\n"
+    HEADER = struct.Struct("<II")
+    MIN_COMPACT_RECORDS = 1024
+
+    def __init__(self, filename: str):
+        self.filename = filename
+        self.recording = False  # off while replaying
+        self.records = 0  # records in the file
+        self.liveRecords = 0  # records of the last snapshot (compaction or replay)
+        self.segment = 0  # the segment values are appended to
+        self.segmentSize = 0
+        self.__pending: List[tuple] = []  # puts hold the entry, its value is written by the flush
+        self.__maps: Dict[int, mmap.mmap] = {}
+        self.__lock = threading.Lock()
+
+    def segmentName(self, segment: int) -> str:
+        return f"{self.filename}.{segment}.seg"
+
+    def append(self, *record):
+        """
+        Queue a record, written by the next flush
+        """
+        if not self.recording:
+            return
+        with self.__lock:
+            self.__pending.append(record)
+
+    def view(self, ref: SegmentRef) -> memoryview:
+        """
+        :return: The saved value, a zero-copy view of the mapped segment
+        """
+        if ref.length == 0:
+            return memoryview(b"")
+        segmentMap = self.__maps.get(ref.segment)
+        if segmentMap is None or len(segmentMap) < ref.offset + ref.length:  # first read, or appended since
+            with open(self.segmentName(ref.segment), "rb") as f:
+                segmentMap = self.__maps[ref.segment] = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return memoryview(segmentMap)[ref.offset:ref.offset + ref.length]
+
+    def read(self) -> Iterator[tuple]:
+        """
+        Yield the records of the file, a torn or corrupted tail is cut off the file,
+        so is a put whose value is missing from its segment
+        """
+        with open(self.filename, "rb") as f:
+            data = f.read()
+        if not data.startswith(self.MAGIC):
+            raise ValueError(f"{self.filename} is not a CacheDB log")
+        view = memoryview(data)  # payloads are read without copying
+        offset, size = len(self.MAGIC), len(data)
+        segmentSizes: Dict[int, int] = {}
+        self.records = 0
+        while offset + self.HEADER.size <= size:
+            length, crc = self.HEADER.unpack_from(data, offset)
+            payload = view[offset + self.HEADER.size:offset + self.HEADER.size + length]
+            if len(payload) != length or zlib.crc32(payload) != crc:
+                break
+            record = pickle.loads(payload)
+            if record[0] == "put":
+                segment, valueOffset, valueLength = record[2:5]
+                if segment not in segmentSizes:
+                    name = self.segmentName(segment)
+                    segmentSizes[segment] = os.path.getsize(name) if os.path.exists(name) else 0
+                if valueOffset + valueLength > segmentSizes[segment]:
+                    break
+                self.segment = max(self.segment, segment)
+            offset += self.HEADER.size + length
+            self.records += 1
+            yield record
+        if offset != size:
+            os.truncate(self.filename, offset)
+        name = self.segmentName(self.segment)
+        self.segmentSize = os.path.getsize(name) if os.path.exists(name) else 0
+
+    def __encode(self, records: Iterable[tuple], segmentFile, segment: int, offset: int):
+        """
+        Write the values of the puts to segmentFile
+        :return: log frames, the new segment offset, [(entry, old value, SegmentRef)] to swap once written
+        """
+        frames, swaps = [], []
+        for record in records:
+            if record[0] == "put":
+                _, path, entry = record
+                value = entry.value
+                data = self.view(value) if type(value) is SegmentRef else value
+                ref = SegmentRef(segment, offset, len(data))
+                segmentFile.write(data)
+                offset += ref.length
+                swaps.append((entry, value, ref))
+                record = ("put", path, segment, ref.offset, ref.length, entry.expireTime)
+            payload = pickle.dumps(record, -1)
+            frames.append(self.HEADER.pack(len(payload), zlib.crc32(payload)))
+            frames.append(payload)
+        return frames, offset, swaps
+
+    @staticmethod
+    def __swap(swaps):
+        # the saved values leave process memory, unless replaced meanwhile
+        for entry, value, ref in swaps:
+            if entry.value is value:
+                entry.value = ref
+
+    @staticmethod
+    def __sync(f):
+        f.flush()
+        os.fsync(f.fileno())
+
+    def flush(self):
+        """
+        Append the queued values to the segment, then the queued records to the log:
+        a record is only written once its value is on disk
+        """
+        with self.__lock:
+            pending, self.__pending = self.__pending, []
+        if not pending:
+            return
+        with open(self.segmentName(self.segment), "ab") as segmentFile:
+            frames, self.segmentSize, swaps = self.__encode(pending, segmentFile, self.segment, self.segmentSize)
+            self.__sync(segmentFile)
+        if not os.path.exists(self.filename):
+            frames.insert(0, self.MAGIC)
+        with open(self.filename, "ab") as f:
+            f.write(b"".join(frames))
+            self.__sync(f)
+        self.records += len(pending)
+        self.__swap(swaps)
+
+    def discardPending(self):
+        with self.__lock:
+            self.__pending.clear()
+
+    def rewrite(self, records: Iterable[tuple]):
+        """
+        Replace the file with these records and their values with a new segment,
+        the log is written to a temporary file first so a crash keeps the old log and segments
+        """
+        segment = self.segment + 1
+        with open(self.segmentName(segment), "wb") as segmentFile:
+            frames, segmentSize, swaps = self.__encode(records, segmentFile, segment, 0)
+            self.__sync(segmentFile)
+        temp = self.filename + ".tmp"
+        with open(temp, "wb") as f:
+            f.write(self.MAGIC)
+            f.write(b"".join(frames))
+            self.__sync(f)
+        os.replace(temp, self.filename)
+        self.segment, self.segmentSize = segment, segmentSize
+        self.records = self.liveRecords = len(frames) // 2
+        self.__swap(swaps)
+        self.removeSegments({segment})
+
+    def removeSegments(self, keep: Iterable[int]):
+        """
+        Delete the segment files not in keep, a file still mapped elsewhere (windows) is left for the next open
+        """
+        keep = set(keep)
+        prefix = os.path.basename(self.filename) + "."
+        directory = os.path.dirname(self.filename) or "."
+        for name in os.listdir(directory):
+            if not (name.startswith(prefix) and name.endswith(".seg")):
+                continue
+            segment = name[len(prefix):-len(".seg")]
+            if not segment.isdigit() or int(segment) in keep:
+                continue
+            self.__maps.pop(int(segment), None)  # views handed out keep their map alive
+            try:
+                os.remove(os.path.join(directory, name))
+            except OSError:
+                pass
+
+    def shouldCompact(self) -> bool:
+        """
+        compact once the records appended since the last snapshot outnumber the snapshot,
+        so the file stays within about twice the live data and each record is rewritten O(1) times on average
+        """
+        return self.records - self.liveRecords > max(self.liveRecords, self.MIN_COMPACT_RECORDS)
+
+
+class LruIndex:
+    """
+    The entries of a budgeted table tree, least recently added or read first
+    """
+
+    def __init__(self):
+        self.order: OrderedDict = OrderedDict()
+
+    def add(self, entry: CacheEntry):
+        self.order[entry] = None
+
+    def touch(self, entry: CacheEntry):
+        if entry in self.order:
+            self.order.move_to_end(entry)
+
+    def remove(self, entry: CacheEntry):
+        self.order.pop(entry, None)
+
+    def victim(self) -> Optional[CacheEntry]:
+        return next(iter(self.order), None)
+
+    def __len__(self):
+        return len(self.order)
+
+
+class _FrequencyBucket:
+    __slots__ = ("count", "entries", "prev", "next")
+
+    def __init__(self, count: int, prev: Optional['_FrequencyBucket'], next: Optional['_FrequencyBucket']):
+        self.count = count
+        self.entries: OrderedDict = OrderedDict()
+        self.prev = prev
+        self.next = next
+
+
+class LfuIndex:
+    """
+    The entries of a budgeted table tree, least frequently read first (least recently among equals);
+    the non-empty read count buckets form a linked list in ascending order, so every operation is O(1)
+    """
+
+    def __init__(self):
+        self.head = _FrequencyBucket(0, None, None)  # sentinel, head.next is the least frequent bucket
+        self.head.prev = self.head.next = self.head
+        self.buckets: Dict[CacheEntry, _FrequencyBucket] = {}
+
+    def __insertAfter(self, bucket: _FrequencyBucket, count: int) -> _FrequencyBucket:
+        new = _FrequencyBucket(count, bucket, bucket.next)
+        bucket.next.prev = bucket.next = new
+        return new
+
+    @staticmethod
+    def __unlink(bucket: _FrequencyBucket):
+        bucket.prev.next = bucket.next
+        bucket.next.prev = bucket.prev
+
+    def add(self, entry: CacheEntry):
+        if (first := self.head.next).count != 1:
+            first = self.__insertAfter(self.head, 1)
+        first.entries[entry] = None
+        self.buckets[entry] = first
+
+    def touch(self, entry: CacheEntry):
+        if (bucket := self.buckets.get(entry)) is None:
+            return
+        if (after := bucket.next).count != bucket.count + 1:  # the sentinel (0) never matches
+            after = self.__insertAfter(bucket, bucket.count + 1)
+        del bucket.entries[entry]
+        after.entries[entry] = None
+        self.buckets[entry] = after
+        if not bucket.entries:
+            self.__unlink(bucket)
+
+    def remove(self, entry: CacheEntry):
+        if (bucket := self.buckets.pop(entry, None)) is not None:
+            del bucket.entries[entry]
+            if not bucket.entries:
+                self.__unlink(bucket)
+
+    def victim(self) -> Optional[CacheEntry]:
+        if (first := self.head.next) is self.head:
+            return None
+        return next(iter(first.entries))
+
+    def __len__(self):
+        return len(self.buckets)
+
+
+EVICTION_POLICIES = {"lru": LruIndex, "lfu": LfuIndex}
+
+# guards the size counters, the eviction indexes and eviction itself,
+# never taken while holding an entry locker
+_accountingLock = threading.RLock()
+# bumped whenever a budget is set or a table tree moves, invalidates CacheEntryTable._budgetIndexes
+_budgetGeneration = 0
+_UNINDEXED = object()  # see CacheEntryTable._indexed
+
 
 class CacheEntryTable(EntryMixin):
     """
@@ -167,6 +488,19 @@ class CacheEntryTable(EntryMixin):
         self.table: Dict[str, Union[CacheEntry, CacheEntryTable]] = {}
         self.indexLockers: Dict[str, SerializableReadWriteLock] = {}
         self.__defaultExpireTime = defaultExpireTime
+        self.path: Tuple[str, ...] = ()  # table names from the root
+        self._log: Optional[CacheLog] = None
+        self.size = 0  # bytes of the values in this tree, kept up to date by _track
+        self.count = 0  # entries in this tree
+        self.budget: Optional[int] = None
+        self.evictions = 0
+        self.evictedBytes = 0
+        self._index: Optional[Union[LruIndex, LfuIndex]] = None  # only on budgeted tables
+        # (_budgetGeneration, the eviction indexes of this table and the tables above it), see _touch
+        self._budgetIndexes: Tuple[int, tuple] = (-1, ())
+        # {path: entry} and {path: table} of this tree, on database roots only (see _indexPaths)
+        self._flat: Optional[Dict[Tuple[str, ...], CacheEntry]] = None
+        self._flatTables: Optional[Dict[Tuple[str, ...], CacheEntryTable]] = None
 
     def __addNested(self, keys: List[str], value: bytes, _type: EntryType, expiredTime: int, default: bool,
                     replace: bool) -> bool:
@@ -215,7 +549,7 @@ class CacheEntryTable(EntryMixin):
             if self.has(keys[0], EntryType.Table):
                 return self.__get(keys[0], EntryType.Table).__getNested(keys[1:], _type)
             else:
-                raise CacheTableError(f"Table not found: {keys[0]}")
+                raise TableNotFound(keys[0])
 
     def __get(self, key, _type: EntryType = EntryType.Entry) -> Union[CacheEntry, 'CacheEntryTable']:
         """
@@ -225,15 +559,18 @@ class CacheEntryTable(EntryMixin):
         :return: The entry
         """
         if key == '..' and _type == EntryType.Table:
+            if self.parent is None:
+                raise ParentNotFound(self.tableName)
             return self.parent
         elif key == '.' and _type == EntryType.Table:
             return self
         elif key not in {'.', '..'}:
 
             (locker := self.getLocker(key, _type)).lockForRead()
-            rv = self.table[f"{_type.value}_{key}"]
+            rv = self.table.get(f"{_type.value}_{key}")
             locker.unlock()
-
+            if rv is None:
+                raise EntryNotFound(key, _type)
             return rv
         else:
             raise InvalidEntryType(key, _type)
@@ -263,13 +600,20 @@ class CacheEntryTable(EntryMixin):
         """
         (locker := self.getLocker(entry.key, EntryType.Entry)).lockForWrite()
 
-        if entry.key in self.table and not replace:
+        if f"ENTRY_{entry.key}" in self.table and not replace:
             locker.unlock()
             return False
 
+        old = self.table.get(f"ENTRY_{entry.key}")
         self.table[f"ENTRY_{entry.key}"] = entry
         locker.unlock()
         entry.setParent(self)
+        if self._log is not None:
+            self._log.append("put", self.path + (entry.key,), entry)
+        if old is not None:
+            self._track(old, -1)
+        self._track(entry, 1)
+        self._enforceBudgets()
         return True
 
     def _addTableTree(self, table: 'CacheEntryTable', replace=False) -> bool:
@@ -283,16 +627,257 @@ class CacheEntryTable(EntryMixin):
         """
         (locker := self.getLocker(table.tableName, EntryType.Table)).lockForWrite()
 
-        if table.tableName in self.table and not replace:
+        if f"TABLE_{table.tableName}" in self.table and not replace:
             locker.unlock()
             return False
 
+        old = self.table.get(f"TABLE_{table.tableName}")
         self.table[f"TABLE_{table.tableName}"] = table
         locker.unlock()
         table._tableLockRef = locker
         table.setParent(self)
+        self._budgetsChanged()
+        table._attach(self.path + (table.tableName,), self._log)
+        if old is not None:
+            self._indexTables(old, -1)
+            self._untrackTree(old)
+            self._detach(old)
+        self._indexTables(table, 1)
+        for entry in table._entries():
+            self._track(entry, 1)
+        self._enforceBudgets()
         return True
 
+    def _attach(self, path: Tuple[str, ...], log: Optional[CacheLog]):
+        """
+        Place this table tree at path of a database, logging its content
+        """
+        self.path = path
+        self._log = log
+        if log is not None:
+            log.append("table", path)
+        for value in list(self.table.values()):
+            if isinstance(value, CacheEntry):
+                if log is not None:
+                    log.append("put", path + (value.key,), value)
+            else:
+                value._attach(path + (value.tableName,), log)
+
+    def _detach(self, table: 'CacheEntryTable'):
+        """
+        Make a popped or replaced child table tree a tree of its own, outside the database:
+        writes through a held reference no longer reach the log, and its mapped values are copied out
+        since a compaction drops their segment
+        """
+        if self._log is not None and self._log.recording:  # not while replaying, nobody holds it then
+            for entry in table._entries():
+                if type(entry.value) is SegmentRef:
+                    entry.value = bytes(self._log.view(entry.value))
+        table.setParent(None)
+        table._attach((), None)
+        self._budgetsChanged()
+
+    def _tableAt(self, keys: Iterable[str]) -> 'CacheEntryTable':
+        """
+        Get the nested table of keys, creating the missing ones
+        """
+        table = self
+        for key in keys:
+            if (child := table.table.get(f"TABLE_{key}")) is None:
+                table.createTable(key)
+                child = table.table[f"TABLE_{key}"]
+            table = child
+        return table
+
+    def _tables(self) -> Iterator['CacheEntryTable']:
+        """
+        Yield this table and every table below it
+        """
+        yield self
+        for value in list(self.table.values()):
+            if isinstance(value, CacheEntryTable):
+                yield from value._tables()
+
+    def _entries(self) -> Iterator[CacheEntry]:
+        """
+        Yield every entry of this table tree
+        """
+        for value in list(self.table.values()):
+            if isinstance(value, CacheEntry):
+                yield value
+            else:
+                yield from value._entries()
+
+    # region accounting
+    def _track(self, entry: CacheEntry, sign: int):
+        """
+        Count entry (sign 1) or stop counting it (sign -1) in the size and the eviction index of
+        this table and every table above it, and in the flat index of the root
+        """
+        size = len(entry.value) * sign
+        with _accountingLock:
+            table = self
+            while True:
+                table.size += size
+                table.count += sign
+                if (index := table._index) is not None:
+                    if sign > 0:
+                        index.add(entry)
+                    else:
+                        index.remove(entry)
+                if table.parent is None:
+                    break
+                table = table.parent
+            if (flat := table._flat) is not None:
+                path = entry.parent.path + (entry.key,)
+                if sign > 0:
+                    flat[path] = entry
+                elif flat.get(path) is entry:
+                    del flat[path]
+
+    # region flat index
+    def _treeRoot(self) -> 'CacheEntryTable':
+        table = self
+        while (parent := table.parent) is not None:
+            table = parent
+        return table
+
+    def _indexPaths(self):
+        """
+        Keep flat indexes of this root table's entries and tables by path, CacheDB does for its root;
+        trees without them (standalone, copied or popped tables) are walked level by level
+        """
+        with _accountingLock:
+            self._flatTables = {table.path: table for table in self._tables()}
+            self._flat = {entry.parent.path + (entry.key,): entry for entry in self._entries()}
+
+    def _indexTables(self, table: 'CacheEntryTable', sign: int):
+        """
+        Add (sign 1) or remove (sign -1) a child table tree in the flat table index of the root
+        """
+        if (flatTables := self._treeRoot()._flatTables) is None:
+            return
+        with _accountingLock:
+            for t in table._tables():
+                if sign > 0:
+                    flatTables[t.path] = t
+                elif flatTables.get(t.path) is t:
+                    del flatTables[t.path]
+
+    def _indexed(self, keys: Tuple[str, ...], _type: EntryType):
+        """
+        :param keys: Plain names relative to this table
+        :return: The entry or table at keys from the flat index, None if there is none,
+            or _UNINDEXED if this tree has no index
+        """
+        root = self._treeRoot()
+        index = root._flat if _type == EntryType.Entry else root._flatTables
+        if index is None:
+            return _UNINDEXED
+        return index.get(self.path + keys if self.path else keys)
+    # endregion
+
+    def _untrackTree(self, table: 'CacheEntryTable'):
+        """
+        Stop counting a child table tree that was popped or replaced
+        """
+        with _accountingLock:
+            for entry in table._entries():
+                self._track(entry, -1)
+
+    @staticmethod
+    def _touch(entry: CacheEntry):
+        """
+        Record a read of entry in the eviction indexes above it,
+        the indexes are looked up once per table until a budget is set or a table tree moves
+        """
+        if (table := entry.parent) is None:
+            return
+        generation, indexes = table._budgetIndexes
+        if generation != _budgetGeneration:
+            with _accountingLock:
+                generation, indexes, above = _budgetGeneration, [], table
+                while above is not None:
+                    if above._index is not None:
+                        indexes.append(above._index)
+                    above = above.parent
+                table._budgetIndexes = generation, indexes = generation, tuple(indexes)
+        if indexes:
+            with _accountingLock:
+                for index in indexes:
+                    index.touch(entry)
+
+    @staticmethod
+    def _budgetsChanged():
+        global _budgetGeneration
+        with _accountingLock:
+            _budgetGeneration += 1
+
+    def _enforceBudgets(self):
+        """
+        Evict from every budgeted table from this one up to the root until it fits its budget
+        """
+        with _accountingLock:
+            table = self
+            while table is not None:
+                if table.budget is not None:
+                    while table.size > table.budget and (victim := table._index.victim()) is not None:
+                        try:
+                            if (parent := victim.parent) is None:
+                                raise EntryNotFound(victim.key, EntryType.Entry)
+                            parent._pop(victim.key, EntryType.Entry)
+                        except EntryNotFound:  # popped by another thread meanwhile
+                            table._index.remove(victim)
+                            continue
+                        table.evictions += 1
+                        table.evictedBytes += len(victim.value)
+                table = table.parent
+
+    def setBudget(self, budget: Optional[int], policy: str = "lru"):
+        """
+        Bound the bytes of the values in this table tree, evicting right away if it is over
+        :param budget: The budget in bytes, None removes it
+        :param policy: "lru" evicts the least recently added or read entry, "lfu" the least frequently read one
+
+        :raise ValueError: If the policy is unknown
+        """
+        if policy not in EVICTION_POLICIES:
+            raise ValueError(f"unknown eviction policy: {policy}")
+        with _accountingLock:
+            self.budget = budget
+            self._budgetsChanged()
+            if budget is None:
+                self._index = None
+                return
+            self._index = EVICTION_POLICIES[policy]()
+            for entry in self._entries():
+                self._index.add(entry)
+            self._enforceBudgets()
+
+    def evictionStats(self) -> Dict[str, int]:
+        """
+        :return: The budget, the current size and entry count, and what was evicted so far
+        """
+        return {
+            "budget": self.budget,
+            "size": self.size,
+            "entries": self.count,
+            "evictions": self.evictions,
+            "evictedBytes": self.evictedBytes,
+        }
+    # endregion
+
+    def _records(self) -> Iterator[tuple]:
+        """
+        Yield the log records rebuilding this table's content
+        """
+        for value in list(self.table.values()):
+            if isinstance(value, CacheEntry):
+                yield "put", self.path + (value.key,), value
+            else:
+                yield "table", value.path
+                yield from value._records()
+
     def _add(self, key: str, _type: EntryType, value: Optional[bytes] = None, expiredTime: Optional[int] = None,
              replace=False) -> bool:
         """
@@ -321,9 +906,20 @@ class CacheEntryTable(EntryMixin):
             return self.parent._pop(self.tableName, _type)
         elif key not in {'.', '..'}:
             (locker := self.getLocker(key, _type)).lockForWrite()
-            rv = self.table.pop(f"{_type.value}_{key}")
+            rv = self.table.pop(f"{_type.value}_{key}", None)
             locker.unlock()
+            if rv is None:
+                raise EntryNotFound(key, _type)
             self.indexLockers.pop(f"{_type.value}_{key}")
+            if self._log is not None:
+                self._log.append("pop", self.path + (key,), _type.value)
+            if isinstance(rv, CacheEntry):
+                self._track(rv, -1)
+                rv.setParent(None)
+            else:
+                self._indexTables(rv, -1)
+                self._untrackTree(rv)
+                self._detach(rv)
             return rv
         else:
             raise InvalidEntryType(key, _type)
@@ -353,13 +949,23 @@ class CacheEntryTable(EntryMixin):
             raise InvalidEntryName(tableName)
         (locker := self.getLocker(tableName, EntryType.Table)).lockForWrite()
 
-        if tableName in self.table and not replace:
+        if f"TABLE_{tableName}" in self.table and not replace:
             locker.unlock()
             return False
         table = CacheEntryTable(tableName, self.defaultExpireTime)
+        table.path = self.path + (tableName,)
+        table._log = self._log
+        old = self.table.get(f"TABLE_{tableName}")
         self.table[f"TABLE_{tableName}"] = table
         locker.unlock()
         table.setParent(self)
+        if self._log is not None:
+            self._log.append("table", table.path)
+        if old is not None:
+            self._indexTables(old, -1)
+            self._untrackTree(old)
+            self._detach(old)
+        self._indexTables(table, 1)
         return True
 
     def has(self, key, _type: EntryType = EntryType.Entry) -> bool:
@@ -369,20 +975,24 @@ class CacheEntryTable(EntryMixin):
         :param _type: The type of the entry
         :return: Whether the entry is found
         """
-        keys = self.convertToKeys(key)
-        return self.__hasNested(keys, _type)
+        keys, plain = CacheDBUtils.splitKey(key)
+        if plain and (value := self._indexed(keys, _type)) is not _UNINDEXED:
+            return value is not None
+        return self.__hasNested(list(keys), _type)
 
-    def getRecord(self, key: str) -> bytes:
+    def getRecord(self, key: str) -> Union[bytes, memoryview]:
         """
         Get a record from the table
         :param key: The key of the record
-        :return: The record
+        :return: The record, a zero-copy view of the mapped segment once saved (e.g. for QPixmap.loadFromData),
+            call bytes() on it to keep a copy
 
         :raise CacheTableError: If the record is not found
         """
-        keys = self.convertToKeys(key)
-
-        return self.__getNested(keys, EntryType.Entry).value
+        entry = self.getNested(key, EntryType.Entry)
+        self._touch(entry)
+        value = entry.value
+        return self._log.view(value) if type(value) is SegmentRef else value
 
     def isEntryExpired(self, key: str) -> bool:
         """
@@ -404,8 +1014,12 @@ class CacheEntryTable(EntryMixin):
 
         raise CacheTableError: If the entry is not found,or the entry is the root table
         """
-        keys = self.convertToKeys(key)
-        return self.__getNested(keys[:-1], EntryType.Table)._pop(keys[-1], _type)
+        keys, plain = CacheDBUtils.splitKey(key)
+        if plain and (table := self._indexed(keys[:-1], EntryType.Table)) is not _UNINDEXED:
+            if table is None:
+                raise TableNotFound("/".join(keys[:-1]))
+            return table._pop(keys[-1], _type)
+        return self.__getNested(list(keys[:-1]), EntryType.Table)._pop(keys[-1], _type)
 
     def addNested(self, key: str, value: bytes, _type: EntryType, expiredTime: Optional[int] = None,
                   default: bool = True, replace: bool = False) -> bool:
@@ -425,7 +1039,10 @@ class CacheEntryTable(EntryMixin):
         if not CacheDBUtils.checkEntryNameValid(key):
             raise InvalidEntryName(key)
         expiredTime = self.defaultExpireTime if expiredTime is None else expiredTime
-        return self.__addNested(self.convertToKeys(key), value, _type, expiredTime, default, replace)
+        keys, plain = CacheDBUtils.splitKey(key)
+        if plain and (table := self._indexed(keys[:-1], EntryType.Table)) is not _UNINDEXED and table is not None:
+            return table._add(keys[-1], _type, value, expiredTime, replace)
+        return self.__addNested(list(keys), value, _type, expiredTime, default, replace)
 
     def getNested(self, key: str, _type: EntryType) -> Union[CacheEntry, 'CacheEntryTable']:
         """
@@ -435,7 +1052,12 @@ class CacheEntryTable(EntryMixin):
 
         :raise CacheTableError: If the table is not found
         """
-        return self.__getNested(self.convertToKeys(key), _type)
+        keys, plain = CacheDBUtils.splitKey(key)
+        if plain and (value := self._indexed(keys, _type)) is not _UNINDEXED:
+            if value is None:
+                raise EntryNotFound(key, _type)
+            return value
+        return self.__getNested(list(keys), _type)
 
     def vacuum(self):
         items = list(self.table.items())
@@ -454,15 +1076,7 @@ class CacheEntryTable(EntryMixin):
                 raise InvalidEntryType(key, value.entryType)
 
     def getSize(self):
-        size = 0
-        for key, value in self.table.items():
-            if isinstance(value, CacheEntry):
-                size += value.getSize()
-            elif isinstance(value, CacheEntryTable):
-                size += value.getSize()
-            else:
-                raise InvalidEntryType(key, value.entryType)
-        return size
+        return self.size
 
     def isEmpty(self):
         if self.table == {}:
@@ -503,7 +1117,7 @@ class CacheEntryTable(EntryMixin):
 
     @staticmethod
     def convertToKeys(key: str) -> List[str]:
-        return os.path.normpath(key).split(os.sep)
+        return list(CacheDBUtils.splitKey(key)[0])
 
     def __iter__(self):
         return self.table.__iter__()
@@ -525,40 +1139,100 @@ class CacheEntryTable(EntryMixin):
 
 class CacheDB:
 
-    def __init__(self, filename: str, defaultExpireTime=3600):
+    def __init__(self, filename: str, defaultExpireTime=3600, budget: Optional[int] = None, policy: str = "lru"):
+        """
+        :param filename: The log file
+        :param defaultExpireTime: The expire time of entries added without one (in seconds)
+        :param budget: The budget in bytes of all the values, see setBudget
+        :param policy: The eviction policy of the budget, "lru" or "lfu"
+        """
         self.defaultExpireTime = defaultExpireTime
         self.filename = filename
         self.root: CacheEntryTable = CacheEntryTable(
             "$ROOT$",
             defaultExpireTime=self.defaultExpireTime
         )
+        self.__log = CacheLog(filename)
+        self.root._log = self.__log
+        self.root._indexPaths()
         if os.path.exists(self.filename):
-            self.__deserialize()
+            self.__load()
+        self.__log.recording = True
         self.__isOpening = True
+        self.__budgeted: Dict[str, CacheEntryTable] = {}
+        self.__sweeper: Optional[threading.Thread] = None
+        self.__stopSweeper = threading.Event()
+        if budget is not None:
+            self.setBudget(".", budget, policy)
 
-    def __serialize(self):
-        with open(self.filename, "wb") as f:
-            try:
-                pickle.dump(self.root, f)
-                self.root._defaultExpireTime = self.defaultExpireTime
-            except BaseException as e:
-                print(e)
-
-    def __deserialize(self):
+    def __load(self):
         with open(self.filename, "rb") as f:
-            self.root = pickle.load(f)
+            isLog = f.read(len(CacheLog.MAGIC)) == CacheLog.MAGIC
+        if isLog:
+            for record in self.__log.read():
+                self.__apply(record)
+            live, segments = 0, {self.__log.segment}
+            for record in self.root._records():
+                live += 1
+                if record[0] == "put" and type(value := record[2].value) is SegmentRef:
+                    segments.add(value.segment)
+            self.__log.liveRecords = live
+            self.__log.removeSegments(segments)  # left behind by a crashed or blocked compaction
+        else:  # a whole-tree pickle written by older versions, converted to a log once
+            with open(self.filename, "rb") as f:
+                legacy: CacheEntryTable = pickle.load(f)
+            for value in legacy.table.values():
+                if isinstance(value, CacheEntry):
+                    self.root._addEntry(value.__copy__(), replace=True)
+                else:
+                    self.root._addTableTree(value.__copy__(), replace=True)
+            self.__log.rewrite(self.root._records())
+
+    def __apply(self, record: tuple):
+        op, path = record[0], record[1]
+        if (table := self.root._flatTables.get(path[:-1])) is None:
+            table = self.root._tableAt(path[:-1])
+        if op == "put":
+            entry = CacheEntry(path[-1], SegmentRef(*record[2:5]))
+            entry.expireTime = record[5]
+            old = table.table.get(f"ENTRY_{entry.key}")
+            table.table[f"ENTRY_{entry.key}"] = entry  # nothing else sees the tree while loading, skip the locks
+            entry.setParent(table)
+            if old is not None:
+                table._track(old, -1)
+            table._track(entry, 1)
+        elif op == "table":
+            table.createTable(path[-1], replace=True)
+        elif op == "pop":
+            try:
+                table._pop(path[-1], EntryType(record[2]))
+            except EntryNotFound:
+                pass
 
     def save(self):
         """
-        Save the database to disk
+        Save the database to disk: append the changes since the last save to the log,
+        or compact the log when it has grown to twice the live records
         """
-        if self.__isOpening:
-            self.__serialize()
+        if not self.__isOpening:
+            return
+        if self.__log.shouldCompact():
+            self.compact()
+        else:
+            self.__log.flush()
+
+    def compact(self):
+        """
+        Rewrite the log as a snapshot of the current content
+        """
+        self.__log.discardPending()  # changes made while walking are queued again, replaying them twice is harmless
+        self.__log.rewrite(self.root._records())
 
     def close(self):
         """
         Close the database
         """
+        self.stopSweeper()
         self.save()
         self.__isOpening = False
 
@@ -574,6 +1248,52 @@ class CacheDB:
         """
         self.root.vacuum()
 
+    def startSweeper(self, interval: float = 60):
+        """
+        Vacuum every interval seconds in a daemon thread until stopSweeper() or close()
+        """
+        if self.__sweeper is not None:
+            return
+        self.__stopSweeper.clear()
+        self.__sweeper = threading.Thread(target=self.__sweep, args=(interval,), name="CacheDB sweeper", daemon=True)
+        self.__sweeper.start()
+
+    def stopSweeper(self):
+        if self.__sweeper is None:
+            return
+        self.__stopSweeper.set()
+        if self.__sweeper is not threading.current_thread():
+            self.__sweeper.join()
+        self.__sweeper = None
+
+    def __sweep(self, interval: float):
+        while not self.__stopSweeper.wait(interval):
+            self.vacuum()
+
+    def setBudget(self, key: str, budget: Optional[int], policy: str = "lru"):
+        """
+        Bound the bytes of the values of a table, evicting by policy when an add goes over it;
+        budgets are not saved, set them again after opening
+        :param key: The table, "." for the root
+        :param budget: The budget in bytes, None removes it
+        :param policy: "lru" or "lfu"
+
+        :raise CacheTableError: If the table is not found
+        :raise ValueError: If the policy is unknown
+        """
+        table = self.root.getNested(key, EntryType.Table)
+        table.setBudget(budget, policy)
+        if budget is None:
+            self.__budgeted.pop(key, None)
+        else:
+            self.__budgeted[key] = table
+
+    def evictionStats(self) -> Dict[str, Dict[str, int]]:
+        """
+        :return: {table key: stats} of every budgeted table, see CacheEntryTable.evictionStats
+        """
+        return {key: table.evictionStats() for key, table in self.__budgeted.items()}
+
     def json(self):
         """
         dump database structure to json
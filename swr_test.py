@@ -0,0 +1,69 @@
+import os
+import sys
+import tempfile
+import time
+
+from benchmarks.common import setupPluginPackage
+from benchmarks.mock_server import MockCurseForgeServer
+
+setupPluginPackage()
+
+import requests_cache as rqc
+from PyQt5.QtWidgets import QApplication
+
+from Plugins.ModPlaza_Plugin.src.concurrent.curseforgeTask import CurseForgeSearchBody, MinecraftModSearchExecutor
+from Plugins.ModPlaza_Plugin.src.curseforge import CurseForgeAPI, SchemaClasses as schemas
+from Plugins.ModPlaza_Plugin.src.curseforge.RateLimiter import RateLimiter
+
+app = QApplication(sys.argv)
+BODY = CurseForgeSearchBody(gameVersion=None, classId=6, categoryId=None,
+                            sortField=schemas.ModSearchSortField.Popularity, searchFilter="",
+                            sortOrder=schemas.SortOrder.Descending, index=0, pageSize=20)
+
+
+def settle(executor: MinecraftModSearchExecutor):
+    """
+    run until no task is left, a finished stale read may start the background refresh
+    """
+    while True:
+        started = executor.taskCounter
+        executor.threadPool.waitForDone()
+        app.processEvents()
+        if executor.taskCounter == started:
+            return
+
+
+def search(executor: MinecraftModSearchExecutor):
+    future = executor.asyncSearchMod(BODY)
+    refreshed = []
+    future.refreshed.connect(refreshed.append)
+    settle(executor)
+    return future.getResult(), refreshed
+
+
+# 刷新结果只在数据变化时通知, 无论服务器是否发送 ETag
+for validators in (True, False):
+    with MockCurseForgeServer(validators=validators) as server, tempfile.TemporaryDirectory() as tmp:
+        cf = CurseForgeAPI("any", rqc.CachedSession(os.path.join(tmp, "swr"), backend="sqlite", expire_after=1),
+                           rateLimiter=RateLimiter(budgets={"default": (1e9, 10 ** 9)}, classes=()),
+                           baseUrl=server.baseUrl)
+        executor = MinecraftModSearchExecutor(cf, useGlobalThreadPool=False, staleWhileRevalidate=True)
+
+        first, refreshed = search(executor)  # 缓存未命中
+        assert isinstance(first, schemas.SearchModsResponse) and not refreshed
+
+        time.sleep(1.2)
+        stale, refreshed = search(executor)  # 已过期, 后台刷新得到相同内容
+        assert stale is first and not refreshed, validators
+        assert (server.stats["notModified"] > 0) == validators
+
+        server.catalogue.mods[first.data[0].id]["summary"] += " (updated)"
+        time.sleep(1.2)
+        result, refreshed = search(executor)  # 内容变化, 发出 refreshed 并替换结果
+        assert len(refreshed) == 1 and result is refreshed[0], validators
+        assert result.data[0].summary.endswith(" (updated)")
+
+        executor.deleteLater()
+        cf.csesh.close()
+        print("validators" if validators else "no validators", "ok")
+print("stale-while-revalidate test done")